@@ -2,6 +2,7 @@
 
 import os
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,15 +12,34 @@ from .routes.token_status import TokenStatusRouter
 from .routes.empresa import EmpresaRouter
 from .routes.produto import ProdutoRouter
 from .routes.servico import ServicoRouter
+from .routes.faq import FaqRouter
+from .routes.metrics import MetricsRouter
+from .routes.health import HealthRouter
 
-from app.models.database import DatabaseManager
+from app.models.database import DatabaseManager, get_async_engine
+from app.gateway.http_pool import aclose_http_clients
+from app.utils.catalog_cache import catalog_cache
+from app.utils.readiness import prontidao
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepara os recursos compartilhados na subida e os libera no encerramento."""
+    # Modelo spaCy, provedor de IA e catálogo carregam em segundo plano (se ainda não
+    # foram pré-carregados antes do fork): o processo aceita conexões de imediato e
+    # /ready indica quando pode receber tráfego
+    prontidao.iniciar()
+    yield
+    await prontidao.encerrar()
+    await aclose_http_clients()
+    # Fecha as conexões do pool assíncrono (o aiosqlite mantém uma thread por conexão)
+    await get_async_engine().dispose()
 
 def create_app():
     """
     Cria e configura a aplicação FastAPI, incluindo middlewares e rotas.
     Também gerencia a criação/população do banco de dados conforme o ambiente.
     """
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
 
     # Configuração de CORS
     app.add_middleware(
@@ -57,5 +77,11 @@ def create_app():
     app.include_router(EmpresaRouter())
     app.include_router(ProdutoRouter())
     app.include_router(ServicoRouter())
+    app.include_router(FaqRouter())
+    app.include_router(MetricsRouter())
+    app.include_router(HealthRouter())
+
+    # Componentes carregados no startup (ou antes do fork, em servidor.py)
+    prontidao.registrar("catalogo", catalog_cache.aget_snapshot, precarregar=catalog_cache.precarregar)
 
     return app
\ No newline at end of file
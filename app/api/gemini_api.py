@@ -2,6 +2,8 @@
 
 import google.generativeai as genai
 from app.gateway.ia_provider import IAProvider
+from app.exceptions.ia_provider_error import IAProviderError
+from app.gateway.prompt_builder import PromptBuilder
 from app.config.settings import Configuration
 import logging
 
@@ -13,36 +15,56 @@ class GeminiProvider(IAProvider):
     def __init__(self):
         api_key = config.gemini_api_key
         self.assistant_name = config.assistant_name
+        self.prompt_builder = PromptBuilder(self.assistant_name)
         if not api_key:
             raise ValueError("GEMINI_API_KEY não está configurada no ambiente.")
 
         genai.configure(api_key=api_key)
+        # O modelo mantém o canal gRPC aberto e é reutilizado entre as chamadas
         self.model = genai.GenerativeModel("gemini-1.5-flash")
 
-    def gerar_resposta(self, produtos: list, servicos: list, mensagem: str) -> str:
+    def _montar_prompt(self, produtos: list, servicos: list, mensagem: str, historico=None) -> str:
+        return self.prompt_builder.montar_prompt(produtos, servicos, mensagem, historico)
+
+    def _extrair_texto(self, response) -> str:
+        if response and hasattr(response, "text"):
+            return response.text.strip()
+
+        logging.error("Resposta vazia ou inesperada do Gemini.")
+        raise IAProviderError("Resposta não gerada.")
+
+    def gerar_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None) -> str:
         try:
             logging.info(f"Enviando mensagem para Gemini: {mensagem}")
 
-            # Instruções de sistema para orientar o comportamento do Gemini
-            prompt_inicial = f"""
-            Você é um assistente de vendas especializado chamado {self.assistant_name}. 
-            Sua função é fornecer respostas objetivas e precisas sobre os produtos ({produtos}) e serviços ({servicos}) da empresa. 
-            Responda de forma direta e objetiva, sempre em português do Brasil.
-            Não faça perguntas ao usuário. Forneça as informações que lhe competem com firmeza e precisão.
-            Se o usuário perguntar sobre algo que não é vendido pela empresa, informe de forma clara que não trabalhamos com esse item.
-            Evite respostas genéricas, como "sou um modelo de linguagem treinado" ou semelhantes.
-            Responda de forma direta, sem divagações desnecessárias.
-            """
-
             # Gerar resposta com base no prompt
-            response = self.model.generate_content(f"{prompt_inicial}\nPergunta do usuário: {mensagem}")
+            response = self.model.generate_content(self._montar_prompt(produtos, servicos, mensagem, historico))
+            return self._extrair_texto(response)
+
+        except Exception as e:
+            logging.exception("Erro ao chamar Gemini API")
+            raise IAProviderError(f"Erro ao gerar resposta com Gemini: {e}") from e
 
-            if response and hasattr(response, "text"):
-                return response.text.strip()
+    async def agerar_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None) -> str:
+        try:
+            logging.info(f"Enviando mensagem para Gemini: {mensagem}")
 
-            logging.error("Resposta vazia ou inesperada do Gemini.")
-            return "Erro: Resposta não gerada."
+            response = await self.model.generate_content_async(self._montar_prompt(produtos, servicos, mensagem, historico))
+            return self._extrair_texto(response)
 
         except Exception as e:
             logging.exception("Erro ao chamar Gemini API")
-            return f"Erro ao gerar resposta com Gemini: {str(e)}"
\ No newline at end of file
+            raise IAProviderError(f"Erro ao gerar resposta com Gemini: {e}") from e
+
+    async def astream_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None):
+        logging.info(f"Enviando mensagem para Gemini (streaming): {mensagem}")
+        response = await self.model.generate_content_async(self._montar_prompt(produtos, servicos, mensagem, historico), stream=True)
+        async for chunk in response:
+            try:
+                texto = chunk.text
+            except ValueError as e:
+                # O SDK lança ValueError para candidatos bloqueados ou sem conteúdo
+                logging.error(f"Trecho sem texto no streaming do Gemini: {e}")
+                raise IAProviderError(f"Resposta bloqueada ou vazia do Gemini: {e}") from e
+            if texto:
+                yield texto
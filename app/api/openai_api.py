@@ -1,7 +1,10 @@
 # app/api/openai_api.py
 
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from app.gateway.ia_provider import IAProvider
+from app.exceptions.ia_provider_error import IAProviderError
+from app.gateway.prompt_builder import PromptBuilder
+from app.gateway.http_pool import get_http_client, get_async_http_client
 from app.config.settings import Configuration
 import logging
 
@@ -11,30 +14,53 @@ class OpenAIProvider(IAProvider):
     """Implementação do Openai como provedor de IA."""
 
     def __init__(self):
-        self.client = OpenAI(api_key=config.openai_api_key, base_url=config.openai_base_url)
+        # Os clientes reutilizam o pool HTTP compartilhado (keep-alive entre chamadas)
+        self.client = OpenAI(api_key=config.openai_api_key, base_url=config.openai_base_url, http_client=get_http_client())
+        self.async_client = AsyncOpenAI(api_key=config.openai_api_key, base_url=config.openai_base_url, http_client=get_async_http_client())
         self.assistant_name = config.assistant_name
+        self.prompt_builder = PromptBuilder(self.assistant_name)
 
-    def gerar_resposta(self, produtos: list, servicos: list, mensagem: str) -> str:
+    def _montar_mensagens(self, produtos: list, servicos: list, mensagem: str, historico=None) -> list:
+        return self.prompt_builder.montar_mensagens(produtos, servicos, mensagem, historico)
+
+    def gerar_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None) -> str:
         try:
             response = self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content":
-                        f"Você é um assistente de vendas experiente e confiável. Seu nome é {self.assistant_name}. Responda de forma direta e objetiva, sempre em português do Brasil.\n"
-                        f"Se o usuário perguntar sobre produtos, consulte a base de produtos {produtos} e informe os preços e descrições.\n"
-                        f"Se o usuário perguntar sobre serviços, consulte a base de serviços {servicos} e forneça detalhes.\n"
-                        "Não se comporte como uma estagiária. Receba a pergunta, processe e envie a resposta com firmeza. O usuário é seu cliente.\n"
-                        "Se um produto ou serviço não estiver na base, diga que não trabalhamos com ele.\n"
-                        "Evite respostas genéricas ou repetição desnecessária.\n"
-                        "Não invente produtos e serviços, e não mencione exemplos que não correspondam aos produtos e serviços disponíveis."},
-                    {"role": "user", "content": mensagem}
-                ],
+                messages=self._montar_mensagens(produtos, servicos, mensagem, historico),
+                stream=False,
+            )
+
+            if not response.choices:
+                raise IAProviderError("Resposta não gerada.")
+            return response.choices[0].message.content
+
+        except Exception as e:
+            logging.error(f"Erro ao processar IA da Openai: {e}")
+            raise IAProviderError(f"Erro ao gerar resposta com Openai: {e}") from e
+
+    async def agerar_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None) -> str:
+        try:
+            response = await self.async_client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=self._montar_mensagens(produtos, servicos, mensagem, historico),
                 stream=False,
             )
 
-            return response.choices[0].message.content[:200] if response.choices else "Resposta não gerada."
+            if not response.choices:
+                raise IAProviderError("Resposta não gerada.")
+            return response.choices[0].message.content
 
         except Exception as e:
             logging.error(f"Erro ao processar IA da Openai: {e}")
-            return "Erro ao gerar resposta com Openai."
+            raise IAProviderError(f"Erro ao gerar resposta com Openai: {e}") from e
 
+    async def astream_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None):
+        stream = await self.async_client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=self._montar_mensagens(produtos, servicos, mensagem, historico),
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -0,0 +1,16 @@
+class IAProviderError(Exception):
+    """Exceção base para falhas dos provedores de IA."""
+    pass
+
+class IAProviderTimeoutError(IAProviderError):
+    """Exceção lançada quando o provedor não responde dentro do tempo limite."""
+    pass
+
+class IAProviderIndisponivelError(IAProviderError):
+    """Exceção lançada quando nenhum provedor está disponível (todos falharam ou com circuito aberto)."""
+    pass
+
+
+class IAProviderLimiteError(IAProviderError):
+    """Exceção lançada quando a chamada é descartada pelo limite de requisições do provedor."""
+    pass
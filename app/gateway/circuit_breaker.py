@@ -0,0 +1,69 @@
+# app/gateway/circuit_breaker.py
+
+import time
+import threading
+
+class CircuitBreaker:
+    """
+    Disjuntor simples para um provedor externo.
+
+    Após `limite_falhas` falhas consecutivas o circuito abre e as chamadas são
+    recusadas por `tempo_abertura` segundos. Depois disso, uma única chamada de
+    teste é liberada (meio aberto): se ela tiver sucesso o circuito fecha, se
+    falhar ele volta a abrir.
+    """
+
+    FECHADO = "fechado"
+    ABERTO = "aberto"
+    MEIO_ABERTO = "meio_aberto"
+
+    def __init__(self, limite_falhas=5, tempo_abertura=30.0, relogio=time.monotonic):
+        self.limite_falhas = limite_falhas
+        self.tempo_abertura = tempo_abertura
+        self._relogio = relogio
+        self._estado = self.FECHADO
+        self._falhas = 0
+        self._aberto_em = 0.0
+        self._em_teste = False
+        self._lock = threading.Lock()
+
+    @property
+    def estado(self):
+        with self._lock:
+            if self._estado == self.ABERTO and self._relogio() - self._aberto_em >= self.tempo_abertura:
+                return self.MEIO_ABERTO
+            return self._estado
+
+    def permitir(self):
+        """Indica se uma chamada pode ser feita agora (reservando a chamada de teste, se for o caso)."""
+        with self._lock:
+            if self._estado == self.FECHADO:
+                return True
+            if self._estado == self.ABERTO:
+                if self._relogio() - self._aberto_em < self.tempo_abertura:
+                    return False
+                self._estado = self.MEIO_ABERTO
+                self._em_teste = False
+            if self._em_teste:
+                return False
+            self._em_teste = True
+            return True
+
+    def registrar_sucesso(self):
+        with self._lock:
+            self._estado = self.FECHADO
+            self._falhas = 0
+            self._em_teste = False
+
+    def registrar_falha(self):
+        with self._lock:
+            self._falhas += 1
+            self._em_teste = False
+            if self._estado == self.MEIO_ABERTO or self._falhas >= self.limite_falhas:
+                self._estado = self.ABERTO
+                self._aberto_em = self._relogio()
+
+    def liberar(self):
+        """Devolve a chamada de teste reservada sem registrar resultado (ex.: chamada cancelada)."""
+        with self._lock:
+            self._em_teste = False
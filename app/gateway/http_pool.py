@@ -0,0 +1,50 @@
+# app/gateway/http_pool.py
+
+import threading
+import logging
+import httpx
+from app.config.settings import Configuration
+
+config = Configuration()
+
+_lock = threading.Lock()
+_http_client = None
+_async_http_client = None
+
+def _limits():
+    """Limites do pool de conexões definidos na configuração."""
+    return httpx.Limits(
+        max_connections=config.http_max_connections,
+        max_keepalive_connections=config.http_max_keepalive,
+        keepalive_expiry=config.http_keepalive_expiry
+    )
+
+def get_http_client() -> httpx.Client:
+    """Retorna o cliente HTTP síncrono compartilhado (conexões keep-alive reutilizadas)."""
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(limits=_limits(), timeout=config.http_timeout)
+            logging.info("Pool HTTP síncrono criado.")
+        return _http_client
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Retorna o cliente HTTP assíncrono compartilhado (conexões keep-alive reutilizadas)."""
+    global _async_http_client
+    with _lock:
+        if _async_http_client is None:
+            _async_http_client = httpx.AsyncClient(limits=_limits(), timeout=config.http_timeout)
+            logging.info("Pool HTTP assíncrono criado.")
+        return _async_http_client
+
+async def aclose_http_clients():
+    """Fecha os pools HTTP compartilhados. Chamado no encerramento da aplicação."""
+    global _http_client, _async_http_client
+    with _lock:
+        http_client, async_http_client = _http_client, _async_http_client
+        _http_client = _async_http_client = None
+    if http_client is not None:
+        http_client.close()
+    if async_http_client is not None:
+        await async_http_client.aclose()
+    logging.info("Pools HTTP encerrados.")
@@ -1,17 +1,54 @@
 # app/gateway/ia_provider.py
 
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
+from fastapi.concurrency import run_in_threadpool
+
+def argumentos_historico(historico) -> dict:
+    """
+    Argumentos para repassar o histórico da conversa a um provedor.
+
+    Sem histórico, nada é repassado: provedores que não aceitam o argumento
+    continuam funcionando nas conversas sem sessão.
+    """
+    return {"historico": historico} if historico else {}
 
 class IAProvider(ABC):
-    """Interface para diferentes provedores de IA."""
+    """
+    Interface para diferentes provedores de IA.
+
+    O argumento opcional historico (HistoricoSessao) traz os turnos anteriores
+    da conversa, para que o provedor os inclua no prompt.
+    """
 
     @abstractmethod
-    def gerar_resposta(self, produtos: list, servicos: list, mensagem: str) -> str:
+    def gerar_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None) -> str:
         pass
+
+    async def agerar_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None) -> str:
+        """
+        Versão assíncrona de gerar_resposta.
+
+        A implementação padrão executa gerar_resposta em uma thread; provedores
+        com cliente assíncrono nativo devem sobrescrever este método.
+        """
+        return await run_in_threadpool(
+            self.gerar_resposta, produtos, servicos, mensagem, **argumentos_historico(historico)
+        )
+
+    async def astream_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None) -> AsyncIterator[str]:
+        """
+        Gera a resposta em trechos, à medida que o provedor os produz.
+
+        A implementação padrão emite a resposta completa em um único trecho;
+        provedores com suporte a streaming devem sobrescrever este método.
+        Erros do provedor são propagados para quem consome o stream.
+        """
+        yield await self.agerar_resposta(produtos, servicos, mensagem, **argumentos_historico(historico))
     
 
 class IAProviderExemplo(IAProvider):
     """Implementação exemplo do provedor de IA."""
 
     def gerar_resposta(self, mensagem: str) -> str:
-        return f"Resposta gerada para: {mensagem}"
\ No newline at end of file
+        return f"Resposta gerada para: {mensagem}"
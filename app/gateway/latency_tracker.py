@@ -0,0 +1,33 @@
+# app/gateway/latency_tracker.py
+
+import threading
+from collections import deque
+
+class LatencyTracker:
+    """Janela deslizante das latências mais recentes de um provedor, com percentis."""
+
+    def __init__(self, janela=200):
+        self._amostras = deque(maxlen=janela)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._amostras)
+
+    def registrar(self, segundos):
+        with self._lock:
+            self._amostras.append(segundos)
+
+    def percentil(self, p, padrao=None):
+        """
+        Retorna o percentil `p` (0 a 100) das latências registradas.
+
+        Args:
+            p (float): Percentil desejado.
+            padrao: Valor retornado quando ainda não há amostras.
+        """
+        with self._lock:
+            amostras = sorted(self._amostras)
+        if not amostras:
+            return padrao
+        indice = min(len(amostras) - 1, max(0, round(p / 100 * (len(amostras) - 1))))
+        return amostras[indice]
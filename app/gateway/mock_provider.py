@@ -1,14 +1,25 @@
 # app/gateway/mock_provider.py
 
+import asyncio
 import json
 import os
+import random
+import time
+from app.config.settings import Configuration
 from app.gateway.ia_provider import IAProvider
+from app.exceptions.ia_provider_error import IAProviderError
+
+config = Configuration()
 
 class MockProvider(IAProvider):
     """Provedor de IA mockado para testes."""
 
-    def __init__(self, mock_file="app/config/mock_responses.json"):
+    def __init__(self, mock_file="app/config/mock_responses.json", latency_ms=None, error_rate=None):
         self.mock_file = mock_file
+        # Latência artificial para simular o tempo de resposta de um provedor real
+        self.latency = (config.mock_latency_ms if latency_ms is None else latency_ms) / 1000
+        self.error_rate = config.mock_error_rate if error_rate is None else error_rate
+        self.stream_interval = config.mock_stream_interval_ms / 1000
         self.responses = self._load_mock_responses()
 
     def _load_mock_responses(self):
@@ -17,7 +28,29 @@ class MockProvider(IAProvider):
                 return json.load(file)
         return {}
 
-    def gerar_resposta(self, produtos: list, servicos: list, mensagem: str) -> str:
+    def _talvez_falhar(self):
+        if self.error_rate and random.random() < self.error_rate:
+            raise IAProviderError("Mock: falha simulada do provedor.")
+
+    def gerar_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        self._talvez_falhar()
         return self.responses.get(mensagem, "Mock: Desculpe, não tenho uma resposta para essa pergunta.")
 
+    async def agerar_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self._talvez_falhar()
+        return self.responses.get(mensagem, "Mock: Desculpe, não tenho uma resposta para essa pergunta.")
 
+    async def astream_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None):
+        """Emite a resposta palavra por palavra, em intervalos fixos, simulando streaming."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self._talvez_falhar()
+        resposta = self.responses.get(mensagem, "Mock: Desculpe, não tenho uma resposta para essa pergunta.")
+        for i, palavra in enumerate(resposta.split(" ")):
+            if i:
+                await asyncio.sleep(self.stream_interval)
+            yield palavra if i == 0 else f" {palavra}"
@@ -0,0 +1,145 @@
+# app/gateway/prompt_builder.py
+
+import math
+from itertools import chain, zip_longest
+from app.config.settings import Configuration
+
+config = Configuration()
+
+def estimar_tokens(texto: str) -> int:
+    """Estimativa conservadora de tokens (cerca de 4 caracteres por token em português)."""
+    return math.ceil(len(texto) / 4)
+
+def formatar_preco(preco) -> str:
+    """Formata o preço no padrão brasileiro (R$ 1.234,56)."""
+    return "R$ " + f"{preco:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+class PromptBuilder:
+    """
+    Monta o prompt enviado aos provedores de IA a partir dos itens selecionados do catálogo.
+
+    Os itens chegam ordenados por relevância e são incluídos, com preço e
+    descrição, até esgotar o orçamento de tokens do contexto; o restante é
+    descartado. Todos os provedores usam as mesmas instruções.
+
+    Nas conversas com sessão, o histórico também tem orçamento próprio: entram
+    os turnos mais recentes que couberem e, com o que sobrar, o resumo dos
+    turnos anteriores.
+    """
+
+    def __init__(self, assistant_name=None, max_tokens=None, max_descricao=None, max_tokens_historico=None):
+        """
+        Args:
+            assistant_name (str): Nome da assistente.
+            max_tokens (int): Orçamento de tokens para a lista de itens do catálogo.
+            max_descricao (int): Tamanho máximo, em caracteres, da descrição de cada item.
+            max_tokens_historico (int): Orçamento de tokens para o histórico da conversa.
+        """
+        self.assistant_name = assistant_name or config.assistant_name
+        self.max_tokens = config.prompt_max_tokens if max_tokens is None else max_tokens
+        self.max_descricao = config.prompt_max_descricao if max_descricao is None else max_descricao
+        self.max_tokens_historico = (
+            config.session_history_max_tokens if max_tokens_historico is None else max_tokens_historico
+        )
+
+    def formatar_item(self, item) -> str:
+        """Linha do item no prompt; aceita também apenas o nome (str)."""
+        if isinstance(item, str):
+            return f"- {item}"
+        linha = f"- {item.nome} ({formatar_preco(item.preco)}"
+        if item.categoria:
+            linha += f"; {item.categoria}"
+        linha += ")"
+        descricao = " ".join((item.descricao or "").split())
+        if descricao:
+            if len(descricao) > self.max_descricao:
+                descricao = descricao[:self.max_descricao - 3].rstrip() + "..."
+            linha += f": {descricao}"
+        return linha
+
+    def montar_contexto(self, produtos: list, servicos: list) -> str:
+        """
+        Lista os itens dentro do orçamento de tokens, alternando produtos e serviços
+        para que nenhum dos dois tipos seja descartado por inteiro.
+        """
+        linhas_produtos, linhas_servicos = [], []
+        restante = self.max_tokens
+        alternados = chain.from_iterable(zip_longest(
+            ((linhas_produtos, p) for p in produtos),
+            ((linhas_servicos, s) for s in servicos)
+        ))
+        for par in alternados:
+            if par is None:
+                continue
+            destino, item = par
+            linha = self.formatar_item(item)
+            custo = estimar_tokens(linha) + 1
+            if custo > restante:
+                break
+            restante -= custo
+            destino.append(linha)
+
+        secoes = []
+        if linhas_produtos:
+            secoes.append("Produtos:\n" + "\n".join(linhas_produtos))
+        if linhas_servicos:
+            secoes.append("Serviços:\n" + "\n".join(linhas_servicos))
+        if not secoes:
+            return "Nenhum item do catálogo corresponde à pergunta."
+        return "\n\n".join(secoes)
+
+    def selecionar_historico(self, historico):
+        """
+        Parte do histórico que cabe no orçamento de tokens.
+
+        Returns:
+            tuple: (resumo, turnos), com os turnos em ordem cronológica.
+        """
+        if not historico:
+            return "", []
+        restante = self.max_tokens_historico
+        turnos = []
+        for pergunta, resposta in reversed(historico.turnos):
+            custo = estimar_tokens(pergunta) + estimar_tokens(resposta) + 2
+            if custo > restante:
+                break
+            restante -= custo
+            turnos.append((pergunta, resposta))
+        turnos.reverse()
+        resumo = historico.resumo if estimar_tokens(historico.resumo) <= restante else ""
+        return resumo, turnos
+
+    def montar_sistema(self, produtos: list, servicos: list, resumo: str = "") -> str:
+        """Instruções de sistema com os itens relevantes do catálogo e, se houver, o resumo da conversa."""
+        sistema = (
+            f"Você é um assistente de vendas experiente e confiável. Seu nome é {self.assistant_name}. Responda de forma direta e objetiva, sempre em português do Brasil.\n"
+            "Abaixo estão os itens do catálogo mais relacionados à pergunta, com preços e descrições. "
+            "Use-os para informar preços e detalhes de produtos e serviços.\n"
+            "Não se comporte como uma estagiária. Receba a pergunta, processe e envie a resposta com firmeza. O usuário é seu cliente.\n"
+            "Se o produto ou serviço perguntado não estiver na lista, diga que não trabalhamos com ele.\n"
+            "Evite respostas genéricas ou repetição desnecessária.\n"
+            "Não invente produtos e serviços, e não mencione exemplos que não correspondam aos produtos e serviços listados.\n\n"
+            f"{self.montar_contexto(produtos, servicos)}"
+        )
+        if resumo:
+            sistema += f"\n\nConversa anterior: {resumo}"
+        return sistema
+
+    def montar_mensagens(self, produtos: list, servicos: list, mensagem: str, historico=None) -> list:
+        """Prompt no formato de mensagens de chat (OpenAI e compatíveis), com os turnos anteriores da conversa."""
+        resumo, turnos = self.selecionar_historico(historico)
+        mensagens = [{"role": "system", "content": self.montar_sistema(produtos, servicos, resumo)}]
+        for pergunta, resposta in turnos:
+            mensagens.append({"role": "user", "content": pergunta})
+            mensagens.append({"role": "assistant", "content": resposta})
+        mensagens.append({"role": "user", "content": mensagem})
+        return mensagens
+
+    def montar_prompt(self, produtos: list, servicos: list, mensagem: str, historico=None) -> str:
+        """Prompt em texto único (Gemini)."""
+        resumo, turnos = self.selecionar_historico(historico)
+        prompt = self.montar_sistema(produtos, servicos, resumo)
+        if turnos:
+            conversa = "\n".join(f"Cliente: {pergunta}\nAssistente: {resposta}" for pergunta, resposta in turnos)
+            prompt += f"\n\nConversa até aqui:\n{conversa}"
+        return f"{prompt}\n\nPergunta do usuário: {mensagem}"
@@ -3,30 +3,70 @@
 from app.config.settings import Configuration
 from app.gateway.ia_provider import IAProvider
 
-from app.api.deepseek_api import DeepSeekProvider
-from app.api.gemini_api import GeminiProvider
-from app.api.openai_api import OpenAIProvider
-
 from app.gateway.mock_provider import MockProvider
+from app.gateway.provider_router import ProviderRouter
 
 import logging
+import threading
 
 config = Configuration()
 
-def get_ia_provider() -> IAProvider:
-    """Retorna a instância do provedor de IA configurado."""
-    
-    if config.ia_provider == "mock":
+_lock = threading.Lock()
+_provider = None
+
+def _instanciar(provider: str) -> IAProvider:
+    """
+    Instancia um provedor de IA pelo nome.
+
+    O SDK de cada provedor (google.generativeai, openai) só é importado quando
+    o provedor é usado, para não pesar na subida dos demais.
+    """
+    if provider == "mock":
         logging.info("Usando MockProvider para respostas de IA.")
         return MockProvider()
 
-    provider = config.ia_provider
     logging.info(f"Inteligência Artificial escolhida: {provider}")
 
     if provider == "gemini":
+        from app.api.gemini_api import GeminiProvider
         return GeminiProvider()
     elif provider == "openai":
+        from app.api.openai_api import OpenAIProvider
         return OpenAIProvider()
     else:
+        from app.api.deepseek_api import DeepSeekProvider
         return DeepSeekProvider()
 
+def _criar_provider() -> IAProvider:
+    """
+    Instancia o provedor de IA configurado.
+
+    Os provedores listados em IA_PROVIDERS (ou apenas IA_PROVIDER) são
+    combinados por um ProviderRouter, que aplica tempo limite, disjuntor,
+    limite de requisições e, havendo mais de um, hedge/failover entre eles. Provedores que não puderem
+    ser criados (por exemplo, sem chave de API) são ignorados.
+    """
+    nomes = config.ia_providers or [config.ia_provider]
+    provedores = {}
+    for nome in nomes:
+        try:
+            provedores[nome] = _instanciar(nome)
+        except Exception as e:
+            if len(nomes) == 1:
+                raise
+            logging.error(f"Não foi possível criar o provedor de IA {nome}: {e}")
+    return ProviderRouter(provedores, redis_client=config.get_async_redis_client())
+
+def get_ia_provider() -> IAProvider:
+    """
+    Retorna a instância do provedor de IA configurado.
+
+    O provedor é criado uma única vez por processo e reutilizado em todas as
+    chamadas, mantendo clientes e conexões HTTP abertos entre requisições.
+    """
+    global _provider
+    if _provider is None:
+        with _lock:
+            if _provider is None:
+                _provider = _criar_provider()
+    return _provider
@@ -0,0 +1,296 @@
+# app/gateway/provider_router.py
+
+import asyncio
+import logging
+import time
+from typing import AsyncIterator
+from app.config.settings import Configuration
+from app.gateway.ia_provider import IAProvider, argumentos_historico
+from app.gateway.circuit_breaker import CircuitBreaker
+from app.gateway.latency_tracker import LatencyTracker
+from app.gateway.rate_limiter import RateLimiter
+from app.utils.metrics import PROVEDOR_SEGUNDOS, PROVEDOR_EM_ANDAMENTO
+from app.exceptions.ia_provider_error import (
+    IAProviderTimeoutError, IAProviderIndisponivelError, IAProviderLimiteError
+)
+
+config = Configuration()
+
+# Amostras mínimas antes de usar o p95 medido como atraso do hedge
+_MIN_AMOSTRAS = 20
+
+class ProviderRouter(IAProvider):
+    """
+    Provedor composto que distribui as perguntas entre vários provedores de IA.
+
+    Modos:
+        - "hedge": chama o primeiro provedor e, se ele não responder dentro do
+          seu p95 de latência, dispara o próximo; vale a primeira resposta boa.
+        - "race": chama todos ao mesmo tempo e fica com a primeira resposta boa.
+        - "failover": chama um de cada vez, passando ao próximo só após uma falha.
+
+    Cada provedor tem tempo limite, disjuntor (circuit breaker), limite de
+    requisições e registro de latência próprios. As chamadas que perdem a
+    disputa são canceladas. Tempo limite e limite de requisições valem para
+    os métodos assíncronos; gerar_resposta (síncrono) só usa os disjuntores.
+    """
+
+    MODOS = ("hedge", "race", "failover")
+
+    def __init__(self, provedores, modo=None, timeout=None, atraso_hedge=None, atraso_minimo=None,
+                 limite_falhas=None, tempo_abertura=None, redis_client=None, limitadores=None):
+        """
+        Args:
+            provedores (dict): Nome -> IAProvider, na ordem de preferência.
+            modo (str): "hedge", "race" ou "failover".
+            timeout (float): Tempo limite de cada provedor, em segundos.
+            atraso_hedge (float): Atraso inicial do hedge, usado até haver amostras de latência.
+            atraso_minimo (float): Menor atraso permitido para o hedge.
+            limite_falhas (int): Falhas consecutivas que abrem o disjuntor.
+            tempo_abertura (float): Segundos que o disjuntor fica aberto.
+            redis_client: Cliente Redis assíncrono que compartilha os limites entre workers.
+            limitadores (dict): Nome -> RateLimiter, substituindo os criados a partir da configuração.
+        """
+        if not provedores:
+            raise ValueError("Informe ao menos um provedor de IA.")
+        self.provedores = dict(provedores)
+        self.modo = (modo or config.ia_router_mode).lower()
+        if self.modo not in self.MODOS:
+            raise ValueError(f"Modo de roteamento inválido: {self.modo}")
+        self.timeout = config.ia_provider_timeout if timeout is None else timeout
+        self.atraso_hedge = config.ia_hedge_delay_ms / 1000 if atraso_hedge is None else atraso_hedge
+        self.atraso_minimo = config.ia_hedge_min_delay_ms / 1000 if atraso_minimo is None else atraso_minimo
+        limite_falhas = config.ia_circuit_failures if limite_falhas is None else limite_falhas
+        tempo_abertura = config.ia_circuit_reset if tempo_abertura is None else tempo_abertura
+        self.disjuntores = {nome: CircuitBreaker(limite_falhas, tempo_abertura) for nome in self.provedores}
+        self.latencias = {nome: LatencyTracker() for nome in self.provedores}
+        self.limitadores = {nome: RateLimiter(nome, redis_client=redis_client) for nome in self.provedores}
+        self.limitadores.update(limitadores or {})
+        self.contadores = {
+            nome: {"chamadas": 0, "sucessos": 0, "falhas": 0, "timeouts": 0, "cancelados": 0, "limitados": 0}
+            for nome in self.provedores
+        }
+        self.hedges_disparados = 0
+
+    def _atraso(self, nome):
+        """Tempo de espera antes de disparar o próximo provedor."""
+        if self.modo == "race":
+            return 0
+        if self.modo == "failover":
+            return None
+        if len(self.latencias[nome]) < _MIN_AMOSTRAS:
+            return self.atraso_hedge
+        return max(self.atraso_minimo, self.latencias[nome].percentil(95))
+
+    def _candidatos(self):
+        candidatos = [nome for nome in self.provedores if self.disjuntores[nome].permitir()]
+        if not candidatos:
+            raise IAProviderIndisponivelError("Nenhum provedor de IA disponível no momento.")
+        return candidatos
+
+    async def _chamar(self, nome, operacao):
+        """Executa a operação no provedor com tempo limite, medindo latência e alimentando o disjuntor."""
+        contadores = self.contadores[nome]
+        inicio = None
+        resultado_metrica = "erro"
+        try:
+            # A espera na fila do limite não conta para o tempo limite do provedor
+            if not await self.limitadores[nome].adquirir():
+                contadores["limitados"] += 1
+                self.disjuntores[nome].liberar()
+                raise IAProviderLimiteError(f"Limite de requisições do provedor {nome} atingido.")
+            contadores["chamadas"] += 1
+            inicio = time.perf_counter()
+            with PROVEDOR_EM_ANDAMENTO.acompanhar(provedor=nome):
+                resultado = await asyncio.wait_for(operacao(self.provedores[nome]), self.timeout)
+            resultado_metrica = "sucesso"
+        except asyncio.CancelledError:
+            resultado_metrica = "cancelado"
+            contadores["cancelados"] += 1
+            self.disjuntores[nome].liberar()
+            raise
+        except IAProviderLimiteError:
+            raise
+        except asyncio.TimeoutError:
+            resultado_metrica = "timeout"
+            contadores["timeouts"] += 1
+            contadores["falhas"] += 1
+            self.disjuntores[nome].registrar_falha()
+            raise IAProviderTimeoutError(f"Provedor {nome} excedeu {self.timeout}s.")
+        except Exception:
+            contadores["falhas"] += 1
+            self.disjuntores[nome].registrar_falha()
+            raise
+        finally:
+            if inicio is not None:
+                PROVEDOR_SEGUNDOS.observar(time.perf_counter() - inicio, provedor=nome, resultado=resultado_metrica)
+        self.latencias[nome].registrar(time.perf_counter() - inicio)
+        self.disjuntores[nome].registrar_sucesso()
+        contadores["sucessos"] += 1
+        return resultado
+
+    async def _disputar(self, operacao, descartar=None):
+        """
+        Dispara a operação nos provedores conforme o modo e retorna (nome, resultado)
+        do primeiro que tiver sucesso, cancelando os demais.
+
+        Args:
+            operacao (callable): Recebe o provedor e retorna a corrotina a executar.
+            descartar (callable): Corrotina chamada com os resultados que chegaram
+                junto com o vencedor e não serão usados (para liberar recursos).
+        """
+        candidatos = self._candidatos()
+        fila = list(candidatos)
+        pendentes = {}
+        erros = []
+
+        def disparar():
+            nome = fila.pop(0)
+            pendentes[asyncio.ensure_future(self._chamar(nome, operacao))] = nome
+            return nome
+
+        ultimo = disparar()
+        try:
+            while pendentes:
+                espera = self._atraso(ultimo) if fila else None
+                concluidas, _ = await asyncio.wait(pendentes, timeout=espera, return_when=asyncio.FIRST_COMPLETED)
+
+                if not concluidas:
+                    # O provedor atual está lento: dispara o próximo sem cancelar o anterior
+                    self.hedges_disparados += 1
+                    logging.info(f"Provedor {ultimo} lento; disparando {fila[0]} em paralelo.")
+                    ultimo = disparar()
+                    continue
+
+                for tarefa in concluidas:
+                    nome = pendentes.pop(tarefa)
+                    erro = tarefa.exception()
+                    if erro is None:
+                        return nome, tarefa.result()
+                    logging.error(f"Falha no provedor de IA {nome}: {erro}")
+                    erros.append(erro)
+
+                # Houve falha: o próximo provedor é chamado imediatamente
+                if fila:
+                    ultimo = disparar()
+        finally:
+            for tarefa in pendentes:
+                tarefa.cancel()
+            if pendentes:
+                await asyncio.gather(*pendentes, return_exceptions=True)
+            if descartar is not None:
+                for tarefa in pendentes:
+                    if not tarefa.cancelled() and tarefa.exception() is None:
+                        await descartar(tarefa.result())
+            # Disjuntores em meio aberto que não entraram na disputa devolvem a chamada de teste
+            for nome in fila:
+                self.disjuntores[nome].liberar()
+
+        if erros and all(isinstance(erro, IAProviderLimiteError) for erro in erros):
+            raise IAProviderLimiteError("Todos os provedores de IA estão no limite de requisições.")
+        raise IAProviderIndisponivelError(f"Todos os provedores de IA falharam: {erros}")
+
+    def gerar_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None) -> str:
+        """
+        Versão síncrona: tenta os provedores em sequência, respeitando apenas os disjuntores.
+
+        Não passa pelo limite de requisições compartilhado (RateLimiter) nem
+        aplica o tempo limite do roteador: vale só o tempo limite HTTP de cada
+        provedor, quando houver. A aplicação usa apenas agerar_resposta e
+        astream_resposta; este método existe para uso fora do event loop
+        (scripts e testes) e não deve ser usado no atendimento.
+        """
+        erros = []
+        argumentos = argumentos_historico(historico)
+        fila = self._candidatos()
+        try:
+            while fila:
+                nome = fila.pop(0)
+                try:
+                    resposta = self.provedores[nome].gerar_resposta(produtos, servicos, mensagem, **argumentos)
+                except Exception as e:
+                    logging.error(f"Falha no provedor de IA {nome}: {e}")
+                    self.disjuntores[nome].registrar_falha()
+                    erros.append(e)
+                    continue
+                self.disjuntores[nome].registrar_sucesso()
+                return resposta
+        finally:
+            # Disjuntores em meio aberto que não chegaram a ser chamados devolvem a chamada de teste
+            for nome in fila:
+                self.disjuntores[nome].liberar()
+        raise IAProviderIndisponivelError(f"Todos os provedores de IA falharam: {erros}")
+
+    async def agerar_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None) -> str:
+        argumentos = argumentos_historico(historico)
+        _, resposta = await self._disputar(lambda p: p.agerar_resposta(produtos, servicos, mensagem, **argumentos))
+        return resposta
+
+    async def astream_resposta(self, produtos: list, servicos: list, mensagem: str, historico=None) -> AsyncIterator[str]:
+        """
+        Streaming com hedge sobre o primeiro trecho: o provedor que produzir o
+        primeiro trecho antes é o escolhido e os demais são cancelados. Depois
+        disso não há troca de provedor, pois trechos já foram enviados ao cliente;
+        cada trecho seguinte tem o mesmo tempo limite, e um provedor que para no
+        meio do stream conta como falha no disjuntor.
+        """
+        argumentos = argumentos_historico(historico)
+
+        async def abrir(provedor):
+            stream = provedor.astream_resposta(produtos, servicos, mensagem, **argumentos)
+            try:
+                return stream, await stream.__anext__()
+            except StopAsyncIteration:
+                await stream.aclose()
+                return None, None
+            except BaseException:
+                await stream.aclose()
+                raise
+
+        async def fechar(resultado):
+            if resultado[0] is not None:
+                await resultado[0].aclose()
+
+        nome, (stream, primeiro) = await self._disputar(abrir, descartar=fechar)
+        if stream is None:
+            return
+        try:
+            yield primeiro
+            while True:
+                try:
+                    trecho = await asyncio.wait_for(stream.__anext__(), self.timeout)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    self.contadores[nome]["timeouts"] += 1
+                    self._registrar_falha_stream(nome)
+                    raise IAProviderTimeoutError(f"Provedor {nome} parou de enviar trechos por {self.timeout}s.")
+                except Exception:
+                    self._registrar_falha_stream(nome)
+                    raise
+                yield trecho
+        finally:
+            await stream.aclose()
+
+    def _registrar_falha_stream(self, nome):
+        """Falha de um provedor depois do primeiro trecho (o sucesso já foi registrado ao abrir o stream)."""
+        self.contadores[nome]["falhas"] += 1
+        self.disjuntores[nome].registrar_falha()
+
+    async def atualizar_limites(self, nome, requisicoes, intervalo):
+        """Aplica ao provedor, em todos os workers, os limites descobertos na API dele (ex.: /check_token_status)."""
+        if nome in self.limitadores:
+            await self.limitadores[nome].publicar_limites(requisicoes, intervalo)
+
+    def estatisticas(self):
+        """Situação de cada provedor: disjuntor, contadores, latências (p50/p95, em segundos) e fila do limite."""
+        return {
+            nome: {
+                "estado": self.disjuntores[nome].estado,
+                **self.contadores[nome],
+                "p50": self.latencias[nome].percentil(50),
+                "p95": self.latencias[nome].percentil(95),
+                "limite": self.limitadores[nome].estatisticas(),
+            }
+            for nome in self.provedores
+        }
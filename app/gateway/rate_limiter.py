@@ -0,0 +1,228 @@
+# app/gateway/rate_limiter.py
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from redis.exceptions import RedisError
+from app.config.settings import Configuration
+from app.gateway.latency_tracker import LatencyTracker
+
+config = Configuration()
+
+# Balde de fichas atômico no Redis: repõe as fichas pelo tempo decorrido e tenta
+# consumir uma. Retorna 0 se conseguiu ou quantos ms faltam para a próxima ficha.
+# Os limites publicados em KEYS[2] (descobertos na API do provedor) prevalecem
+# sobre os do worker, para que todos reponham o balde com os mesmos parâmetros.
+_CONSUMIR_FICHA = """
+local capacidade = tonumber(ARGV[1])
+local taxa = tonumber(ARGV[2])
+local agora = tonumber(ARGV[3])
+local limites = redis.call("HMGET", KEYS[2], "requisicoes", "intervalo", "capacidade")
+if limites[1] then
+    local requisicoes = tonumber(limites[1])
+    local intervalo = tonumber(limites[2])
+    if requisicoes <= 0 or intervalo <= 0 then
+        return 0
+    end
+    capacidade = tonumber(limites[3])
+    taxa = requisicoes / (intervalo * 1000)
+end
+local dados = redis.call("HMGET", KEYS[1], "fichas", "ts")
+local fichas = tonumber(dados[1]) or capacidade
+local ts = tonumber(dados[2]) or agora
+fichas = math.min(capacidade, fichas + math.max(0, agora - ts) * taxa)
+local espera = 0
+if fichas >= 1 then
+    fichas = fichas - 1
+else
+    espera = math.ceil((1 - fichas) / taxa)
+end
+redis.call("HSET", KEYS[1], "fichas", tostring(fichas), "ts", tostring(agora))
+redis.call("PEXPIRE", KEYS[1], math.ceil(capacidade / taxa) + 1000)
+return espera
+"""
+
+_UNIDADES = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Intervalo, em segundos, entre as leituras dos limites publicados no Redis
+_SINCRONIZAR_LIMITES = 5.0
+
+def converter_intervalo(intervalo) -> float:
+    """
+    Converte intervalos como "10s", "1m" ou 60 em segundos.
+
+    Args:
+        intervalo (str | float): Intervalo informado pela configuração ou pelo provedor.
+
+    Returns:
+        float: Intervalo em segundos.
+    """
+    if isinstance(intervalo, (int, float)):
+        return float(intervalo)
+    encontrado = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h|d)?\s*", str(intervalo).lower())
+    if not encontrado:
+        raise ValueError(f"Intervalo inválido: {intervalo}")
+    return float(encontrado.group(1)) * _UNIDADES[encontrado.group(2) or "s"]
+
+class RateLimiter:
+    """
+    Limitador de chamadas a um provedor de IA por balde de fichas (token bucket).
+
+    O balde fica no Redis ("<namespace>:ratelimit:<provedor>") e é
+    compartilhado por todos os workers; se o Redis estiver indisponível, um
+    balde local ao processo é usado no lugar. Limites descobertos na API do
+    provedor são publicados ao lado do balde (chave "...:limites") e valem de
+    imediato para o balde compartilhado; cada worker relê essa chave a cada
+    poucos segundos para atualizar a sua cópia local. Chamadas sem ficha
+    aguardam em fila até `max_espera`; se a fila estiver cheia ou a espera for
+    maior que isso, a chamada é descartada.
+    """
+
+    def __init__(self, nome, requisicoes=None, intervalo=None, capacidade=None,
+                 redis_client=None, max_fila=None, max_espera=None, namespace=None):
+        """
+        Args:
+            nome (str): Nome do provedor (compõe a chave no Redis).
+            requisicoes (int): Requisições permitidas por intervalo (0 desativa o limite).
+            intervalo (str | float): Janela do limite ("10s", "1m" ou segundos).
+            capacidade (int): Rajada máxima; por padrão, igual a `requisicoes`.
+            redis_client: Cliente Redis assíncrono para o balde compartilhado.
+            max_fila (int): Número máximo de chamadas aguardando ficha.
+            max_espera (float): Espera máxima por uma ficha, em segundos.
+            namespace (str): Prefixo das chaves no Redis; por padrão, CACHE_NAMESPACE.
+        """
+        self.nome = nome
+        self.redis_client = redis_client
+        self.chave = f"{namespace or config.cache_namespace}:ratelimit:{nome}"
+        self.chave_limites = f"{self.chave}:limites"
+        self._sincronizado_em = float("-inf")
+        self.max_fila = config.ia_queue_max if max_fila is None else max_fila
+        self.max_espera = config.ia_queue_max_wait_ms / 1000 if max_espera is None else max_espera
+        self._lock = threading.Lock()
+        self._fichas = None
+        self._atualizado_em = time.monotonic()
+        self.atualizar_limites(
+            config.ia_rate_limit_requests if requisicoes is None else requisicoes,
+            config.ia_rate_limit_interval if intervalo is None else intervalo,
+            capacidade
+        )
+        self.fila = 0
+        self.esperas = LatencyTracker()
+        self.contadores = {"admitidos": 0, "descartados": 0}
+
+    def atualizar_limites(self, requisicoes, intervalo, capacidade=None):
+        """Aplica novos limites (configurados ou descobertos na API do provedor)."""
+        self.requisicoes = int(requisicoes or 0)
+        self.intervalo = converter_intervalo(intervalo)
+        self.capacidade = int(capacidade or self.requisicoes)
+        # Fichas repostas por segundo
+        self.taxa = self.requisicoes / self.intervalo if self.requisicoes and self.intervalo > 0 else 0.0
+        with self._lock:
+            self._fichas = float(self.capacidade) if self._fichas is None else min(self._fichas, self.capacidade)
+        logging.info(f"Limite do provedor {self.nome}: {self.requisicoes} requisições a cada {self.intervalo}s.")
+
+    async def publicar_limites(self, requisicoes, intervalo, capacidade=None):
+        """
+        Aplica os limites descobertos na API do provedor e os publica no Redis,
+        para que todos os workers passem a usá-los.
+        """
+        self.atualizar_limites(requisicoes, intervalo, capacidade)
+        if self.redis_client is None:
+            return
+        try:
+            await self.redis_client.hset(self.chave_limites, mapping={
+                "requisicoes": self.requisicoes, "intervalo": self.intervalo, "capacidade": self.capacidade
+            })
+        except RedisError as e:
+            logging.error(f"Erro ao publicar os limites do provedor {self.nome} no Redis: {e}")
+
+    async def _sincronizar_limites(self):
+        """Aplica os limites publicados por outro worker (no máximo uma leitura a cada poucos segundos)."""
+        agora = time.monotonic()
+        if self.redis_client is None or agora - self._sincronizado_em < _SINCRONIZAR_LIMITES:
+            return
+        self._sincronizado_em = agora
+        try:
+            requisicoes, intervalo, capacidade = await self.redis_client.hmget(
+                self.chave_limites, "requisicoes", "intervalo", "capacidade"
+            )
+        except RedisError as e:
+            logging.error(f"Erro ao ler os limites do provedor {self.nome} no Redis: {e}")
+            return
+        if requisicoes is None:
+            return
+        requisicoes, intervalo, capacidade = int(requisicoes), float(intervalo), int(capacidade)
+        if (requisicoes, intervalo, capacidade) != (self.requisicoes, self.intervalo, self.capacidade):
+            self.atualizar_limites(requisicoes, intervalo, capacidade)
+
+    @property
+    def ativo(self):
+        return self.taxa > 0
+
+    def _consumir_local(self):
+        with self._lock:
+            agora = time.monotonic()
+            self._fichas = min(self.capacidade, self._fichas + (agora - self._atualizado_em) * self.taxa)
+            self._atualizado_em = agora
+            if self._fichas >= 1:
+                self._fichas -= 1
+                return 0.0
+            return (1 - self._fichas) / self.taxa
+
+    async def _consumir(self):
+        """Tenta consumir uma ficha; retorna 0 ou os segundos até a próxima ficha."""
+        if self.redis_client is not None:
+            try:
+                espera_ms = await self.redis_client.eval(
+                    _CONSUMIR_FICHA, 2, self.chave, self.chave_limites,
+                    self.capacidade, self.taxa / 1000, int(time.time() * 1000)
+                )
+                return int(espera_ms) / 1000
+            except RedisError as e:
+                logging.error(f"Erro ao consultar o limitador no Redis, usando limite local: {e}")
+        return self._consumir_local()
+
+    async def adquirir(self) -> bool:
+        """
+        Aguarda uma ficha para chamar o provedor.
+
+        Returns:
+            bool: True se a chamada foi admitida; False se foi descartada (fila cheia
+            ou espera acima do máximo).
+        """
+        await self._sincronizar_limites()
+        if not self.ativo:
+            return True
+        if self.fila >= self.max_fila:
+            self.contadores["descartados"] += 1
+            return False
+
+        self.fila += 1
+        inicio = time.perf_counter()
+        try:
+            while True:
+                espera = await self._consumir()
+                decorrido = time.perf_counter() - inicio
+                if espera <= 0:
+                    self.esperas.registrar(decorrido)
+                    self.contadores["admitidos"] += 1
+                    return True
+                if decorrido + espera > self.max_espera:
+                    self.contadores["descartados"] += 1
+                    return False
+                await asyncio.sleep(espera)
+        finally:
+            self.fila -= 1
+
+    def estatisticas(self):
+        """Limite atual, profundidade da fila e tempos de espera (p50/p95, em segundos)."""
+        return {
+            "requisicoes": self.requisicoes,
+            "intervalo": self.intervalo,
+            "fila": self.fila,
+            **self.contadores,
+            "espera_p50": self.esperas.percentil(50, 0.0),
+            "espera_p95": self.esperas.percentil(95, 0.0),
+        }
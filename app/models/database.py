@@ -3,28 +3,158 @@
 import os
 import json
 import logging
+import threading
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import SQLModel, Session, create_engine, select
-from app.models.models import Empresa, Produto, Servico  # Importando a classe Servico
+from app.config.settings import Configuration
+from app.utils.metrics import ERROS_DB
+from app.models.models import Empresa, Produto, Servico, Faq  # Importando a classe Servico
 
 # Configuração do logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+config = Configuration()
+
+_engines = {}
+_engines_async = {}
+_engines_lock = threading.Lock()
+
+# Driver assíncrono usado para cada driver síncrono (quando DATABASE_ASYNC_URL não é informada)
+_DRIVERS_ASYNC = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+}
+
+def _url_sqlite(db_name):
+    return f"sqlite:///{db_name}"
+
+def _eh_sqlite(url):
+    return make_url(url).get_backend_name() == "sqlite"
+
+def url_async(url):
+    """URL equivalente com driver assíncrono (ex.: sqlite:///x.db -> sqlite+aiosqlite:///x.db)."""
+    url = make_url(url)
+    driver = _DRIVERS_ASYNC.get(url.drivername)
+    if driver is None:
+        raise ValueError(f"Sem driver assíncrono conhecido para {url.drivername}; informe DATABASE_ASYNC_URL.")
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+def _configurar_conexao(conexao, _registro):
+    """Pragmas aplicados a cada nova conexão SQLite do pool."""
+    cursor = conexao.cursor()
+    if config.db_wal:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={config.db_synchronous}")
+    # Valor negativo: tamanho em KiB, em vez de número de páginas
+    cursor.execute(f"PRAGMA cache_size=-{config.db_cache_mb * 1024}")
+    cursor.execute(f"PRAGMA mmap_size={config.db_mmap_mb * 1024 * 1024}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def _opcoes_engine(url):
+    """Argumentos de create_engine / create_async_engine para o banco da URL."""
+    opcoes = {"echo": False, "pool_size": config.db_pool_size, "max_overflow": config.db_max_overflow}
+    if _eh_sqlite(url):
+        opcoes["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": config.db_busy_timeout,
+            "cached_statements": config.db_statement_cache,
+        }
+    else:
+        # Conexões de servidores remotos podem cair entre requisições (failover, balanceador)
+        opcoes["pool_pre_ping"] = True
+    return opcoes
+
+def criar_engine(url):
+    """
+    Cria um engine ajustado para acesso concorrente.
+
+    No SQLite, usa journal WAL (leitores não esperam pelos escritores),
+    synchronous NORMAL (seguro com WAL, sem fsync a cada commit), cache de
+    páginas e mmap maiores, espera por travas em vez de falhar de imediato e
+    cache de instruções preparadas por conexão. Em todos os bancos, o pool
+    de conexões é dimensionado para o threadpool.
+    """
+    engine = create_engine(url, **_opcoes_engine(url))
+    if _eh_sqlite(url):
+        event.listen(engine, "connect", _configurar_conexao)
+    return engine
+
+def criar_engine_async(url):
+    """Versão assíncrona de criar_engine (requer o driver, ex.: aiosqlite ou asyncpg)."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(url, **_opcoes_engine(url))
+    if _eh_sqlite(url):
+        event.listen(engine.sync_engine, "connect", _configurar_conexao)
+    return engine
+
+def _obter(cache, url, fabrica):
+    engine = cache.get(url)
+    if engine is None:
+        with _engines_lock:
+            engine = cache.get(url)
+            if engine is None:
+                engine = cache[url] = fabrica(url)
+    return engine
+
+def descartar_conexoes_herdadas():
+    """
+    Descarta, sem fechar, as conexões dos pools herdadas do processo pai.
+
+    Chamado nos workers logo após o fork: as conexões abertas pelo processo
+    principal (por exemplo, ao pré-carregar o catálogo) não podem ser
+    compartilhadas entre processos, e fechá-las no filho afetaria o pai.
+    """
+    with _engines_lock:
+        engines = list(_engines.values()) + [e.sync_engine for e in _engines_async.values()]
+    for engine in engines:
+        engine.dispose(close=False)
+
+def get_engine(url=None):
+    """Retorna o engine do banco (padrão: DATABASE_URL), criado uma única vez por processo e compartilhado por todos."""
+    return _obter(_engines, url or config.database_url, criar_engine)
+
+def get_async_engine(url=None):
+    """Retorna o engine assíncrono do banco (padrão: DATABASE_ASYNC_URL ou a equivalente de DATABASE_URL)."""
+    return _obter(_engines_async, url or config.database_async_url or url_async(config.database_url), criar_engine_async)
+
 class DatabaseManager:
-    def __init__(self, db_name="workana.db", json_path="dados_empresa.json", environment="development"):
-        self.db_name = db_name
+    def __init__(self, db_name=None, json_path="dados_empresa.json", environment="development", db_url=None):
+        """
+        Args:
+            db_name (str): Arquivo SQLite; atalho para db_url="sqlite:///<db_name>".
+            json_path (str): Arquivo com a empresa usada no ambiente de teste.
+            environment (str): "development", "test" ou "production".
+            db_url (str): URL do banco (padrão: DATABASE_URL).
+        """
+        self.db_url = db_url or (_url_sqlite(db_name) if db_name else config.database_url)
+        self.db_name = make_url(self.db_url).database
         self.json_path = json_path
         self.environment = environment
-        self.engine = create_engine(f"sqlite:///{self.db_name}", echo=False)
-        logging.info("DatabaseManager inicializado com banco de dados: %s", self.db_name)
+        self.engine = get_engine(self.db_url)
+        logging.info("DatabaseManager inicializado com banco de dados: %s", make_url(self.db_url).render_as_string())
 
     def create_tables(self):
         """Cria as tabelas no banco de dados."""
         SQLModel.metadata.create_all(self.engine)
+        # create_all não adiciona índices novos a tabelas que já existiam
+        for tabela in SQLModel.metadata.sorted_tables:
+            for indice in tabela.indexes:
+                indice.create(self.engine, checkfirst=True)
         logging.info("Tabelas criadas no banco de dados.")
 
     def database_exists(self):
-        """Verifica se o banco de dados já existe."""
-        exists = os.path.exists(self.db_name)
+        """Verifica se o banco de dados já existe (no SQLite, o arquivo; nos demais, as tabelas)."""
+        if _eh_sqlite(self.db_url):
+            exists = bool(self.db_name) and os.path.exists(self.db_name)
+        else:
+            exists = inspect(self.engine).has_table(Empresa.__tablename__)
         logging.info("Verificação do banco de dados: %s", "Existe" if exists else "Não existe")
         return exists
 
@@ -48,6 +178,15 @@ class DatabaseManager:
             else:
                 logging.info("Banco de dados já possui produtos. Nenhuma ação necessária.")
 
+            # Bancos criados antes da tabela de FAQ também recebem as perguntas padrão
+            if not session.exec(select(Faq)).first():
+                empresa = session.exec(select(Empresa)).first()
+                if empresa:
+                    faqs = self.get_default_faqs(empresa)
+                    session.add_all(faqs)
+                    session.commit()
+                    logging.info("Banco de dados populado com %d perguntas frequentes.", len(faqs))
+
     def load_empresa_from_json(self):
         """Carrega a empresa e seus produtos de um arquivo JSON."""
         if os.path.exists(self.json_path):
@@ -57,6 +196,7 @@ class DatabaseManager:
             empresa_data = data["empresa"]
             produtos_data = empresa_data.pop("produtos", [])
             servicos_data = empresa_data.pop("servicos", [])  # Carregar os serviços
+            faqs_data = empresa_data.pop("faqs", [])  # Perguntas frequentes (opcional)
 
             empresa = Empresa(
                 nome=empresa_data["nome"],
@@ -93,6 +233,7 @@ class DatabaseManager:
 
             empresa.produtos = produtos
             empresa.servicos = servicos
+            empresa.faqs = [Faq(chave=f["chave"], resposta=f["resposta"], empresa=empresa) for f in faqs_data]
             return empresa
         logging.warning("Arquivo JSON não encontrado. Nenhuma empresa será carregada.")
         return None
@@ -165,25 +306,37 @@ class DatabaseManager:
         empresa.servicos = servicos  # Adicionando serviços à empresa padrão
         return empresa
 
-    def get_empresa_info(self):
-        """Retorna informações da empresa com seus produtos e serviços associados."""
-        with Session(self.engine) as session:
-            empresa = session.exec(select(Empresa).limit(1)).first()
-            if empresa:
-                produtos = [p.nome for p in empresa.produtos]
-                servicos = [s.nome for s in empresa.servicos]
-                return {
-                    "nome": empresa.nome,
-                    "descricao": empresa.descricao,
-                    "cnpj": empresa.cnpj,
-                    "telefone": empresa.telefone,
-                    "endereco": empresa.endereco,
-                    "tipo": empresa.tipo,
-                    "produtos": produtos,
-                    "servicos": servicos
-                }
-                
-            return None
+    def get_default_faqs(self, empresa):
+        """Retorna as perguntas frequentes padrão da empresa."""
+        troca = "Nossa política de troca permite devoluções em até 30 dias. Para mais detalhes, acesse nosso site."
+        entrega_rj = "Sim, fazemos entregas para o Rio de Janeiro. Consulte o frete na finalização da compra."
+        return [
+            Faq(chave="politica de troca", resposta=troca, empresa=empresa),
+            Faq(chave="trocas", resposta=troca, empresa=empresa),
+            Faq(chave="devoluções", resposta=troca, empresa=empresa),
+            Faq(chave="entrega rj", resposta=entrega_rj, empresa=empresa),
+            Faq(chave="entregas rio de janeiro", resposta=entrega_rj, empresa=empresa)
+        ]
 
 # Exportando o engine para ser importado onde for necessário
-engine = DatabaseManager().engine
+engine = get_engine()
+
+def get_session():
+    """Dependência do FastAPI que cria e fornece uma sessão de banco de dados."""
+    with Session(engine) as session:
+        try:
+            yield session  # Retorna a sessão que será usada nas rotas
+        except SQLAlchemyError:
+            ERROS_DB.inc(origem="sessao")
+            raise
+
+async def get_async_session():
+    """Dependência do FastAPI que fornece uma sessão assíncrona (as consultas não ocupam o threadpool)."""
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        try:
+            yield session
+        except SQLAlchemyError:
+            ERROS_DB.inc(origem="sessao")
+            raise
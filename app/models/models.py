@@ -1,12 +1,16 @@
 # app/models/models.py
 
 from sqlmodel import Field, SQLModel, Relationship
-from pydantic import BaseModel
+from pydantic import BaseModel, constr
 from typing import List, Optional
 
 # Modelo de entrada para a API de chat
 class MessageRequest(BaseModel):
     message: str
+    # Empresa que atende a conversa; sem ela, a primeira empresa cadastrada
+    empresa_id: Optional[int] = None
+    # Identifica a conversa para manter o histórico entre mensagens; sem ela, cada mensagem é independente
+    session_id: Optional[constr(min_length=1, max_length=128, pattern=r"^[A-Za-z0-9_.:-]+$")] = None
 
 class Empresa(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -18,18 +22,21 @@ class Empresa(SQLModel, table=True):
     tipo: str
     produtos: List["Produto"] = Relationship(back_populates="empresa")
     servicos: List["Servico"] = Relationship(back_populates="empresa")
+    faqs: List["Faq"] = Relationship(back_populates="empresa")
 
 class Produto(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     nome: str
     descricao: str
-    preco: float
-    categoria: str
+    # Índices usados pelos filtros da listagem paginada
+    preco: float = Field(index=True)
+    categoria: str = Field(index=True)
     estoque: int
     imagem: str
-    empresa_id: int = Field(foreign_key="empresa.id")
+    empresa_id: int = Field(foreign_key="empresa.id", index=True)
     empresa: Optional[Empresa] = Relationship(back_populates="produtos")
-    codigo: str
+    # Chave da importação em lote (upsert por empresa e código)
+    codigo: str = Field(index=True)
 
 class ProdutoRequest(BaseModel):
     nome: str
@@ -45,12 +52,12 @@ class Servico(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     nome: str
     descricao: str
-    preco: float
-    categoria: str
+    preco: float = Field(index=True)
+    categoria: str = Field(index=True)
     imagem: str
-    empresa_id: int = Field(foreign_key="empresa.id")
+    empresa_id: int = Field(foreign_key="empresa.id", index=True)
     empresa: Optional[Empresa] = Relationship(back_populates="servicos")
-    codigo: str
+    codigo: str = Field(index=True)
 
 class ServicoRequest(BaseModel):
     nome: str
@@ -59,4 +66,16 @@ class ServicoRequest(BaseModel):
     categoria: str
     imagem: str
     empresa_id: int
-    codigo: str
\ No newline at end of file
+    codigo: str
+
+class Faq(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    chave: str
+    resposta: str
+    empresa_id: int = Field(foreign_key="empresa.id")
+    empresa: Optional[Empresa] = Relationship(back_populates="faqs")
+
+class FaqRequest(BaseModel):
+    chave: str
+    resposta: str
+    empresa_id: int
@@ -1,98 +1,355 @@
 # app/routes/chat.py
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from app.models.models import MessageRequest
-from app.models.database import DatabaseManager
+from app.utils.catalog_cache import catalogos
 from app.utils.spacy_utils import SpacyProcessor
 from app.utils.redis_utils import RedisCache
+from app.utils.semantic_cache import SemanticCache
+from app.utils.session_store import SessionStore, HistoricoSessao
+from app.utils.single_flight import SingleFlight
+from app.utils.sse_utils import formatar_evento_sse
+from app.utils.metrics import metricas, ETAPAS_CHAT, RESPOSTAS_CHAT, INTENCOES_CHAT, CHAT_EM_ANDAMENTO
+from app.utils.readiness import prontidao
 from app.gateway.provider_factory import get_ia_provider
+from app.gateway.ia_provider import argumentos_historico
+from app.exceptions.ia_provider_error import IAProviderLimiteError
+from app.config.settings import Configuration
+from fastapi.concurrency import run_in_threadpool
 import logging
+import time
+from cachetools import LRUCache
+
+config = Configuration()
 
 class ChatRouter(APIRouter):
     """
     Roteador de chat responsável por gerenciar interações com o usuário,
     consultando FAQs, informações da empresa e um provedor de IA.
+
+    Atende várias empresas: cada uma tem o seu snapshot do catálogo, FAQ,
+    cache semântico e espaço de chaves no cache de respostas, enquanto o
+    modelo spaCy e o provedor de IA (com suas conexões) são compartilhados.
+
+    O modelo spaCy e o provedor de IA são carregados pelo hook de startup, em
+    segundo plano (ver Prontidao); mensagens que chegarem antes aguardam a carga.
+
+    Mensagens com session_id fazem parte de uma conversa: o histórico fica no
+    Redis (ver SessionStore) e segue para a IA junto com a pergunta. Como a
+    resposta passa a depender da conversa, perguntas com histórico não usam os
+    caches de respostas nem o single-flight, e as respostas da IA a elas não
+    são guardadas em cache; FAQ e catálogo continuam respondendo normalmente.
     """
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.redis_cache = RedisCache()
-        self.database_manager = DatabaseManager()
-        self.spacy_processor = SpacyProcessor()
-        self.faq = {
-            "politica de troca": "Nossa política de troca permite devoluções em até 30 dias. Para mais detalhes, acesse nosso site.",
-            "trocas": "Nossa política de troca permite devoluções em até 30 dias. Para mais detalhes, acesse nosso site.",
-            "devoluções": "Nossa política de troca permite devoluções em até 30 dias. Para mais detalhes, acesse nosso site.",
-            "entrega rj": "Sim, fazemos entregas para o Rio de Janeiro. Consulte o frete na finalização da compra.",
-            "entregas rio de janeiro": "Sim, fazemos entregas para o Rio de Janeiro. Consulte o frete na finalização da compra."
-        }
+        # Um cache semântico por empresa, com contadores somados no /metrics
+        self.semantic_caches = LRUCache(maxsize=config.tenant_max_loaded + 1) if config.semantic_cache_enabled else None
+        self.estatisticas_semantico = {"hits": 0, "misses": 0}
+        self.single_flight = SingleFlight(self.redis_cache.async_redis_client)
+        self.sessoes = SessionStore(namespace=self.redis_cache.namespace)
+        self.catalogos = catalogos
+        self.spacy_processor = None
+        self.ia_provider = None
+        prontidao.registrar("modelos", self.carregar_modelos, precarregar=self.precarregar_modelos)
+        # Sem pré-carga: clientes HTTP e canais gRPC não sobrevivem ao fork, cada worker cria os seus
+        prontidao.registrar("provedor_ia", self.carregar_provedor)
         self.resposta_generica = "Desculpe, não entendi sua pergunta. Por favor, entre em contato com nosso suporte."
+        self.resposta_sobrecarga = "Estamos com muitas solicitações no momento. Por favor, tente novamente em instantes."
         self.add_api_route("/chat", self.chat, methods=["POST"])
+        self.add_api_route("/chat/stream", self.chat_stream, methods=["POST"])
+        metricas.registrar_coletor("chat", self._coletar_metricas)
+
+    def precarregar_modelos(self):
+        """Carrega o modelo spaCy no processo atual (antes do fork, no servidor com workers)."""
+        if self.spacy_processor is None:
+            self.spacy_processor = SpacyProcessor()
+
+    async def carregar_modelos(self):
+        """Carrega o modelo spaCy fora do event loop."""
+        await run_in_threadpool(self.precarregar_modelos)
+
+    async def carregar_provedor(self):
+        """Cria o provedor de IA (e seus pools HTTP) no worker, depois do fork."""
+        if self.ia_provider is None:
+            self.ia_provider = await run_in_threadpool(get_ia_provider)
+
+    async def _aguardar_modelos(self):
+        """
+        Garante que o modelo spaCy e o provedor de IA estejam carregados.
+
+        Raises:
+            HTTPException: 503 se a carga falhar.
+        """
+        if self.spacy_processor is not None and self.ia_provider is not None:
+            return
+        try:
+            await prontidao.aguardar("modelos")
+            await prontidao.aguardar("provedor_ia")
+        except Exception:
+            raise HTTPException(status_code=503, detail="Serviço iniciando: modelos indisponíveis.")
 
     async def chat(self, request: MessageRequest):
         """
         Rota principal de interação do chat.
 
         Verifica cache, responde perguntas frequentes, busca informações da empresa
-        e consulta provedor de IA se necessário.
+        e consulta provedor de IA se necessário. Todas as etapas bloqueantes
+        (Redis, spaCy, banco e IA) são executadas sem bloquear o event loop.
 
         Args:
-            request (MessageRequest): Objeto contendo a mensagem do usuário.
+            request (MessageRequest): Mensagem do usuário e, opcionalmente, a empresa
+                (sem ela, a primeira empresa cadastrada) e a sessão da conversa.
 
         Returns:
-            dict: Resposta formatada para o usuário.
+            dict: Resposta formatada para o usuário (e o session_id, se informado).
+
+        Raises:
+            HTTPException: 404 se a empresa informada não existir; 503 se os modelos não carregarem.
         """
         logging.info(f"Recebendo mensagem: {request.message}")
 
-        # Verifica se existe uma resposta em cache
-        cached_response = self.redis_cache.get_cached_response(request.message)
-        if cached_response:
-            return {"response": cached_response}
+        with CHAT_EM_ANDAMENTO.acompanhar(rota="chat"):
+            await self._aguardar_modelos()
+            catalogo, snapshot = await self._obter_catalogo(request.empresa_id)
+            historico = await self._carregar_historico(request.session_id, snapshot)
+            resposta, vetor = await self._responder_localmente(request.message, catalogo, snapshot, historico)
+            if resposta is not None:
+                await self._registrar_turno(request.session_id, snapshot, request.message, resposta)
+            else:
+                # Caso não encontre itens, consulta a IA
+                resposta = await self._consultar_ia(
+                    request.message, catalogo, snapshot, vetor, historico, request.session_id
+                )
+            if request.session_id:
+                return {"response": resposta, "session_id": request.session_id}
+            return {"response": resposta}
 
-        # Processa a mensagem para identificar palavras-chave
-        palavras_chave = self.spacy_processor.processar_mensagem(request.message)
-        logging.info(f"Palavras-chave identificadas: {palavras_chave}")
+    async def chat_stream(self, request: MessageRequest):
+        """
+        Versão em streaming da rota de chat, via Server-Sent Events.
 
-        # Verifica se a mensagem contém palavras-chave do FAQ
-        for chave, resposta in self.faq.items():
-            if chave in request.message.lower():
-                self.redis_cache.cache_response(request.message, resposta)
-                return {"response": resposta}
+        Respostas de cache, FAQ e catálogo são enviadas em um único evento; as
+        respostas da IA são repassadas trecho a trecho assim que o provedor as
+        produz. O stream termina com um evento "done" contendo a resposta completa.
+
+        Args:
+            request (MessageRequest): Objeto contendo a mensagem do usuário.
+
+        Returns:
+            StreamingResponse: Stream de eventos no formato text/event-stream.
+        """
+        logging.info(f"Recebendo mensagem (streaming): {request.message}")
+
+        CHAT_EM_ANDAMENTO.inc(rota="chat_stream")
+        try:
+            await self._aguardar_modelos()
+            catalogo, snapshot = await self._obter_catalogo(request.empresa_id)
+            historico = await self._carregar_historico(request.session_id, snapshot)
+            resposta, vetor = await self._responder_localmente(request.message, catalogo, snapshot, historico)
+            if resposta is not None:
+                await self._registrar_turno(request.session_id, snapshot, request.message, resposta)
+        except BaseException:
+            CHAT_EM_ANDAMENTO.dec(rota="chat_stream")
+            raise
+        if resposta is not None:
+            eventos = self._stream_resposta_pronta(resposta)
+        else:
+            eventos = self._stream_ia(request.message, catalogo, snapshot, vetor, historico, request.session_id)
+
+        return StreamingResponse(
+            self._acompanhar_stream(eventos),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    async def _obter_catalogo(self, empresa_id):
+        """
+        Retorna o catálogo da empresa e o seu snapshot atual.
+
+        Raises:
+            HTTPException: 404 se a empresa informada não existir.
+        """
+        catalogo = self.catalogos.obter(empresa_id)
+        with ETAPAS_CHAT.medir(etapa="catalogo"):
+            snapshot = await catalogo.aget_snapshot()
+        if empresa_id is not None and snapshot.empresa is None:
+            # Não mantém em memória catálogos de empresas inexistentes
+            self.catalogos.descartar(empresa_id)
+            raise HTTPException(status_code=404, detail="Empresa não encontrada.")
+        return catalogo, snapshot
+
+    @staticmethod
+    def _escopo(snapshot):
+        """Versão do catálogo e empresa que delimitam as chaves do cache de respostas."""
+        return {
+            "versao": snapshot.assinatura,
+            "empresa_id": snapshot.empresa.id if snapshot.empresa else None,
+        }
+
+    def _cache_semantico(self, snapshot):
+        """Cache semântico da empresa do snapshot, criado na primeira pergunta; None se desativado."""
+        if self.semantic_caches is None:
+            return None
+        empresa_id = snapshot.empresa.id if snapshot.empresa else None
+        cache = self.semantic_caches.get(empresa_id)
+        if cache is None:
+            cache = SemanticCache(estatisticas=self.estatisticas_semantico)
+            self.semantic_caches[empresa_id] = cache
+        return cache
+
+    async def _carregar_historico(self, sessao_id, snapshot):
+        """Histórico da conversa na empresa do snapshot; vazio sem sessão."""
+        if not sessao_id:
+            return HistoricoSessao()
+        with ETAPAS_CHAT.medir(etapa="sessao"):
+            return await self.sessoes.carregar(sessao_id, self._escopo(snapshot)["empresa_id"])
+
+    async def _registrar_turno(self, sessao_id, snapshot, mensagem, resposta):
+        """Acrescenta a pergunta e a resposta ao histórico da conversa, se houver sessão."""
+        if sessao_id:
+            with ETAPAS_CHAT.medir(etapa="sessao"):
+                await self.sessoes.registrar(sessao_id, mensagem, resposta, self._escopo(snapshot)["empresa_id"])
+
+    async def _responder_localmente(self, mensagem, catalogo, snapshot, historico=None):
+        """
+        Tenta responder sem consultar a IA: cache, FAQ, intenções (preço, estoque,
+        categoria e contato), itens do catálogo e cache semântico.
+
+        Args:
+            mensagem (str): Mensagem do usuário.
+            catalogo (CatalogCache): Catálogo da empresa, com o índice de busca.
+            snapshot (CatalogSnapshot): Snapshot do catálogo usado na resposta.
+            historico (HistoricoSessao): Conversa anterior; com ela, os caches de respostas não são consultados.
+
+        Returns:
+            tuple: (resposta, vetor). A resposta é None se for necessário consultar a IA;
+            o vetor da mensagem, quando disponível, é usado para alimentar o cache semântico.
+        """
+        escopo = self._escopo(snapshot)
 
-        # Busca informações da empresa no banco de dados
-        empresa_info = self.database_manager.get_empresa_info()
-        if not empresa_info:
+        # Verifica se existe uma resposta em cache para esta empresa e versão do catálogo
+        if not historico:
+            with ETAPAS_CHAT.medir(etapa="cache"):
+                cached_response = await self.redis_cache.aget_cached_response(mensagem, **escopo)
+            if cached_response:
+                RESPOSTAS_CHAT.inc(origem="cache")
+                return cached_response, None
+
+        # Verifica se a mensagem contém alguma chave do FAQ (uma única passada pelo autômato)
+        with ETAPAS_CHAT.medir(etapa="faq"):
+            resposta = snapshot.faq.buscar(mensagem)
+        if resposta:
+            RESPOSTAS_CHAT.inc(origem="faq")
+            await self.redis_cache.acache_response(mensagem, resposta, **escopo)
+            return resposta, None
+
+        if not snapshot.empresa:
             logging.warning("Nenhuma informação de empresa encontrada.")
-            return {"response": self.resposta_generica}
+            RESPOSTAS_CHAT.inc(origem="generica")
+            return self.resposta_generica, None
+
+        # Perguntas objetivas respondidas direto do snapshot; calculadas em microssegundos,
+        # não passam pelo cache de respostas
+        tipo_empresa = snapshot.empresa.tipo
+        if config.intent_engine_enabled:
+            with ETAPAS_CHAT.medir(etapa="intencoes"):
+                intencao = snapshot.intencoes.responder(mensagem, catalogo.indice, self._tipos_aceitos(tipo_empresa))
+            if intencao is not None:
+                RESPOSTAS_CHAT.inc(origem="intencao")
+                INTENCOES_CHAT.inc(intencao=intencao.intencao)
+                return intencao.resposta, None
 
-        tipo_empresa = empresa_info.get("tipo", "")
-        itens_encontrados = self._buscar_itens(palavras_chave, empresa_info, tipo_empresa)
+        # Processa a mensagem para identificar palavras-chave (e o vetor da frase, no mesmo passo)
+        with ETAPAS_CHAT.medir(etapa="spacy"):
+            analise = await self.spacy_processor.aanalisar_mensagem(mensagem)
+        palavras_chave = analise.palavras_chave
+        logging.info(f"Palavras-chave identificadas: {palavras_chave}")
+
+        with ETAPAS_CHAT.medir(etapa="busca_itens"):
+            itens_encontrados = self._buscar_itens(palavras_chave, tipo_empresa, catalogo)
 
         if itens_encontrados:
+            RESPOSTAS_CHAT.inc(origem="catalogo")
             resposta_final = self._formatar_resposta(itens_encontrados, tipo_empresa)
-            self.redis_cache.cache_response(request.message, resposta_final)
-            return {"response": resposta_final}
+            await self.redis_cache.acache_response(mensagem, resposta_final, **escopo)
+            return resposta_final, None
+
+        # Verifica se uma pergunta parecida já foi respondida pela IA
+        vetor = None
+        semantic_cache = None if historico else self._cache_semantico(snapshot)
+        if semantic_cache is not None:
+            with ETAPAS_CHAT.medir(etapa="semantico"):
+                vetor = await semantic_cache.avetorizar(mensagem, analise.vetor)
+                resposta = semantic_cache.buscar(vetor, versao=snapshot.assinatura)
+            if resposta:
+                RESPOSTAS_CHAT.inc(origem="semantico")
+                await self.redis_cache.acache_response(mensagem, resposta, **escopo)
+                return resposta, None
 
-        # Caso não encontre itens, consulta a IA
-        return await self._consultar_ia(request.message)
+        return None, vetor
 
-    def _buscar_itens(self, palavras_chave, empresa_info, tipo_empresa):
+    def _buscar_itens(self, palavras_chave, tipo_empresa, catalogo):
         """
         Busca produtos ou serviços com base nas palavras-chave identificadas.
 
+        A busca usa o índice invertido do catálogo, que aceita nomes com várias
+        palavras e casamentos parciais, e retorna os itens por relevância.
+
         Args:
             palavras_chave (list): Lista de palavras-chave extraídas da mensagem.
-            empresa_info (dict): Informações da empresa, incluindo produtos e serviços.
             tipo_empresa (str): Tipo da empresa ('produtos', 'servicos', 'produtos_servicos').
+            catalogo (CatalogCache): Catálogo da empresa.
 
         Returns:
             list: Lista de itens encontrados (produtos ou serviços).
         """
-        itens = []
+        if not palavras_chave:
+            return []
+        tipos = self._tipos_aceitos(tipo_empresa)
+        itens = catalogo.indice.buscar(palavras_chave, tipos=tipos, limite=config.catalog_search_limit)
+        return [item.nome for item in itens]
+
+    @staticmethod
+    def _tipos_aceitos(tipo_empresa):
+        """Tipos de item do catálogo que a empresa oferece."""
+        tipos = set()
         if tipo_empresa in ["produtos", "produtos_servicos"]:
-            itens.extend([p for p in empresa_info.get("produtos", []) if p.lower() in palavras_chave])
+            tipos.add("produto")
         if tipo_empresa in ["servicos", "produtos_servicos"]:
-            itens.extend([s for s in empresa_info.get("servicos", []) if s.lower() in palavras_chave])
-        return itens
+            tipos.add("servico")
+        return tipos
+
+    async def _selecionar_itens(self, mensagem, catalogo, snapshot):
+        """
+        Escolhe os itens do catálogo enviados à IA junto com a pergunta.
+
+        Os itens são ranqueados por BM25 contra a mensagem (nome, categoria e
+        descrição) e apenas os mais relevantes seguem para o prompt. Se nada
+        casar, segue uma amostra do início do catálogo, para perguntas gerais.
+
+        Args:
+            mensagem (str): Mensagem do usuário.
+            catalogo (CatalogCache): Catálogo da empresa.
+            snapshot (CatalogSnapshot): Snapshot do catálogo.
+
+        Returns:
+            tuple: (produtos, servicos) selecionados, em ordem de relevância.
+        """
+        limite = config.prompt_top_k
+        tipos = self._tipos_aceitos(snapshot.empresa.tipo) if snapshot.empresa else None
+        retriever = await catalogo.aget_retriever(snapshot)
+        itens = retriever.buscar(mensagem, tipos=tipos, limite=limite)
+        if not itens:
+            itens = [
+                item for item in snapshot.produtos[:limite] + snapshot.servicos[:limite]
+                if tipos is None or item.tipo in tipos
+            ][:limite]
+        logging.info(f"Itens do catálogo enviados à IA: {[item.nome for item in itens]}")
+        produtos = [item for item in itens if item.tipo == "produto"]
+        servicos = [item for item in itens if item.tipo == "servico"]
+        return produtos, servicos
 
     def _formatar_resposta(self, itens, tipo_empresa):
         """
@@ -110,26 +367,231 @@ class ChatRouter(APIRouter):
         resposta += "\n".join(f"- {item}" for item in itens)
         return resposta
 
-    async def _consultar_ia(self, mensagem):
+    async def _consultar_ia(self, mensagem, catalogo, snapshot, vetor=None, historico=None, sessao_id=None):
         """
         Consulta o provedor de IA para gerar uma resposta personalizada.
 
+        Perguntas idênticas (após normalização) que chegam enquanto a primeira
+        ainda está sendo respondida aguardam essa mesma chamada, neste processo
+        ou em outro worker, em vez de consultar o provedor novamente. Perguntas
+        com histórico dependem da conversa e são sempre enviadas ao provedor.
+
         Args:
             mensagem (str): Mensagem do usuário.
+            catalogo (CatalogCache): Catálogo da empresa.
+            snapshot (CatalogSnapshot): Snapshot do catálogo enviado ao provedor.
+            vetor (np.ndarray): Vetor da mensagem, para registrar a resposta no cache semântico.
+            historico (HistoricoSessao): Conversa anterior, enviada ao provedor.
+            sessao_id (str): Sessão em que o turno é registrado.
 
         Returns:
-            dict: Resposta gerada pelo provedor de IA.
+            str: Resposta gerada pelo provedor de IA.
         """
-        empresa_info = self.database_manager.get_empresa_info()
-        produtos = empresa_info.get("produtos", [])
-        servicos = empresa_info.get("servicos", [])
-        
-        ia_provider = get_ia_provider()
+        escopo = self._escopo(snapshot)
+        chave = self.redis_cache.montar_chave(mensagem, **escopo)
+
         try:
-            resposta_ia = ia_provider.gerar_resposta(produtos, servicos, mensagem)
-            logging.info(f"Resposta final da Assistente: {resposta_ia}")
-            self.redis_cache.cache_response(mensagem, resposta_ia)
-            return {"response": resposta_ia}
+            if historico:
+                resposta_ia = await self._gerar_resposta_ia(mensagem, catalogo, snapshot, vetor, historico)
+            else:
+                resposta_ia = await self.single_flight.executar(
+                    chave,
+                    lambda: self._gerar_resposta_ia(mensagem, catalogo, snapshot, vetor),
+                    consultar_cache=lambda: self.redis_cache.aget_cached_response(mensagem, **escopo)
+                )
+            RESPOSTAS_CHAT.inc(origem="llm")
+        except IAProviderLimiteError as e:
+            # Excedente descartado pelo limite de requisições: resposta rápida, sem cache nem histórico
+            logging.warning(f"Chamada à IA descartada: {e}")
+            RESPOSTAS_CHAT.inc(origem="sobrecarga")
+            return self.resposta_sobrecarga
         except Exception as e:
+            RESPOSTAS_CHAT.inc(origem="erro")
             logging.error(f"Erro ao consultar o provedor de IA: {e}")
             raise HTTPException(status_code=500, detail="Erro ao processar a mensagem com IA.")
+        await self._registrar_turno(sessao_id, snapshot, mensagem, resposta_ia)
+        return resposta_ia
+
+    async def _gerar_resposta_ia(self, mensagem, catalogo, snapshot, vetor=None, historico=None):
+        """
+        Chama o provedor de IA e armazena a resposta nos caches antes de retorná-la
+        (exceto quando ela depende do histórico da conversa).
+        """
+        with ETAPAS_CHAT.medir(etapa="selecao_itens"):
+            produtos, servicos = await self._selecionar_itens(mensagem, catalogo, snapshot)
+
+        with ETAPAS_CHAT.medir(etapa="llm"):
+            resposta_ia = await self.ia_provider.agerar_resposta(
+                produtos, servicos, mensagem, **argumentos_historico(historico)
+            )
+        logging.info(f"Resposta final da Assistente: {resposta_ia}")
+        if not historico:
+            await self.redis_cache.acache_response(mensagem, resposta_ia, **self._escopo(snapshot))
+            self._registrar_semantico(vetor, resposta_ia, snapshot)
+        return resposta_ia
+
+    def _registrar_semantico(self, vetor, resposta, snapshot):
+        """Guarda a resposta da IA no cache semântico da empresa, se ele estiver ativo."""
+        semantic_cache = self._cache_semantico(snapshot)
+        if semantic_cache is not None:
+            semantic_cache.adicionar(vetor, resposta, versao=snapshot.assinatura)
+
+    async def _acompanhar_stream(self, eventos):
+        """Mantém o medidor de requisições em andamento até o fim do stream."""
+        try:
+            async for evento in eventos:
+                yield evento
+        finally:
+            CHAT_EM_ANDAMENTO.dec(rota="chat_stream")
+
+    async def _stream_resposta_pronta(self, resposta):
+        """Emite uma resposta já conhecida como um único trecho seguido do evento final."""
+        yield formatar_evento_sse({"token": resposta})
+        yield formatar_evento_sse({"response": resposta}, evento="done")
+
+    async def _stream_ia(self, mensagem, catalogo, snapshot, vetor=None, historico=None, sessao_id=None):
+        """
+        Repassa os trechos gerados pelo provedor de IA como eventos SSE.
+
+        Ao final do stream, a resposta completa é armazenada no cache (ou, se
+        depender do histórico, apenas na sessão). Se o provedor falhar, um
+        evento "error" é enviado e nada é armazenado; se a chamada for
+        descartada pelo limite de requisições, a resposta de contingência é
+        enviada no lugar.
+        Se uma pergunta idêntica sem histórico já estiver em andamento neste
+        processo, a resposta dela é aguardada e enviada em um único trecho.
+
+        Args:
+            mensagem (str): Mensagem do usuário.
+            catalogo (CatalogCache): Catálogo da empresa.
+            snapshot (CatalogSnapshot): Snapshot do catálogo enviado ao provedor.
+            vetor (np.ndarray): Vetor da mensagem, para registrar a resposta no cache semântico.
+            historico (HistoricoSessao): Conversa anterior, enviada ao provedor.
+            sessao_id (str): Sessão em que o turno é registrado.
+        """
+        escopo = self._escopo(snapshot)
+        chave = None
+        lider = True
+        if not historico:
+            chave = self.redis_cache.montar_chave(mensagem, **escopo)
+            futuro, lider = self.single_flight.iniciar(chave)
+        if not lider:
+            try:
+                resposta_ia = await futuro
+            except IAProviderLimiteError as e:
+                logging.warning(f"Chamada à IA descartada: {e}")
+                RESPOSTAS_CHAT.inc(origem="sobrecarga")
+                resposta_ia = self.resposta_sobrecarga
+            except Exception as e:
+                RESPOSTAS_CHAT.inc(origem="erro")
+                logging.error(f"Erro ao consultar o provedor de IA (streaming): {e}")
+                yield formatar_evento_sse({"detail": "Erro ao processar a mensagem com IA."}, evento="error")
+                return
+            else:
+                RESPOSTAS_CHAT.inc(origem="llm")
+                await self._registrar_turno(sessao_id, snapshot, mensagem, resposta_ia)
+            async for evento in self._stream_resposta_pronta(resposta_ia):
+                yield evento
+            return
+
+        trechos = []
+        resposta_ia = None
+        erro = None
+        try:
+            with ETAPAS_CHAT.medir(etapa="selecao_itens"):
+                produtos, servicos = await self._selecionar_itens(mensagem, catalogo, snapshot)
+            inicio = time.perf_counter()
+            stream = self.ia_provider.astream_resposta(
+                produtos, servicos, mensagem, **argumentos_historico(historico)
+            )
+            async for trecho in stream:
+                trechos.append(trecho)
+                yield formatar_evento_sse({"token": trecho})
+
+            ETAPAS_CHAT.observar(time.perf_counter() - inicio, etapa="llm")
+            RESPOSTAS_CHAT.inc(origem="llm")
+            resposta_ia = "".join(trechos)
+            logging.info(f"Resposta final da Assistente: {resposta_ia}")
+            if not historico:
+                await self.redis_cache.acache_response(mensagem, resposta_ia, **escopo)
+                self._registrar_semantico(vetor, resposta_ia, snapshot)
+            await self._registrar_turno(sessao_id, snapshot, mensagem, resposta_ia)
+        except Exception as e:
+            erro = e
+            if isinstance(e, IAProviderLimiteError) and not trechos:
+                logging.warning(f"Chamada à IA descartada: {e}")
+                RESPOSTAS_CHAT.inc(origem="sobrecarga")
+                async for evento in self._stream_resposta_pronta(self.resposta_sobrecarga):
+                    yield evento
+                return
+            RESPOSTAS_CHAT.inc(origem="erro")
+            logging.error(f"Erro ao consultar o provedor de IA (streaming): {e}")
+            yield formatar_evento_sse({"detail": "Erro ao processar a mensagem com IA."}, evento="error")
+            return
+        finally:
+            # Libera quem aguardava, inclusive se o cliente desconectar no meio do stream
+            if erro is None and resposta_ia is None:
+                erro = RuntimeError("Stream interrompido antes do fim.")
+            if chave is not None:
+                self.single_flight.concluir(chave, resultado=resposta_ia, erro=erro)
+
+        yield formatar_evento_sse({"response": resposta_ia}, evento="done")
+
+    def _coletar_metricas(self):
+        """Exporta as estatísticas dos caches, do single-flight e dos provedores de IA para o /metrics."""
+        estatisticas_cache = self.redis_cache.estatisticas
+        metricas_coletadas = [
+            ("cache_consultas_total", "counter", "Consultas ao cache de respostas por camada e resultado.", [
+                ({"camada": camada, "resultado": resultado}, estatisticas_cache[camada][resultado])
+                for camada in ("memoria", "redis") for resultado in ("hits", "misses")
+            ]),
+            ("redis_erros_total", "counter", "Erros de comunicação com o Redis no cache de respostas.", [
+                ({}, estatisticas_cache["redis"]["erros"])
+            ]),
+            ("sessoes_operacoes_total", "counter", "Leituras, gravações e erros do histórico das conversas no Redis.", [
+                ({"operacao": operacao}, valor) for operacao, valor in self.sessoes.estatisticas.items()
+            ]),
+            ("single_flight_total", "counter", "Chamadas à IA executadas e perguntas idênticas que aguardaram outra.", [
+                ({"papel": papel}, valor) for papel, valor in self.single_flight.estatisticas.items()
+            ]),
+            ("single_flight_em_andamento", "gauge", "Perguntas distintas aguardando a IA neste processo.", [
+                ({}, len(self.single_flight))
+            ]),
+        ]
+        if self.semantic_caches is not None:
+            metricas_coletadas.append(
+                ("cache_semantico_consultas_total", "counter", "Consultas ao cache semântico por resultado.", [
+                    ({"resultado": resultado}, valor) for resultado, valor in self.estatisticas_semantico.items()
+                ])
+            )
+            metricas_coletadas.append(
+                ("cache_semantico_entradas", "gauge", "Respostas guardadas no cache semântico (todas as empresas).", [
+                    ({}, sum(len(cache) for cache in list(self.semantic_caches.values())))
+                ])
+            )
+        metricas_coletadas.append(
+            ("catalogos_empresas_carregados", "gauge", "Catálogos de empresas em memória, além do padrão.", [
+                ({}, len(self.catalogos))
+            ])
+        )
+        estatisticas_ia = getattr(self.ia_provider, "estatisticas", None)
+        if estatisticas_ia is not None:
+            provedores = estatisticas_ia()
+            metricas_coletadas.extend([
+                ("ia_disjuntor_aberto", "gauge", "1 se o disjuntor do provedor estiver aberto ou meio aberto.", [
+                    ({"provedor": nome}, int(dados["estado"] != "fechado")) for nome, dados in provedores.items()
+                ]),
+                ("ia_chamadas_total", "counter", "Chamadas aos provedores de IA por resultado.", [
+                    ({"provedor": nome, "resultado": resultado}, dados[resultado])
+                    for nome, dados in provedores.items()
+                    for resultado in ("sucessos", "falhas", "timeouts", "cancelados", "limitados")
+                ]),
+                ("ia_fila_limite", "gauge", "Chamadas aguardando vaga no limite de requisições do provedor.", [
+                    ({"provedor": nome}, dados["limite"]["fila"]) for nome, dados in provedores.items()
+                ]),
+                ("ia_espera_limite_segundos", "gauge", "Espera por vaga no limite de requisições (p50/p95 recentes).", [
+                    ({"provedor": nome, "quantil": quantil}, dados["limite"][f"espera_p{quantil}"])
+                    for nome, dados in provedores.items() for quantil in ("50", "95")
+                ]),
+            ])
+        return metricas_coletadas
@@ -1,9 +1,11 @@
 # app/routes/empresa.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.models import Empresa
-from app.models.database import engine
+from app.models.database import engine, get_async_session
+from app.utils.catalog_cache import catalogos
 
 class EmpresaRouter(APIRouter):
     def __init__(self, *args, **kwargs):
@@ -27,9 +29,10 @@ class EmpresaRouter(APIRouter):
             session.add(empresa)  # Adiciona a empresa à sessão
             session.commit()  # Confirma a transação no banco
             session.refresh(empresa)  # Atualiza a empresa com dados do banco
+            catalogos.rebuild(empresa.id)  # Publica o novo catálogo para o chat
             return {"message": "Empresa criada com sucesso!", "empresa": empresa}  # Retorna a mensagem de sucesso e os dados da empresa criada
 
-    def obter_empresa(self):
+    async def obter_empresa(self, session: AsyncSession = Depends(get_async_session)):
         """
         Retorna os dados da empresa cadastrada.
 
@@ -39,9 +42,7 @@ class EmpresaRouter(APIRouter):
         **Saída:**
         - empresa (Empresa ou dict): Dados da empresa cadastrada ou mensagem indicando que nenhuma empresa foi cadastrada.
         """
-        # Criação da sessão de banco de dados
-        with Session(engine) as session:
-            statement = select(Empresa)  # Define a consulta para selecionar a empresa
-            empresa = session.exec(statement).first()  # Executa a consulta e pega o primeiro registro
-            # Retorna a empresa ou uma mensagem caso não exista
-            return empresa or {"message": "Nenhuma empresa cadastrada"}
\ No newline at end of file
+        statement = select(Empresa)  # Define a consulta para selecionar a empresa
+        empresa = (await session.exec(statement)).first()  # Executa a consulta e pega o primeiro registro
+        # Retorna a empresa ou uma mensagem caso não exista
+        return empresa or {"message": "Nenhuma empresa cadastrada"}
\ No newline at end of file
@@ -0,0 +1,53 @@
+# app/routes/faq.py
+
+from fastapi import APIRouter, Depends
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.models import Faq, FaqRequest
+from app.models.database import get_session, get_async_session
+from app.utils.catalog_cache import catalogos
+
+class FaqRouter(APIRouter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.add_api_route("/faq/", self.create_faq, methods=["POST"])
+        self.add_api_route("/faq/", self.list_faqs, methods=["GET"])
+        self.add_api_route("/faq/reload", self.reload_faq, methods=["POST"])
+
+    def create_faq(self, faq: FaqRequest, session: Session = Depends(get_session)):
+        """
+        Cadastra uma nova pergunta frequente e recompila o FAQ do chat.
+
+        **Entrada:**
+        - faq (FaqRequest): Chave (trecho procurado na mensagem) e resposta.
+
+        **Saída:**
+        - Faq: Objeto da pergunta frequente cadastrada.
+        """
+        faq_db = Faq(**faq.dict())
+        session.add(faq_db)
+        session.commit()  # Confirmando a transação no banco
+        session.refresh(faq_db)  # Atualizando a pergunta com os dados do banco
+        catalogos.rebuild(faq_db.empresa_id)  # Publica o novo FAQ para o chat
+        return faq_db
+
+    async def list_faqs(self, session: AsyncSession = Depends(get_async_session)):
+        """
+        Retorna a lista de perguntas frequentes cadastradas.
+
+        **Saída:**
+        - List[Faq]: Perguntas frequentes, na ordem de prioridade.
+        """
+        return (await session.exec(select(Faq).order_by(Faq.id))).all()
+
+    def reload_faq(self):
+        """
+        Recarrega o FAQ (e o restante do catálogo) do banco sem reiniciar a aplicação.
+        Útil após alterações feitas diretamente no banco.
+
+        **Saída:**
+        - message (str): Mensagem de sucesso.
+        - total (int): Número de perguntas frequentes carregadas.
+        """
+        snapshot = catalogos.rebuild()
+        return {"message": "FAQ recarregado com sucesso!", "total": len(snapshot.faq)}
@@ -0,0 +1,36 @@
+# app/routes/health.py
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.utils.readiness import prontidao
+
+class HealthRouter(APIRouter):
+    """Roteador das verificações de vida e de prontidão usadas pelo orquestrador."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.add_api_route("/health", self.health, methods=["GET"])
+        self.add_api_route("/ready", self.ready, methods=["GET"])
+
+    async def health(self):
+        """
+        Verificação de vida: o processo está de pé e o event loop responde.
+
+        **Saída:**
+        - status (str): Sempre "ok".
+        """
+        return {"status": "ok"}
+
+    async def ready(self):
+        """
+        Verificação de prontidão: modelo spaCy, provedor de IA e catálogo carregados.
+
+        **Saída:**
+        - status (str): "pronto" (HTTP 200) ou "carregando" (HTTP 503).
+        - componentes (dict): Estado de cada componente e o tempo de carga.
+        """
+        pronto = prontidao.pronto
+        return JSONResponse(
+            {"status": "pronto" if pronto else "carregando", "componentes": prontidao.estado()},
+            status_code=200 if pronto else 503
+        )
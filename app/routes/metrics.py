@@ -0,0 +1,22 @@
+# app/routes/metrics.py
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.utils.metrics import metricas
+
+class MetricsRouter(APIRouter):
+    """Roteador que expõe as métricas do processo no formato do Prometheus."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.add_api_route("/metrics", self.metrics, methods=["GET"], response_class=PlainTextResponse)
+
+    async def metrics(self):
+        """
+        Exporta histogramas de latência por etapa do chat, contadores de origem
+        das respostas, erros e medidores de requisições em andamento.
+
+        Returns:
+            PlainTextResponse: Métricas no formato texto do Prometheus.
+        """
+        return PlainTextResponse(metricas.renderizar(), media_type="text/plain; version=0.0.4; charset=utf-8")
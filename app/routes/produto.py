@@ -1,22 +1,27 @@
 # app/routes/produto.py
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.models import Produto, ProdutoRequest
-from app.models.database import engine
+from app.models.database import get_session, get_async_session, engine
+from app.utils.catalog_cache import catalogos
+from app.utils.pagination import apaginar
+from app.utils.catalog_import import CatalogImporter, detectar_formato, linhas_do_stream
+from app.utils.catalog_export import exportar_ndjson
 
 class ProdutoRouter(APIRouter):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.add_api_route("/produtos/", self.create_produto, methods=["POST"])
         self.add_api_route("/produtos/", self.list_produtos, methods=["GET"])
+        self.add_api_route("/produtos/importar", self.importar_produtos, methods=["POST"])
+        self.add_api_route("/produtos/exportar", self.exportar_produtos, methods=["GET"])
 
-    def get_session(self):
-        """Função para criar e obter uma sessão de banco de dados"""
-        with Session(engine) as session:
-            yield session  # Retorna a sessão que será usada nas rotas
-
-    async def create_produto(self, produto: ProdutoRequest, session: Session = Depends(get_session)):
+    def create_produto(self, produto: ProdutoRequest, session: Session = Depends(get_session)):
         """
         Cria um novo produto no banco de dados.
 
@@ -32,18 +37,93 @@ class ProdutoRouter(APIRouter):
         session.add(produto_db)
         session.commit()  # Confirmando a transação no banco
         session.refresh(produto_db)  # Atualizando o produto com os dados do banco
+        catalogos.rebuild(produto_db.empresa_id)  # Publica o novo catálogo para o chat
         return produto_db  # Retorna o produto que foi criado
 
-    async def list_produtos(self, session: Session = Depends(get_session)):
+    async def list_produtos(
+        self,
+        cursor: Optional[str] = None,
+        limite: Optional[int] = Query(None, ge=1),
+        categoria: Optional[str] = None,
+        empresa_id: Optional[int] = None,
+        preco_min: Optional[float] = None,
+        preco_max: Optional[float] = None,
+        campos: Optional[str] = None,
+        session: AsyncSession = Depends(get_async_session)
+    ):
         """
-        Retorna a lista de todos os produtos cadastrados.
+        Retorna os produtos cadastrados, uma página por vez (paginação por cursor).
+
+        **Entrada:**
+        - cursor (str, opcional): Valor de `proximo_cursor` da página anterior.
+        - limite (int, opcional): Itens por página (padrão PAGE_SIZE_DEFAULT, máximo PAGE_SIZE_MAX).
+        - categoria, empresa_id (opcionais): Filtros exatos.
+        - preco_min, preco_max (float, opcionais): Faixa de preço.
+        - campos (str, opcional): Campos retornados, separados por vírgula (ex.: "nome,preco,codigo").
+
+        **Saída:**
+        - itens: Produtos da página.
+        - proximo_cursor (str | None): Cursor da próxima página; None na última.
+        """
+        try:
+            return await apaginar(session, Produto, cursor, limite, campos,
+                                  categoria=categoria, empresa_id=empresa_id, preco_min=preco_min, preco_max=preco_max)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    async def importar_produtos(self, request: Request, formato: Optional[str] = None, empresa_id: Optional[int] = None):
+        """
+        Cadastra ou atualiza produtos em lote (upsert por empresa_id e codigo).
+
+        O corpo é lido em streaming e gravado em transações de IMPORT_BATCH_SIZE
+        registros; o catálogo do chat é recarregado uma única vez ao final (também
+        quando a importação é interrompida depois de gravar algum lote).
+
+        **Entrada:**
+        - Corpo: JSON Lines (um objeto por linha) ou CSV com cabeçalho.
+        - formato (str, opcional): "jsonl" ou "csv"; por padrão, deduzido do Content-Type.
+        - empresa_id (int, opcional): Empresa dos registros sem empresa_id (padrão: a primeira cadastrada).
+
+        **Saída:**
+        - Relatório com linhas lidas, inseridos, atualizados, rejeitados, erros e linhas por segundo.
+        """
+        formato = detectar_formato(request.headers.get("content-type"), formato)
+        try:
+            importador = CatalogImporter(engine, "produtos", formato, empresa_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        try:
+            return await importador.aimportar(linhas_do_stream(request.stream()))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        finally:
+            # Lotes já gravados chegam ao chat mesmo se a importação parar no meio
+            if importador.gravou:
+                await run_in_threadpool(catalogos.rebuild)  # Publica o novo catálogo para o chat
+
+    def exportar_produtos(
+        self,
+        categoria: Optional[str] = None,
+        empresa_id: Optional[int] = None,
+        preco_min: Optional[float] = None,
+        preco_max: Optional[float] = None,
+        campos: Optional[str] = None
+    ):
+        """
+        Exporta todos os produtos em NDJSON (um objeto JSON por linha), em streaming.
+
+        As linhas são enviadas conforme são lidas do banco, com memória constante
+        independentemente do tamanho do catálogo.
 
         **Entrada:**
-        - Nenhuma.
+        - categoria, empresa_id, preco_min, preco_max (opcionais): Mesmos filtros da listagem.
+        - campos (str, opcional): Campos exportados, separados por vírgula (ex.: "nome,preco,codigo").
 
         **Saída:**
-        - List[Produto]: Lista de todos os produtos no banco.
+        - application/x-ndjson: Um produto por linha, em ordem de id.
         """
-        # Executa a consulta para pegar todos os produtos
-        produtos = session.exec(select(Produto)).all()
-        return produtos  # Retorna a lista de produtos
\ No newline at end of file
+        try:
+            linhas = exportar_ndjson(engine, Produto, campos, categoria, empresa_id, preco_min, preco_max)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return StreamingResponse(linhas, media_type="application/x-ndjson")
@@ -1,20 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.models import Servico, ServicoRequest
-from app.models.database import engine
+from app.models.database import get_session, get_async_session, engine
+from app.utils.catalog_cache import catalogos
+from app.utils.pagination import apaginar
+from app.utils.catalog_import import CatalogImporter, detectar_formato, linhas_do_stream
+from app.utils.catalog_export import exportar_ndjson
 
 class ServicoRouter(APIRouter):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.add_api_route("/servicos/", self.create_servico, methods=["POST"])
         self.add_api_route("/servicos/", self.list_servicos, methods=["GET"])
+        self.add_api_route("/servicos/importar", self.importar_servicos, methods=["POST"])
+        self.add_api_route("/servicos/exportar", self.exportar_servicos, methods=["GET"])
 
-    def get_session(self):
-        """Função para criar e obter uma sessão de banco de dados"""
-        with Session(engine) as session:
-            yield session  # Retorna a sessão que será usada nas rotas
-
-    async def create_servico(self, servico: ServicoRequest, session: Session = Depends(get_session)):
+    def create_servico(self, servico: ServicoRequest, session: Session = Depends(get_session)):
         """
         Cria um novo serviço no banco de dados.
 
@@ -30,18 +35,93 @@ class ServicoRouter(APIRouter):
         session.add(servico_db)
         session.commit()  # Confirmando a transação no banco
         session.refresh(servico_db)  # Atualizando o serviço com os dados do banco
+        catalogos.rebuild(servico_db.empresa_id)  # Publica o novo catálogo para o chat
         return servico_db  # Retorna o serviço que foi criado
 
-    async def list_servicos(self, session: Session = Depends(get_session)):
+    async def list_servicos(
+        self,
+        cursor: Optional[str] = None,
+        limite: Optional[int] = Query(None, ge=1),
+        categoria: Optional[str] = None,
+        empresa_id: Optional[int] = None,
+        preco_min: Optional[float] = None,
+        preco_max: Optional[float] = None,
+        campos: Optional[str] = None,
+        session: AsyncSession = Depends(get_async_session)
+    ):
         """
-        Retorna a lista de todos os serviços cadastrados.
+        Retorna os serviços cadastrados, uma página por vez (paginação por cursor).
+
+        **Entrada:**
+        - cursor (str, opcional): Valor de `proximo_cursor` da página anterior.
+        - limite (int, opcional): Itens por página (padrão PAGE_SIZE_DEFAULT, máximo PAGE_SIZE_MAX).
+        - categoria, empresa_id (opcionais): Filtros exatos.
+        - preco_min, preco_max (float, opcionais): Faixa de preço.
+        - campos (str, opcional): Campos retornados, separados por vírgula (ex.: "nome,preco,codigo").
+
+        **Saída:**
+        - itens: Serviços da página.
+        - proximo_cursor (str | None): Cursor da próxima página; None na última.
+        """
+        try:
+            return await apaginar(session, Servico, cursor, limite, campos,
+                                  categoria=categoria, empresa_id=empresa_id, preco_min=preco_min, preco_max=preco_max)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    async def importar_servicos(self, request: Request, formato: Optional[str] = None, empresa_id: Optional[int] = None):
+        """
+        Cadastra ou atualiza serviços em lote (upsert por empresa_id e codigo).
+
+        O corpo é lido em streaming e gravado em transações de IMPORT_BATCH_SIZE
+        registros; o catálogo do chat é recarregado uma única vez ao final (também
+        quando a importação é interrompida depois de gravar algum lote).
+
+        **Entrada:**
+        - Corpo: JSON Lines (um objeto por linha) ou CSV com cabeçalho.
+        - formato (str, opcional): "jsonl" ou "csv"; por padrão, deduzido do Content-Type.
+        - empresa_id (int, opcional): Empresa dos registros sem empresa_id (padrão: a primeira cadastrada).
+
+        **Saída:**
+        - Relatório com linhas lidas, inseridos, atualizados, rejeitados, erros e linhas por segundo.
+        """
+        formato = detectar_formato(request.headers.get("content-type"), formato)
+        try:
+            importador = CatalogImporter(engine, "servicos", formato, empresa_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        try:
+            return await importador.aimportar(linhas_do_stream(request.stream()))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        finally:
+            # Lotes já gravados chegam ao chat mesmo se a importação parar no meio
+            if importador.gravou:
+                await run_in_threadpool(catalogos.rebuild)  # Publica o novo catálogo para o chat
+
+    def exportar_servicos(
+        self,
+        categoria: Optional[str] = None,
+        empresa_id: Optional[int] = None,
+        preco_min: Optional[float] = None,
+        preco_max: Optional[float] = None,
+        campos: Optional[str] = None
+    ):
+        """
+        Exporta todos os serviços em NDJSON (um objeto JSON por linha), em streaming.
+
+        As linhas são enviadas conforme são lidas do banco, com memória constante
+        independentemente do tamanho do catálogo.
 
         **Entrada:**
-        - Nenhuma.
+        - categoria, empresa_id, preco_min, preco_max (opcionais): Mesmos filtros da listagem.
+        - campos (str, opcional): Campos exportados, separados por vírgula (ex.: "nome,preco,codigo").
 
         **Saída:**
-        - List[Servico]: Lista de todos os serviços no banco.
+        - application/x-ndjson: Um serviço por linha, em ordem de id.
         """
-        # Executa a consulta para pegar todos os serviços
-        servicos = session.exec(select(Servico)).all()
-        return servicos  # Retorna a lista de serviços
\ No newline at end of file
+        try:
+            linhas = exportar_ndjson(engine, Servico, campos, categoria, empresa_id, preco_min, preco_max)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return StreamingResponse(linhas, media_type="application/x-ndjson")
@@ -1,9 +1,10 @@
 # app/routes/token_status.py
 
 import os
-import requests
 import logging
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+from app.gateway.provider_factory import get_ia_provider
 
 class TokenStatusRouter(APIRouter):
     def __init__(self, *args, **kwargs):
@@ -11,8 +12,11 @@ class TokenStatusRouter(APIRouter):
         self.openai_api_key = os.environ.get("OPENAI_API_KEY")
         self.deepseek_api_key = os.environ.get("DEEPSEEK_API_KEY")
         self.add_api_route("/check_token_status", self.check_token_status, methods=["GET"])
+        self.add_api_route("/rate_limit_status", self.rate_limit_status, methods=["GET"])
 
     def check_openai_status(self, api_key):
+        import requests
+
         url = "https://openrouter.ai/api/v1/auth/key"
         headers = {
             "Authorization": f"Bearer {api_key}"
@@ -43,6 +47,8 @@ class TokenStatusRouter(APIRouter):
             return {"error": f"Erro ao acessar OpenAI: {e}"}
 
     def check_deepseek_status(self, api_key):
+        import requests
+
         url = "https://api.deepseek.com/v1/status"
         headers = {
             "Authorization": f"Bearer {api_key}"
@@ -72,15 +78,33 @@ class TokenStatusRouter(APIRouter):
     async def check_token_status(self, provider: str):
         logging.info(f"Verificando status do token para o provedor: {provider}")
 
-        # Verifica qual provedor está sendo solicitado
+        # Verifica qual provedor está sendo solicitado (as consultas HTTP são bloqueantes: rodam fora do event loop)
         if provider.lower() == 'openai' and self.openai_api_key:
-            result = self.check_openai_status(self.openai_api_key)
+            result = await run_in_threadpool(self.check_openai_status, self.openai_api_key)
             logging.info("Resultado da verificação do OpenAI")
         elif provider.lower() == 'deepseek' and self.deepseek_api_key:
-            result = self.check_deepseek_status(self.deepseek_api_key)
+            result = await run_in_threadpool(self.check_deepseek_status, self.deepseek_api_key)
             logging.info("Resultado da verificação do DeepSeek")
         else:
             result = {"error": "Provedor inválido ou chave não configurada corretamente."}
             logging.error("Provedor inválido ou chave não configurada corretamente.")
 
-        return result
\ No newline at end of file
+        # Limites descobertos passam a valer para as chamadas ao provedor
+        if result.get("rate_limit_requests"):
+            try:
+                await get_ia_provider().atualizar_limites(
+                    provider.lower(), result["rate_limit_requests"], result["rate_limit_interval"]
+                )
+            except ValueError as e:
+                logging.error(f"Limite de requisições inválido informado pelo provedor: {e}")
+
+        return result
+
+    async def rate_limit_status(self):
+        """
+        Situação dos limites de requisições e da fila de espera de cada provedor.
+
+        Returns:
+            dict: Por provedor, o limite vigente, a profundidade da fila e os tempos de espera.
+        """
+        return {nome: dados["limite"] for nome, dados in get_ia_provider().estatisticas().items()}
\ No newline at end of file
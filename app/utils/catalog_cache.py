@@ -0,0 +1,452 @@
+# app/utils/catalog_cache.py
+
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+from cachetools import LRUCache
+from fastapi.concurrency import run_in_threadpool
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.config.settings import Configuration
+from app.models.models import Empresa
+from app.models.database import engine, get_async_engine
+from app.utils.catalog_index import CatalogIndex
+from app.utils.catalog_retriever import CatalogRetriever
+from app.utils.faq_matcher import FaqMatcher
+from app.utils.intent_engine import MotorIntencoes
+from app.utils.metrics import ERROS_DB
+from app.utils.spacy_utils import SINONIMOS
+
+config = Configuration()
+
+@dataclass(frozen=True, slots=True)
+class EmpresaSnapshot:
+    """Dados da empresa congelados no momento da carga do catálogo."""
+    id: int
+    nome: str
+    descricao: str
+    cnpj: str
+    telefone: str
+    endereco: str
+    tipo: str
+
+@dataclass(frozen=True, slots=True)
+class ItemCatalogo:
+    """Produto ou serviço do catálogo, desacoplado da sessão do banco."""
+    id: int
+    tipo: str  # "produto" ou "servico"
+    nome: str
+    descricao: str
+    preco: float
+    categoria: str
+    codigo: str
+    estoque: Optional[int] = None
+
+@dataclass(frozen=True, slots=True)
+class CatalogSnapshot:
+    """Fotografia imutável do catálogo, compartilhada entre requisições."""
+    versao: int
+    empresa: Optional[EmpresaSnapshot]
+    produtos: Tuple[ItemCatalogo, ...]
+    servicos: Tuple[ItemCatalogo, ...]
+    carregado_em: float
+    faq: FaqMatcher = field(default_factory=FaqMatcher)
+    # Resumo do conteúdo: igual em todos os processos enquanto o catálogo não mudar
+    assinatura: str = "0"
+    intencoes: MotorIntencoes = field(default_factory=MotorIntencoes)
+
+    @property
+    def nomes_produtos(self):
+        return [p.nome for p in self.produtos]
+
+    @property
+    def nomes_servicos(self):
+        return [s.nome for s in self.servicos]
+
+# Sentinela de rebuild: a empresa ainda precisa ser lida do banco
+_LER_DO_BANCO = object()
+
+class VersaoCatalogo:
+    """
+    Versão do catálogo publicada no Redis, para que todos os workers vejam as escritas.
+
+    Um hash ("<namespace>:catalogo:versoes") guarda um contador por empresa
+    ("e<id>") e um geral ("todas", para recargas de todos os catálogos). Cada
+    escrita incrementa o contador; cada worker compara, no máximo uma vez por
+    CATALOG_VERSION_CHECK_INTERVAL, os contadores atuais com os lidos ao
+    carregar o seu snapshot e só recarrega quando eles mudam. Assim o snapshot
+    carregado antes do fork continua compartilhado enquanto o catálogo não
+    mudar, ao custo de uma consulta ao Redis por intervalo e de até um
+    intervalo de atraso para as escritas feitas por outro worker.
+
+    Se o Redis estiver indisponível, as leituras retornam None e o catálogo
+    volta a expirar por idade (CATALOG_MAX_AGE).
+    """
+
+    GERAL = "todas"
+
+    def __init__(self, redis_client=None, async_redis_client=None, namespace=None, intervalo=None):
+        """
+        Args:
+            redis_client: Cliente Redis síncrono (publicação e cargas síncronas).
+            async_redis_client: Cliente Redis assíncrono (verificação no caminho do chat).
+            namespace (str): Prefixo da chave; por padrão, CACHE_NAMESPACE.
+            intervalo (float): Segundos entre as verificações de cada catálogo.
+        """
+        self.redis_client = redis_client or config.get_redis_client()
+        self.async_redis_client = async_redis_client or config.get_async_redis_client()
+        self.chave = f"{namespace or config.cache_namespace}:catalogo:versoes"
+        self.intervalo = config.catalog_version_check_interval if intervalo is None else intervalo
+
+    def _campos(self, empresa_id):
+        return (self.GERAL,) if empresa_id is None else (self.GERAL, f"e{empresa_id}")
+
+    def publicar(self, empresa_id=None, geral=False):
+        """
+        Incrementa a versão da empresa após uma escrita no catálogo.
+
+        Args:
+            empresa_id (int): Empresa alterada; sem ela, incrementa a versão geral (todos os catálogos).
+            geral (bool): Incrementa também a versão geral.
+        """
+        campos = self._campos(empresa_id) if geral else self._campos(empresa_id)[-1:]
+        try:
+            with self.redis_client.pipeline(transaction=False) as pipe:
+                for campo in campos:
+                    pipe.hincrby(self.chave, campo, 1)
+                pipe.execute()
+        except RedisError as e:
+            logging.error(f"Erro ao publicar a versão do catálogo no Redis: {e}")
+
+    def ler(self, empresa_id=None):
+        """Versões atuais (geral e da empresa); None se o Redis estiver indisponível."""
+        try:
+            return tuple(self.redis_client.hmget(self.chave, self._campos(empresa_id)))
+        except RedisError as e:
+            logging.error(f"Erro ao ler a versão do catálogo no Redis: {e}")
+            return None
+
+    async def aler(self, empresa_id=None):
+        """Versão assíncrona de ler."""
+        try:
+            return tuple(await self.async_redis_client.hmget(self.chave, self._campos(empresa_id)))
+        except RedisError as e:
+            logging.error(f"Erro ao ler a versão do catálogo no Redis: {e}")
+            return None
+
+class CatalogCache:
+    """
+    Cache em memória do catálogo (empresa, produtos, serviços e FAQ).
+
+    O snapshot é carregado uma única vez com joins antecipados e substituído
+    atomicamente quando o catálogo é alterado, de modo que o caminho do chat
+    não faz consultas ao banco. O índice de busca é atualizado de forma
+    incremental antes de cada novo snapshot ser publicado.
+
+    Com `versoes`, o snapshot é recarregado quando outro processo publica
+    uma escrita (ver VersaoCatalogo); sem ela, ou com o Redis indisponível,
+    o snapshot expira após `max_age`.
+    """
+
+    def __init__(self, engine, max_age=None, async_engine=None, empresa_id=None, versoes=None):
+        """
+        Args:
+            engine: Engine síncrono do banco.
+            max_age (float): Idade máxima do snapshot, em segundos (0 desativa a expiração).
+            async_engine: Engine assíncrono opcional; com ele, as recargas feitas
+                a partir do event loop leem o banco sem ocupar o threadpool.
+            empresa_id (int): Empresa do catálogo; por padrão, a primeira cadastrada.
+            versoes (VersaoCatalogo): Versão publicada no Redis, compartilhada entre os workers.
+        """
+        self.engine = engine
+        self.async_engine = async_engine
+        self.empresa_id = empresa_id
+        self.versoes = versoes
+        self.max_age = config.catalog_max_age if max_age is None else max_age
+        self.indice = CatalogIndex(sinonimos=SINONIMOS)
+        self._snapshot = None
+        self._publicada = None  # Versão no Redis lida antes da carga do snapshot atual
+        self._verificado_em = 0.0
+        self._retriever = None  # (versão do snapshot, CatalogRetriever)
+        self._versao = 0
+        self._lock = threading.Lock()
+
+    def _consulta(self):
+        """Empresa com produtos, serviços e FAQ carregados antecipadamente (sem carregamento preguiçoso)."""
+        consulta = select(Empresa).options(
+            selectinload(Empresa.produtos),
+            selectinload(Empresa.servicos),
+            selectinload(Empresa.faqs)
+        )
+        if self.empresa_id is not None:
+            return consulta.where(Empresa.id == self.empresa_id)
+        return consulta.order_by(Empresa.id).limit(1)
+
+    def _montar(self, versao, empresa):
+        """Converte a empresa lida do banco em um snapshot imutável."""
+        if not empresa:
+            return CatalogSnapshot(versao, None, (), (), time.monotonic())
+
+        produtos = tuple(
+            ItemCatalogo(p.id, "produto", p.nome, p.descricao, p.preco, p.categoria, p.codigo, p.estoque)
+            for p in empresa.produtos
+        )
+        servicos = tuple(
+            ItemCatalogo(s.id, "servico", s.nome, s.descricao, s.preco, s.categoria, s.codigo)
+            for s in empresa.servicos
+        )
+        dados_empresa = EmpresaSnapshot(
+            empresa.id, empresa.nome, empresa.descricao, empresa.cnpj,
+            empresa.telefone, empresa.endereco, empresa.tipo
+        )
+        # O FAQ é compilado uma vez por snapshot, na ordem de cadastro
+        entradas_faq = tuple((f.chave, f.resposta) for f in sorted(empresa.faqs, key=lambda f: f.id))
+        faq = FaqMatcher(entradas_faq)
+        assinatura = self._assinar(dados_empresa, produtos, servicos, entradas_faq)
+        intencoes = MotorIntencoes(dados_empresa, produtos + servicos)
+        return CatalogSnapshot(
+            versao, dados_empresa, produtos, servicos, time.monotonic(), faq, assinatura, intencoes
+        )
+
+    def _empresa_conhecida(self):
+        """Empresa cuja versão é acompanhada: a do catálogo ou a do snapshot atual (None se ainda não houver)."""
+        if self.empresa_id is not None:
+            return self.empresa_id
+        snapshot = self._snapshot
+        return snapshot.empresa.id if snapshot is not None and snapshot.empresa is not None else None
+
+    def _ler_versao(self):
+        """Versão publicada, lida antes do banco: uma escrita concluída depois dela provoca nova recarga."""
+        if self.versoes is None:
+            return None
+        empresa_id = self._empresa_conhecida()
+        if empresa_id is None:
+            with Session(self.engine) as session:
+                empresa_id = session.exec(select(Empresa.id).order_by(Empresa.id).limit(1)).first()
+        return self.versoes.ler(empresa_id)
+
+    async def _aler_versao(self):
+        """Versão assíncrona de _ler_versao."""
+        if self.versoes is None:
+            return None
+        empresa_id = self._empresa_conhecida()
+        if empresa_id is None:
+            async with AsyncSession(self.async_engine) as session:
+                empresa_id = (await session.exec(select(Empresa.id).order_by(Empresa.id).limit(1))).first()
+        return await self.versoes.aler(empresa_id)
+
+    def _carregar(self, versao):
+        """Lê empresa, produtos, serviços e FAQ em uma única sessão."""
+        with Session(self.engine) as session:
+            return self._montar(versao, session.exec(self._consulta()).first())
+
+    @staticmethod
+    def _assinar(*partes):
+        """Resumo determinístico do conteúdo do catálogo, usado para versionar o cache de respostas."""
+        return hashlib.blake2b(repr(partes).encode("utf-8"), digest_size=8).hexdigest()
+
+    def rebuild(self, empresa=_LER_DO_BANCO, publicada=None):
+        """
+        Recarrega o catálogo do banco e publica o novo snapshot de forma atômica.
+
+        Args:
+            empresa: Empresa já lida do banco (usado por arebuild); por padrão, é lida aqui.
+            publicada (tuple): Versão no Redis lida antes de `empresa` (usado por arebuild).
+        """
+        with self._lock:
+            self._versao += 1
+            try:
+                if empresa is _LER_DO_BANCO:
+                    publicada = self._ler_versao()
+                    snapshot = self._carregar(self._versao)
+                else:
+                    snapshot = self._montar(self._versao, empresa)
+            except SQLAlchemyError:
+                ERROS_DB.inc(origem="catalogo")
+                raise
+            self.indice.sincronizar(snapshot)
+            self._snapshot = snapshot
+            self._publicada = publicada
+            self._verificado_em = time.monotonic()
+        logging.info(
+            "Snapshot do catálogo v%d carregado: %d produtos, %d serviços, %d perguntas frequentes.",
+            snapshot.versao, len(snapshot.produtos), len(snapshot.servicos), len(snapshot.faq)
+        )
+        return snapshot
+
+    def _expirado(self, snapshot):
+        return self.max_age > 0 and time.monotonic() - snapshot.carregado_em > self.max_age
+
+    def _verificar_agora(self):
+        """Indica se a versão publicada deve ser consultada (no máximo uma vez por intervalo)."""
+        agora = time.monotonic()
+        if agora - self._verificado_em < self.versoes.intervalo:
+            return False
+        self._verificado_em = agora
+        return True
+
+    def _desatualizado(self, snapshot, atual):
+        """Compara a versão publicada com a do snapshot; sem Redis, vale a idade máxima."""
+        if atual is None:
+            return self._expirado(snapshot)
+        return atual != self._publicada
+
+    def get_snapshot(self) -> CatalogSnapshot:
+        """Retorna o snapshot atual, carregando-o na primeira chamada ou quando estiver desatualizado."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.rebuild()
+        if self.versoes is None:
+            return self.rebuild() if self._expirado(snapshot) else snapshot
+        if self._verificar_agora() and self._desatualizado(snapshot, self.versoes.ler(self._empresa_conhecida())):
+            return self.rebuild()
+        return snapshot
+
+    async def arebuild(self):
+        """
+        Versão assíncrona de rebuild.
+
+        Com engine assíncrono, a leitura do banco é feita pelo event loop (sem
+        ocupar uma thread enquanto aguarda o banco); a montagem do snapshot e
+        a indexação, que usam CPU, continuam no threadpool.
+        """
+        if self.async_engine is None:
+            return await run_in_threadpool(self.rebuild)
+        try:
+            publicada = await self._aler_versao()
+            async with AsyncSession(self.async_engine, expire_on_commit=False) as session:
+                empresa = (await session.exec(self._consulta())).first()
+        except SQLAlchemyError:
+            ERROS_DB.inc(origem="catalogo")
+            raise
+        return await run_in_threadpool(self.rebuild, empresa, publicada)
+
+    async def aget_snapshot(self) -> CatalogSnapshot:
+        """Versão assíncrona de get_snapshot; só consulta o banco quando precisa recarregar."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return await self.arebuild()
+        if self.versoes is None:
+            return await self.arebuild() if self._expirado(snapshot) else snapshot
+        if self._verificar_agora() and self._desatualizado(
+            snapshot, await self.versoes.aler(self._empresa_conhecida())
+        ):
+            return await self.arebuild()
+        return snapshot
+
+    def get_retriever(self, snapshot) -> CatalogRetriever:
+        """Retorna o ranqueador BM25 do snapshot, construindo-o na primeira consulta a cada versão."""
+        atual = self._retriever
+        if atual is not None and atual[0] == snapshot.versao:
+            return atual[1]
+        retriever = CatalogRetriever(snapshot.produtos + snapshot.servicos, sinonimos=SINONIMOS)
+        self._retriever = (snapshot.versao, retriever)
+        return retriever
+
+    def precarregar(self):
+        """Carrega o snapshot e o ranqueador BM25 (antes do fork, para os workers os compartilharem)."""
+        return self.get_retriever(self.get_snapshot())
+
+    async def aget_retriever(self, snapshot) -> CatalogRetriever:
+        """Versão assíncrona de get_retriever; a construção roda fora do event loop."""
+        atual = self._retriever
+        if atual is not None and atual[0] == snapshot.versao:
+            return atual[1]
+        return await run_in_threadpool(self.get_retriever, snapshot)
+
+class CatalogCaches:
+    """
+    Catálogos de várias empresas (multiempresa), um CatalogCache por empresa.
+
+    Mensagens sem empresa usam o catálogo padrão (a primeira empresa
+    cadastrada). Os catálogos das demais são carregados na primeira mensagem
+    e mantidos em um LRU limitado; ao sair dele, a empresa é recarregada do
+    banco quando voltar a ser consultada.
+    """
+
+    def __init__(self, engine, async_engine=None, max_empresas=None, versoes=None):
+        """
+        Args:
+            engine: Engine síncrono do banco.
+            async_engine: Engine assíncrono opcional, repassado a cada catálogo.
+            max_empresas (int): Catálogos mantidos em memória além do padrão.
+            versoes (VersaoCatalogo): Versão publicada no Redis; sem ela, as escritas
+                só chegam aos outros processos quando os snapshots expiram.
+        """
+        self.engine = engine
+        self.async_engine = async_engine
+        self.versoes = versoes
+        self.padrao = CatalogCache(engine, async_engine=async_engine, versoes=versoes)
+        max_empresas = config.tenant_max_loaded if max_empresas is None else max_empresas
+        self._caches = LRUCache(maxsize=max(1, max_empresas))
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._caches)
+
+    def _eh_padrao(self, empresa_id):
+        """Indica se a empresa é a do catálogo padrão (ou se ele ainda não tem empresa)."""
+        snapshot = self.padrao._snapshot
+        return snapshot is None or snapshot.empresa is None or snapshot.empresa.id == empresa_id
+
+    def obter(self, empresa_id=None) -> CatalogCache:
+        """Retorna o catálogo da empresa, criando-o (ainda sem carregar) no primeiro acesso."""
+        if empresa_id is None:
+            return self.padrao
+        snapshot = self.padrao._snapshot
+        if snapshot is not None and snapshot.empresa is not None and snapshot.empresa.id == empresa_id:
+            return self.padrao
+        with self._lock:
+            cache = self._caches.get(empresa_id)
+            if cache is None:
+                cache = CatalogCache(
+                    self.engine, async_engine=self.async_engine, empresa_id=empresa_id, versoes=self.versoes
+                )
+                self._caches[empresa_id] = cache
+            return cache
+
+    def descartar(self, empresa_id):
+        """Remove o catálogo da empresa da memória (por exemplo, se ela não existir)."""
+        with self._lock:
+            self._caches.pop(empresa_id, None)
+
+    def carregados(self):
+        """Catálogos em memória, começando pelo padrão."""
+        with self._lock:
+            return [self.padrao, *self._caches.values()]
+
+    def rebuild(self, empresa_id=None):
+        """
+        Recarrega os catálogos após uma escrita e publica a nova versão no Redis,
+        para que os outros workers também recarreguem.
+
+        Args:
+            empresa_id (int): Empresa alterada; só o catálogo dela é recarregado,
+                se estiver em memória. Sem ela, todos os catálogos carregados são.
+
+        Returns:
+            CatalogSnapshot: O primeiro snapshot recarregado (o do catálogo padrão, se
+            ele foi recarregado); None se a empresa não estiver em memória.
+        """
+        if self.versoes is not None:
+            # Sem empresa no catálogo padrão (banco ainda vazio), ele só acompanha a versão geral
+            self.versoes.publicar(empresa_id, geral=self._eh_padrao(None))
+        resultado = None
+        for cache in self.carregados():
+            if empresa_id is None or cache.empresa_id == empresa_id or (
+                cache is self.padrao and self._eh_padrao(empresa_id)
+            ):
+                snapshot = cache.rebuild()
+                if resultado is None:
+                    resultado = snapshot
+        return resultado
+
+# Instâncias compartilhadas entre os roteadores: todas as empresas e o catálogo padrão
+catalogos = CatalogCaches(engine, async_engine=get_async_engine(), versoes=VersaoCatalogo())
+catalog_cache = catalogos.padrao
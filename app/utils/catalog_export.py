@@ -0,0 +1,45 @@
+# app/utils/catalog_export.py
+
+import json
+from typing import Iterator
+from sqlalchemy import select
+from app.utils.pagination import colunas, filtrar
+
+# Linhas lidas do banco (e enviadas ao cliente) por vez
+TAMANHO_LOTE = 1000
+
+def exportar_ndjson(engine, modelo, campos=None, categoria=None, empresa_id=None,
+                    preco_min=None, preco_max=None, tamanho_lote=TAMANHO_LOTE) -> Iterator[bytes]:
+    """
+    Gera a tabela em NDJSON (um objeto JSON por linha), lote a lote.
+
+    A consulta usa um cursor no servidor (stream_results) e lê só as colunas,
+    sem montar objetos do ORM; cada lote é serializado e liberado antes do
+    próximo, de modo que a memória não cresce com o tamanho do catálogo.
+
+    Args:
+        engine: Engine do banco.
+        modelo: Classe da tabela (Produto ou Servico).
+        campos (str): Projeção opcional, separada por vírgulas (ex.: "nome,preco,codigo").
+        categoria, empresa_id, preco_min, preco_max: Mesmos filtros da listagem paginada.
+        tamanho_lote (int): Linhas buscadas por vez.
+
+    Yields:
+        bytes: Trechos com várias linhas NDJSON.
+
+    Raises:
+        ValueError: Campos inválidos (levantado na criação, antes de qualquer leitura).
+    """
+    projecao = colunas(modelo, campos) if campos else list(modelo.__table__.columns)
+    consulta = filtrar(select(*projecao), modelo, categoria, empresa_id, preco_min, preco_max).order_by(modelo.id)
+
+    def gerar():
+        with engine.connect() as conexao:
+            resultado = conexao.execution_options(stream_results=True, yield_per=tamanho_lote).execute(consulta)
+            nomes = list(resultado.keys())
+            for linhas in resultado.partitions():
+                yield "".join(
+                    json.dumps(dict(zip(nomes, linha)), ensure_ascii=False) + "\n" for linha in linhas
+                ).encode("utf-8")
+
+    return gerar()
@@ -0,0 +1,273 @@
+# app/utils/catalog_import.py
+
+"""
+Importação em lote de produtos e serviços a partir de JSON Lines ou CSV.
+
+Os registros são lidos linha a linha (o arquivo nunca é carregado inteiro na
+memória), validados e gravados em transações de IMPORT_BATCH_SIZE registros.
+Cada registro é identificado por (empresa_id, codigo): se já existir, é
+atualizado; senão, é inserido.
+
+Usado pelas rotas POST /produtos/importar e /servicos/importar e pela linha
+de comando (importar_catalogo.py).
+"""
+
+import codecs
+import csv
+import json
+import logging
+import time
+from typing import AsyncIterator, Iterable, Optional
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, select
+from app.config.settings import Configuration
+from app.models.models import Empresa, Produto, ProdutoRequest, Servico, ServicoRequest
+from app.utils.metrics import ERROS_DB
+
+config = Configuration()
+
+# Tipo de item -> (tabela, modelo de validação)
+MODELOS = {
+    "produtos": (Produto, ProdutoRequest),
+    "servicos": (Servico, ServicoRequest),
+}
+
+FORMATOS = ("jsonl", "csv")
+
+# Quantidade máxima de erros detalhados no relatório
+_MAX_ERROS = 20
+
+# Códigos consultados por SELECT ... IN (abaixo do limite de parâmetros do SQLite)
+_TAMANHO_CONSULTA = 500
+
+class LeitorRegistros:
+    """Converte linhas de JSON Lines ou CSV em dicionários, uma linha por vez."""
+
+    def __init__(self, formato: str):
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato inválido: {formato}")
+        self.formato = formato
+        self._cabecalho = None
+        self._pendente = ""
+
+    def ler(self, linha: str) -> Optional[dict]:
+        """
+        Interpreta uma linha do arquivo.
+
+        Returns:
+            dict | None: O registro, ou None para linhas vazias, para o cabeçalho
+            do CSV e para campos entre aspas que continuam na próxima linha.
+
+        Raises:
+            ValueError: Linha mal formada.
+        """
+        if self.formato == "jsonl":
+            linha = linha.strip()
+            if not linha:
+                return None
+            try:
+                registro = json.loads(linha)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"JSON inválido: {e}")
+            if not isinstance(registro, dict):
+                raise ValueError("Cada linha deve ser um objeto JSON.")
+            return registro
+
+        # CSV: um campo entre aspas pode conter quebras de linha
+        self._pendente += linha if linha.endswith("\n") else linha + "\n"
+        if self._pendente.count('"') % 2:
+            return None
+        texto, self._pendente = self._pendente, ""
+        if not texto.strip():
+            return None
+        valores = next(csv.reader([texto]))
+        if self._cabecalho is None:
+            self._cabecalho = [nome.strip() for nome in valores]
+            return None
+        if len(valores) != len(self._cabecalho):
+            raise ValueError(f"Esperadas {len(self._cabecalho)} colunas, encontradas {len(valores)}.")
+        return dict(zip(self._cabecalho, valores))
+
+class CatalogImporter:
+    """
+    Grava registros do catálogo em lotes, com upsert por (empresa_id, codigo).
+
+    Cada lote é gravado em uma única transação: os códigos já existentes são
+    buscados de uma vez e os registros são divididos entre um UPDATE e um
+    INSERT em massa, sem carregar objetos do ORM. Um lote que o banco recusar
+    é desfeito e relatado como rejeitado, sem interromper os seguintes.
+    """
+
+    def __init__(self, engine, tipo: str, formato: str = "jsonl", empresa_id: Optional[int] = None,
+                 tamanho_lote: Optional[int] = None):
+        """
+        Args:
+            engine: Engine do banco.
+            tipo (str): "produtos" ou "servicos".
+            formato (str): "jsonl" ou "csv".
+            empresa_id (int): Empresa usada nos registros sem empresa_id (padrão: a primeira cadastrada).
+            tamanho_lote (int): Registros por transação.
+        """
+        if tipo not in MODELOS:
+            raise ValueError(f"Tipo inválido: {tipo}")
+        self.engine = engine
+        self.tipo = tipo
+        self.tabela, self.validador = MODELOS[tipo]
+        self.leitor = LeitorRegistros(formato)
+        self.empresa_id = empresa_id
+        self.tamanho_lote = tamanho_lote or config.import_batch_size
+        self._lote = []
+        self._numero_linha = 0
+        self._inicio = None
+        self._empresas = None
+        self.relatorio = {"linhas": 0, "inseridos": 0, "atualizados": 0, "rejeitados": 0, "erros": []}
+
+    @property
+    def lote_cheio(self) -> bool:
+        return len(self._lote) >= self.tamanho_lote
+
+    def preparar(self):
+        """
+        Lê as empresas cadastradas e resolve a empresa padrão, antes de ler o arquivo.
+
+        Raises:
+            ValueError: Nenhuma empresa cadastrada, ou empresa_id informado inexistente.
+        """
+        if self._empresas is not None:
+            return
+        with Session(self.engine) as session:
+            empresas = session.exec(select(Empresa.id).order_by(Empresa.id)).all()
+        if not empresas:
+            raise ValueError("Nenhuma empresa cadastrada para receber os itens.")
+        if self.empresa_id is None:
+            self.empresa_id = empresas[0]
+        elif self.empresa_id not in empresas:
+            raise ValueError(f"Empresa {self.empresa_id} não cadastrada.")
+        # O SQLite não verifica a chave estrangeira: registros de empresas inexistentes são rejeitados aqui
+        self._empresas = set(empresas)
+
+    @property
+    def gravou(self) -> bool:
+        """Indica se algum registro já foi gravado (o catálogo do chat precisa ser recarregado)."""
+        return bool(self.relatorio["inseridos"] or self.relatorio["atualizados"])
+
+    def _rejeitar(self, mensagem, quantidade=1):
+        self.relatorio["rejeitados"] += quantidade
+        if len(self.relatorio["erros"]) < _MAX_ERROS:
+            self.relatorio["erros"].append({"linha": self._numero_linha, "erro": mensagem})
+
+    def processar(self, linha: str):
+        """Lê e valida uma linha, acumulando o registro no lote atual (requer preparar)."""
+        if self._inicio is None:
+            self._inicio = time.perf_counter()
+        self._numero_linha += 1
+        try:
+            registro = self.leitor.ler(linha)
+        except ValueError as e:
+            self._rejeitar(str(e))
+            return
+        if registro is None:
+            return
+        self.relatorio["linhas"] += 1
+
+        if not registro.get("empresa_id"):
+            registro["empresa_id"] = self.empresa_id
+        try:
+            valido = self.validador(**registro).model_dump()
+        except ValidationError as e:
+            erros = "; ".join(f"{'.'.join(map(str, erro['loc']))}: {erro['msg']}" for erro in e.errors())
+            self._rejeitar(erros)
+            return
+        if valido["empresa_id"] not in self._empresas:
+            self._rejeitar(f"empresa_id: empresa {valido['empresa_id']} não cadastrada")
+            return
+        self._lote.append(valido)
+
+    def gravar(self):
+        """Grava o lote acumulado em uma transação; se o banco recusar, o lote é relatado como rejeitado."""
+        if not self._lote:
+            return
+        # Códigos repetidos no mesmo lote: vale o último
+        registros = {(r["empresa_id"], r["codigo"]): r for r in self._lote}
+        self._lote = []
+        chaves = list(registros)
+
+        try:
+            with Session(self.engine) as session:
+                existentes = {}
+                for i in range(0, len(chaves), _TAMANHO_CONSULTA):
+                    codigos = {codigo for _, codigo in chaves[i:i + _TAMANHO_CONSULTA]}
+                    consulta = select(self.tabela.id, self.tabela.empresa_id, self.tabela.codigo).where(
+                        self.tabela.codigo.in_(codigos)
+                    )
+                    for id_, empresa_id, codigo in session.exec(consulta):
+                        existentes[(empresa_id, codigo)] = id_
+
+                atualizar = [{"id": existentes[chave], **registro} for chave, registro in registros.items() if chave in existentes]
+                inserir = [registro for chave, registro in registros.items() if chave not in existentes]
+                if atualizar:
+                    session.execute(update(self.tabela), atualizar)
+                if inserir:
+                    session.execute(insert(self.tabela), inserir)
+                session.commit()
+        except SQLAlchemyError as e:
+            ERROS_DB.inc(origem="importacao")
+            logging.error(f"Erro ao gravar lote de {len(registros)} {self.tipo}: {e}")
+            self._rejeitar(f"Lote de {len(registros)} registros não gravado: {e.__class__.__name__}", len(registros))
+            return
+
+        self.relatorio["atualizados"] += len(atualizar)
+        self.relatorio["inseridos"] += len(inserir)
+
+    def finalizar(self) -> dict:
+        """Grava o restante e retorna o relatório (contagens, erros, duração e linhas por segundo)."""
+        self.gravar()
+        duracao = time.perf_counter() - self._inicio if self._inicio is not None else 0.0
+        self.relatorio["segundos"] = round(duracao, 3)
+        self.relatorio["linhas_por_segundo"] = round(self.relatorio["linhas"] / duracao, 1) if duracao else 0.0
+        logging.info(
+            f"Importação de {self.tipo}: {self.relatorio['inseridos']} inseridos, "
+            f"{self.relatorio['atualizados']} atualizados, {self.relatorio['rejeitados']} rejeitados "
+            f"({self.relatorio['linhas_por_segundo']} linhas/s)."
+        )
+        return self.relatorio
+
+    def importar(self, linhas: Iterable[str]) -> dict:
+        """Importa as linhas de um arquivo (ou qualquer iterável de texto)."""
+        self.preparar()
+        for linha in linhas:
+            self.processar(linha)
+            if self.lote_cheio:
+                self.gravar()
+        return self.finalizar()
+
+    async def aimportar(self, linhas: AsyncIterator[str]) -> dict:
+        """Versão assíncrona de importar; as consultas e gravações rodam fora do event loop."""
+        await run_in_threadpool(self.preparar)
+        async for linha in linhas:
+            self.processar(linha)
+            if self.lote_cheio:
+                await run_in_threadpool(self.gravar)
+        return await run_in_threadpool(self.finalizar)
+
+async def linhas_do_stream(trechos: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Divide um corpo recebido em trechos (ex.: Request.stream()) em linhas de texto UTF-8."""
+    decodificador = codecs.getincrementaldecoder("utf-8-sig")()
+    pendente = ""
+    async for trecho in trechos:
+        pendente += decodificador.decode(trecho)
+        *linhas, pendente = pendente.split("\n")
+        for linha in linhas:
+            yield linha + "\n"
+    pendente += decodificador.decode(b"", final=True)
+    if pendente:
+        yield pendente
+
+def detectar_formato(nome: str, formato: Optional[str] = None) -> str:
+    """Formato informado ou deduzido do nome do arquivo / tipo de conteúdo."""
+    if formato:
+        return formato.lower()
+    return "csv" if "csv" in (nome or "").lower() else "jsonl"
@@ -0,0 +1,264 @@
+# app/utils/catalog_index.py
+
+import math
+import heapq
+import bisect
+import logging
+from collections import Counter, defaultdict
+from app.utils.text_utils import tokenizar, singularizar
+
+# Palavras que não ajudam a identificar um item do catálogo
+PALAVRAS_VAZIAS = {"de", "da", "do", "das", "dos", "e", "com", "para", "em", "a", "o", "um", "uma"}
+
+class _EstadoIndice:
+    """Estruturas do índice em uma versão; depois de publicado, o estado não é mais alterado."""
+
+    __slots__ = ("itens", "tokens", "ordem", "postings", "vocabulario")
+
+    def __init__(self, itens=None, tokens=None, ordem=None, postings=None, vocabulario=()):
+        self.itens = itens if itens is not None else {}        # chave -> ItemCatalogo
+        self.tokens = tokens if tokens is not None else {}     # chave -> frozenset de tokens do nome
+        self.ordem = ordem if ordem is not None else {}        # chave -> inteiro (número de tokens, id), ordem de contendo()
+        self.postings = postings if postings is not None else {}  # token -> frozenset de chaves
+        self.vocabulario = vocabulario                         # tokens ordenados, para busca por prefixo
+
+    def copiar(self):
+        return _EstadoIndice(dict(self.itens), dict(self.tokens), dict(self.ordem), dict(self.postings), self.vocabulario)
+
+class CatalogIndex:
+    """
+    Índice invertido de termos dos nomes do catálogo para os itens.
+
+    Cada nome é quebrado em tokens normalizados (sem acento, no singular e com
+    sinônimos canônicos), permitindo casar nomes com várias palavras, buscas
+    parciais por prefixo e ordenar os resultados por relevância.
+
+    As atualizações montam um novo estado (cópia das estruturas com as
+    alterações) e o publicam com uma única atribuição; cada busca lê o estado
+    uma vez no início, de modo que buscas concorrentes nunca observam um
+    estado intermediário.
+    """
+
+    def __init__(self, sinonimos=None, min_prefixo=3, max_expansoes=50):
+        """
+        Args:
+            sinonimos (dict): Mapa de variação -> termo canônico.
+            min_prefixo (int): Tamanho mínimo do termo para buscar por prefixo.
+            max_expansoes (int): Número máximo de tokens expandidos por prefixo.
+        """
+        self.sinonimos = {
+            self._normalizar_termo(k): self._normalizar_termo(v) for k, v in (sinonimos or {}).items()
+        }
+        self.min_prefixo = min_prefixo
+        self.max_expansoes = max_expansoes
+        self.versao = None
+        self._estado = _EstadoIndice()
+
+    @staticmethod
+    def _normalizar_termo(termo):
+        return " ".join(singularizar(t) for t in tokenizar(termo))
+
+    def _canonico(self, token):
+        token = singularizar(token)
+        return self.sinonimos.get(token, token)
+
+    def _tokens_do_nome(self, nome):
+        tokens = {self._canonico(t) for t in tokenizar(nome) if t not in PALAVRAS_VAZIAS}
+        return frozenset(tokens)
+
+    @staticmethod
+    def chave(item):
+        """Chave única do item no índice (ids de produtos e serviços podem coincidir)."""
+        return (item.tipo, item.id)
+
+    def __len__(self):
+        return len(self._estado.itens)
+
+    def _adicionar_em(self, estado, itens):
+        """Indexa os itens no estado informado (ainda não publicado)."""
+        self._remover_em(estado, [self.chave(item) for item in itens if self.chave(item) in estado.itens])
+        acrescimos = defaultdict(set)
+        for item in itens:
+            chave = self.chave(item)
+            tokens = self._tokens_do_nome(item.nome)
+            estado.itens[chave] = item
+            estado.tokens[chave] = tokens
+            estado.ordem[chave] = (len(tokens) << 40) + item.id
+            for token in tokens:
+                acrescimos[token].add(chave)
+        novos_tokens = []
+        for token, chaves in acrescimos.items():
+            postings = estado.postings.get(token)
+            if postings is None:
+                novos_tokens.append(token)
+                estado.postings[token] = frozenset(chaves)
+            else:
+                estado.postings[token] = postings | chaves
+        if novos_tokens:
+            estado.vocabulario = tuple(sorted(set(estado.vocabulario).union(novos_tokens)))
+
+    @staticmethod
+    def _remover_em(estado, chaves):
+        """Remove os itens do estado informado (ainda não publicado)."""
+        retiradas = defaultdict(set)
+        for chave in chaves:
+            tokens = estado.tokens.pop(chave, None)
+            estado.ordem.pop(chave, None)
+            estado.itens.pop(chave, None)
+            for token in tokens or ():
+                retiradas[token].add(chave)
+        removidos = set()
+        for token, chaves_token in retiradas.items():
+            postings = estado.postings.get(token, frozenset()) - chaves_token
+            if postings:
+                estado.postings[token] = postings
+            else:
+                estado.postings.pop(token, None)
+                removidos.add(token)
+        if removidos:
+            estado.vocabulario = tuple(t for t in estado.vocabulario if t not in removidos)
+
+    def adicionar(self, itens):
+        """Indexa (ou reindexa) os itens informados."""
+        estado = self._estado.copiar()
+        self._adicionar_em(estado, list(itens))
+        self._estado = estado
+
+    def remover(self, chaves):
+        """Remove os itens com as chaves informadas do índice."""
+        estado = self._estado.copiar()
+        self._remover_em(estado, chaves)
+        self._estado = estado
+
+    def sincronizar(self, snapshot):
+        """
+        Atualiza o índice de forma incremental a partir de um snapshot do catálogo.
+
+        Apenas itens novos, alterados ou removidos são reindexados; o novo
+        estado é publicado de uma vez, ao final.
+        """
+        atual = self._estado
+        atuais = {self.chave(item): item for item in (*snapshot.produtos, *snapshot.servicos)}
+        removidos = [chave for chave in atual.itens if chave not in atuais]
+        alterados = [item for chave, item in atuais.items() if atual.itens.get(chave) != item]
+        if removidos or alterados:
+            estado = atual.copiar()
+            self._remover_em(estado, removidos)
+            self._adicionar_em(estado, alterados)
+            self._estado = estado
+        self.versao = snapshot.versao
+        logging.info(
+            "Índice do catálogo sincronizado (v%s): %d itens, %d alterados, %d removidos.",
+            snapshot.versao, len(self._estado.itens), len(alterados), len(removidos)
+        )
+
+    def termos_conhecidos(self, termos):
+        """Termos (já canônicos) que aparecem exatamente em algum nome do catálogo."""
+        consulta = {self._canonico(t) for termo in termos for t in tokenizar(termo)} - PALAVRAS_VAZIAS
+        postings = self._estado.postings
+        return frozenset(termo for termo in consulta if termo in postings)
+
+    def contendo(self, termos, tipos=None, limite=10):
+        """
+        Itens cujos nomes contêm todos os termos (já canônicos, ver termos_conhecidos).
+
+        Sem pontuação por relevância: basta a interseção dos postings, e os
+        nomes mais curtos (mais cobertos pelos termos) vêm primeiro, seguidos
+        pela ordem de cadastro.
+        """
+        if not termos:
+            return []
+        estado = self._estado
+        postings = sorted((estado.postings.get(termo, frozenset()) for termo in termos), key=len)
+        chaves = postings[0].intersection(*postings[1:]) if len(postings) > 1 else postings[0]
+        if tipos is not None:
+            chaves = [chave for chave in chaves if chave[0] in tipos]
+        melhores = heapq.nsmallest(limite, chaves, key=estado.ordem.__getitem__)
+        return [estado.itens[chave] for chave in melhores]
+
+    @staticmethod
+    def _idf(estado, token):
+        return math.log(1 + len(estado.itens) / (1 + len(estado.postings.get(token, ()))))
+
+    def _expandir_prefixo(self, estado, termo):
+        """Tokens do vocabulário que começam com o termo (exceto o próprio termo)."""
+        vocabulario = estado.vocabulario
+        inicio = bisect.bisect_left(vocabulario, termo)
+        expansoes = []
+        for token in vocabulario[inicio:inicio + self.max_expansoes + 1]:
+            if not token.startswith(termo):
+                break
+            if token != termo:
+                expansoes.append(token)
+        return expansoes
+
+    def buscar(self, termos, tipos=None, limite=10):
+        """
+        Busca itens cujos nomes casam com os termos informados.
+
+        Itens que casam com mais termos da consulta vêm primeiro; dentro do
+        mesmo nível, casamentos exatos valem mais que casamentos por prefixo,
+        termos raros valem mais que termos comuns e itens com maior fração do
+        nome coberta pela consulta são ordenados primeiro.
+
+        Args:
+            termos (list): Palavras-chave da mensagem.
+            tipos (set): Tipos de item aceitos ("produto", "servico"); None aceita todos.
+            limite (int): Número máximo de itens retornados.
+
+        Returns:
+            list: Itens do catálogo ordenados por relevância.
+        """
+        consulta = {self._canonico(t) for termo in termos for t in tokenizar(termo)} - PALAVRAS_VAZIAS
+        estado = self._estado
+        grupos = []  # (peso, itens com casamento exato, itens com casamento por prefixo)
+        for termo in consulta:
+            exatos = estado.postings.get(termo, frozenset())
+            prefixados = frozenset()
+            if len(termo) >= self.min_prefixo:
+                expansoes = [estado.postings.get(t, frozenset()) for t in self._expandir_prefixo(estado, termo)]
+                if expansoes:
+                    prefixados = frozenset().union(*expansoes) - exatos
+            if exatos or prefixados:
+                grupos.append((self._idf(estado, termo), exatos, prefixados))
+        if not grupos:
+            return []
+
+        # Caminho rápido: itens que casam com todos os termos, via interseção de conjuntos
+        todos = frozenset.intersection(*(exatos | prefixados for _, exatos, prefixados in grupos))
+        if tipos is not None:
+            todos = [chave for chave in todos if chave[0] in tipos]
+        if len(todos) >= limite:
+            candidatos = [(len(grupos), chave) for chave in todos]
+        else:
+            # Contagem de termos casados por item, feita em C pelo Counter
+            contagem = Counter()
+            for _, exatos, prefixados in grupos:
+                contagem.update(exatos)
+                contagem.update(prefixados)
+
+            niveis = defaultdict(list)
+            for chave, casados in contagem.items():
+                if tipos is None or chave[0] in tipos:
+                    niveis[casados].append(chave)
+
+            # Pontua apenas os melhores níveis, até haver candidatos suficientes
+            candidatos = []
+            for casados in sorted(niveis, reverse=True):
+                candidatos.extend((casados, chave) for chave in niveis[casados])
+                if len(candidatos) >= limite:
+                    break
+
+        resultados = []
+        for casados, chave in candidatos:
+            item = estado.itens.get(chave)
+            tokens = estado.tokens.get(chave)
+            pontos = sum(
+                peso if chave in exatos else 0.5 * peso if chave in prefixados else 0
+                for peso, exatos, prefixados in grupos
+            )
+            cobertura = min(casados / len(tokens), 1.0)
+            resultados.append((casados, pontos * (1 + cobertura), item.nome, item))
+
+        melhores = heapq.nsmallest(limite, resultados, key=lambda r: (-r[0], -r[1], r[2]))
+        return [item for _, _, _, item in melhores]
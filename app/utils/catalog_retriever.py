@@ -0,0 +1,93 @@
+# app/utils/catalog_retriever.py
+
+import math
+import heapq
+from collections import Counter, defaultdict
+from app.utils.catalog_index import PALAVRAS_VAZIAS
+from app.utils.text_utils import tokenizar, singularizar
+
+class CatalogRetriever:
+    """
+    Ranqueamento BM25 dos itens do catálogo em relação a uma mensagem livre.
+
+    Diferente do CatalogIndex, que casa palavras-chave com nomes, aqui cada
+    item é um documento formado por nome, categoria e descrição, e a
+    mensagem inteira é a consulta. É usado para escolher quais itens
+    acompanham a pergunta enviada à IA. Instâncias são imutáveis e
+    construídas uma vez por snapshot do catálogo.
+    """
+
+    def __init__(self, itens, sinonimos=None, k1=1.2, b=0.75, peso_nome=2):
+        """
+        Args:
+            itens (iterable): Itens do catálogo (ItemCatalogo).
+            sinonimos (dict): Mapa de variação -> termo canônico.
+            k1 (float): Saturação da frequência dos termos.
+            b (float): Normalização pelo tamanho do documento.
+            peso_nome (int): Quantas vezes os termos do nome contam em relação aos da descrição.
+        """
+        self.sinonimos = {self._normalizar(k): self._normalizar(v) for k, v in (sinonimos or {}).items()}
+        self.k1 = k1
+        self.b = b
+        self._itens = []
+        self._tamanhos = []
+        self._postings = defaultdict(list)  # termo -> [(posição do item, frequência)]
+
+        for posicao, item in enumerate(itens):
+            termos = self._termos(item.nome) * peso_nome
+            termos += self._termos(item.categoria or "") + self._termos(item.descricao or "")
+            self._itens.append(item)
+            self._tamanhos.append(len(termos))
+            for termo, frequencia in Counter(termos).items():
+                self._postings[termo].append((posicao, frequencia))
+
+        self._tamanho_medio = (sum(self._tamanhos) / len(self._tamanhos)) if self._itens else 0.0
+
+    @staticmethod
+    def _normalizar(texto):
+        return " ".join(singularizar(t) for t in tokenizar(texto))
+
+    def _termos(self, texto):
+        termos = []
+        for token in tokenizar(texto):
+            if token in PALAVRAS_VAZIAS:
+                continue
+            token = singularizar(token)
+            termos.append(self.sinonimos.get(token, token))
+        return termos
+
+    def __len__(self):
+        return len(self._itens)
+
+    def _idf(self, termo):
+        n = len(self._postings.get(termo, ()))
+        return math.log(1 + (len(self._itens) - n + 0.5) / (n + 0.5))
+
+    def buscar(self, mensagem, tipos=None, limite=8):
+        """
+        Retorna os itens mais relevantes para a mensagem.
+
+        Args:
+            mensagem (str): Mensagem do usuário.
+            tipos (set): Tipos de item aceitos ("produto", "servico"); None aceita todos.
+            limite (int): Número máximo de itens retornados.
+
+        Returns:
+            list: Itens com pontuação positiva, do mais ao menos relevante.
+        """
+        pontos = defaultdict(float)
+        for termo in set(self._termos(mensagem)):
+            postings = self._postings.get(termo)
+            if not postings:
+                continue
+            idf = self._idf(termo)
+            for posicao, frequencia in postings:
+                tamanho = self._tamanhos[posicao] / self._tamanho_medio
+                pontos[posicao] += idf * frequencia * (self.k1 + 1) / (
+                    frequencia + self.k1 * (1 - self.b + self.b * tamanho)
+                )
+
+        if tipos is not None:
+            pontos = {p: v for p, v in pontos.items() if self._itens[p].tipo in tipos}
+        melhores = heapq.nsmallest(limite, pontos.items(), key=lambda par: (-par[1], par[0]))
+        return [self._itens[posicao] for posicao, _ in melhores]
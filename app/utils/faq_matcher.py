@@ -0,0 +1,98 @@
+# app/utils/faq_matcher.py
+
+from collections import deque
+from app.utils.text_utils import normalizar_texto
+
+class FaqMatcher:
+    """
+    Casador de perguntas frequentes baseado em um autômato Aho-Corasick.
+
+    Todas as chaves do FAQ são compiladas em um único autômato, de modo que a
+    mensagem é percorrida uma única vez, independentemente do número de
+    entradas. Chaves e mensagens são comparadas sem acentos e sem diferenciar
+    maiúsculas de minúsculas, e só casam em limites de palavra.
+    """
+
+    def __init__(self, entradas=()):
+        """
+        Args:
+            entradas (iterable): Pares (chave, resposta). Em caso de várias chaves
+                presentes na mensagem, vence a que aparece primeiro em `entradas`.
+        """
+        self._transicoes = [{}]
+        self._falhas = [0]
+        self._saidas = [()]
+        self._respostas = []
+
+        for chave, resposta in entradas:
+            padrao = normalizar_texto(chave)
+            if not padrao:
+                continue
+            self._respostas.append(resposta)
+            self._inserir(padrao, len(self._respostas) - 1)
+
+        self._compilar()
+
+    def __len__(self):
+        return len(self._respostas)
+
+    def _inserir(self, padrao, indice):
+        estado = 0
+        for caractere in padrao:
+            proximo = self._transicoes[estado].get(caractere)
+            if proximo is None:
+                proximo = len(self._transicoes)
+                self._transicoes[estado][caractere] = proximo
+                self._transicoes.append({})
+                self._falhas.append(0)
+                self._saidas.append(())
+            estado = proximo
+        self._saidas[estado] = self._saidas[estado] + ((indice, len(padrao)),)
+
+    def _compilar(self):
+        """Calcula os links de falha em largura e propaga as saídas dos sufixos."""
+        fila = deque(self._transicoes[0].values())
+        while fila:
+            estado = fila.popleft()
+            for caractere, proximo in self._transicoes[estado].items():
+                fila.append(proximo)
+                falha = self._falhas[estado]
+                while falha and caractere not in self._transicoes[falha]:
+                    falha = self._falhas[falha]
+                destino = self._transicoes[falha].get(caractere, 0)
+                self._falhas[proximo] = destino if destino != proximo else 0
+                self._saidas[proximo] = self._saidas[proximo] + self._saidas[self._falhas[proximo]]
+
+    def buscar(self, mensagem):
+        """
+        Procura, em uma única passada, a chave do FAQ presente na mensagem.
+
+        Args:
+            mensagem (str): Mensagem do usuário.
+
+        Returns:
+            str | None: Resposta da chave encontrada, ou None se nenhuma casar.
+        """
+        if not self._respostas:
+            return None
+
+        texto = normalizar_texto(mensagem)
+        transicoes, falhas, saidas = self._transicoes, self._falhas, self._saidas
+        tamanho_texto = len(texto)
+        estado = 0
+        melhor = None
+        for posicao, caractere in enumerate(texto):
+            while estado and caractere not in transicoes[estado]:
+                estado = falhas[estado]
+            estado = transicoes[estado].get(caractere, 0)
+            for indice, tamanho in saidas[estado]:
+                if melhor is not None and indice >= melhor:
+                    continue
+                inicio = posicao - tamanho + 1
+                fim = posicao + 1
+                if (inicio == 0 or not texto[inicio - 1].isalnum()) and (fim == tamanho_texto or not texto[fim].isalnum()):
+                    melhor = indice
+            if melhor == 0:
+                break
+
+        return self._respostas[melhor] if melhor is not None else None
@@ -0,0 +1,184 @@
+# app/utils/intent_engine.py
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+from app.config.settings import Configuration
+from app.gateway.prompt_builder import formatar_preco
+from app.utils.catalog_index import PALAVRAS_VAZIAS
+from app.utils.text_utils import tokenizar, singularizar
+
+config = Configuration()
+
+# Padrões aplicados à mensagem tokenizada (minúsculas, sem acentos e sem pontuação)
+_PRECO = re.compile(
+    r"\bquanto (custa|custam|sai|saem|fica|ficam|e|esta|estao|cobra|cobram)\b"
+    r"|\b(preco|precos|valor|valores|custa|custam)\b"
+)
+_ESTOQUE = re.compile(
+    r"\b(estoque|disponivel|disponiveis|disponibilidade)\b|\bpronta entrega\b"
+    r"|\bainda (tem|ha)\b|\btem (unidade|unidades)\b"
+)
+_CONTATO = re.compile(
+    r"\b(contato|whatsapp|whats|zap)\b"
+    r"|\b(telefone|numero|fone) (de |do |da |para )?(contato|atendimento|loja|empresa|voces)\b"
+    r"|\b(seu|teu) (telefone|numero)\b|\bcomo (falo|falar|ligo|ligar)\b"
+)
+_ENDERECO = re.compile(
+    r"\bendereco\b(?! (de|para) entrega)|\blocalizacao\b|\bloja fisica\b"
+    r"|\bonde (fica|ficam|estao) (a loja|a empresa|voces)\b|\bonde voces (ficam|estao)\b"
+)
+_CATEGORIA = re.compile(
+    r"\b(categoria|categorias|linha|secao|departamento)\b"
+    r"|\b(quais|que|outros|outras) (produtos|itens|opcoes|servicos|modelos)\b"
+    r"|\bo que (voces )?(tem|vendem|oferecem)\b"
+)
+_LISTA_CATEGORIAS = re.compile(r"\bcategorias\b")
+
+# Palavras das próprias intenções, ignoradas ao procurar o item da pergunta
+_PALAVRAS_INTENCAO = {"quanto", "custa", "custam", "preco", "precos", "valor", "valores", "estoque", "disponivel"}
+
+@dataclass(frozen=True, slots=True)
+class RespostaIntencao:
+    """Resposta montada pelo motor de intenções e a intenção reconhecida."""
+    intencao: str
+    resposta: str
+
+class MotorIntencoes:
+    """
+    Responde perguntas objetivas direto do snapshot do catálogo, sem spaCy nem IA.
+
+    Intenções reconhecidas, por padrões sobre a mensagem normalizada:
+        - preco: "quanto custa o notebook?" (preço de cada item citado)
+        - estoque: "tem camiseta em estoque?" (quantidade de cada produto citado)
+        - contato / endereco: telefone e endereço da empresa
+        - categoria: "quais produtos de informática?" (itens da categoria citada)
+
+    Os itens citados são localizados pelo índice invertido do catálogo e só
+    valem os que contêm todos os termos conhecidos da mensagem; na dúvida,
+    nenhuma intenção casa e a pergunta segue para o catálogo e a IA. O motor é
+    montado uma vez por snapshot, como o FAQ.
+    """
+
+    INTENCOES = ("preco", "estoque", "categoria", "contato", "endereco")
+
+    def __init__(self, empresa=None, itens=(), max_itens=None):
+        """
+        Args:
+            empresa (EmpresaSnapshot): Empresa do catálogo (telefone e endereço).
+            itens (iterable): Produtos e serviços do snapshot.
+            max_itens (int): Número máximo de itens listados em uma resposta.
+        """
+        self.empresa = empresa
+        self.max_itens = config.intent_max_itens if max_itens is None else max_itens
+        # Termos da categoria (sem acento e no singular) -> (nome, {tipo: itens})
+        self._categorias = {}
+        for item in itens:
+            if not item.categoria:
+                continue
+            termos = self._termos(item.categoria)
+            if not termos:
+                continue
+            nome, por_tipo = self._categorias.setdefault(termos, (item.categoria, {}))
+            por_tipo.setdefault(item.tipo, []).append(item)
+
+    @staticmethod
+    def _termos(texto):
+        return frozenset(singularizar(t) for t in tokenizar(texto)) - PALAVRAS_VAZIAS
+
+    def responder(self, mensagem, indice, tipos=None) -> Optional[RespostaIntencao]:
+        """
+        Reconhece a intenção da mensagem e monta a resposta a partir do snapshot.
+
+        Args:
+            mensagem (str): Mensagem do usuário.
+            indice (CatalogIndex): Índice do catálogo, para localizar os itens citados.
+            tipos (set): Tipos de item que a empresa oferece; None aceita todos.
+
+        Returns:
+            RespostaIntencao | None: None se nenhuma intenção casar ou faltar dado para responder.
+        """
+        tokens = tokenizar(mensagem)
+        texto = " ".join(tokens)
+        preco = _PRECO.search(texto) is not None
+        estoque = _ESTOQUE.search(texto) is not None
+        if preco or estoque:
+            resposta = self._responder_itens(tokens, indice, tipos, preco, estoque)
+            if resposta is not None:
+                return resposta
+        if self.empresa is not None:
+            if self.empresa.telefone and _CONTATO.search(texto):
+                return RespostaIntencao("contato", f"Nosso telefone de contato é {self.empresa.telefone}.")
+            if self.empresa.endereco and _ENDERECO.search(texto):
+                return RespostaIntencao("endereco", f"Nosso endereço é {self.empresa.endereco}.")
+        if self._categorias and _CATEGORIA.search(texto):
+            return self._responder_categoria(tokens, texto, tipos)
+        return None
+
+    def _itens_citados(self, tokens, indice, tipos):
+        """Itens que contêm todos os termos do catálogo presentes na mensagem (até max_itens + 1)."""
+        termos = indice.termos_conhecidos(t for t in tokens if t not in _PALAVRAS_INTENCAO)
+        return indice.contendo(termos, tipos=tipos, limite=self.max_itens + 1)
+
+    def _responder_itens(self, tokens, indice, tipos, preco, estoque):
+        itens = self._itens_citados(tokens, indice, tipos)
+        if not preco:
+            # Estoque só existe para produtos
+            itens = [item for item in itens if item.estoque is not None]
+        if not itens:
+            return None
+        intencao = "preco" if preco else "estoque"
+        mais = len(itens) > self.max_itens
+        itens = itens[:self.max_itens]
+
+        if len(itens) == 1:
+            item = itens[0]
+            frases = []
+            if preco:
+                frases.append(f"{item.nome} custa {formatar_preco(item.preco)}.")
+            if estoque and item.estoque is not None:
+                if item.estoque > 0:
+                    unidades = "1 unidade" if item.estoque == 1 else f"{item.estoque} unidades"
+                    frases.append(f"Temos {item.nome} em estoque ({unidades}).")
+                else:
+                    frases.append(f"No momento, {item.nome} está sem estoque.")
+            return RespostaIntencao(intencao, " ".join(frases))
+
+        linhas = []
+        for item in itens:
+            partes = [formatar_preco(item.preco)] if preco else []
+            if estoque and item.estoque is not None:
+                partes.append(f"{item.estoque} em estoque" if item.estoque > 0 else "sem estoque")
+            linhas.append(f"- {item.nome}: {'; '.join(partes)}")
+        titulo = "Preços" if preco else "Disponibilidade"
+        resposta = f"{titulo}:\n" + "\n".join(linhas)
+        if mais:
+            resposta += "\nHá outras opções; informe o modelo para mais detalhes."
+        return RespostaIntencao(intencao, resposta)
+
+    def _responder_categoria(self, tokens, texto, tipos):
+        presentes = {singularizar(t) for t in tokens}
+        citadas = [termos for termos in self._categorias if termos <= presentes]
+        if not citadas:
+            if not _LISTA_CATEGORIAS.search(texto):
+                return None
+            nomes = sorted(
+                nome for nome, por_tipo in self._categorias.values()
+                if tipos is None or not tipos.isdisjoint(por_tipo)
+            )
+            if not nomes:
+                return None
+            return RespostaIntencao("categoria", f"Trabalhamos com as categorias: {', '.join(nomes)}.")
+
+        # A categoria com mais termos citados é a mais específica
+        nome, por_tipo = self._categorias[max(citadas, key=len)]
+        grupos = [itens for tipo, itens in por_tipo.items() if tipos is None or tipo in tipos]
+        total = sum(len(itens) for itens in grupos)
+        if not total:
+            return None
+        primeiros = [item for itens in grupos for item in itens[:self.max_itens]][:self.max_itens]
+        linhas = [f"- {item.nome} ({formatar_preco(item.preco)})" for item in primeiros]
+        resposta = f"Em {nome}, temos:\n" + "\n".join(linhas)
+        if total > self.max_itens:
+            resposta += f"\nE mais {total - self.max_itens} itens."
+        return RespostaIntencao("categoria", resposta)
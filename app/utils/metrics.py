@@ -0,0 +1,221 @@
+# app/utils/metrics.py
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Limites padrão dos histogramas de latência, em segundos
+BUCKETS_LATENCIA = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _formatar_rotulos(rotulos):
+    pares = ",".join(f'{nome}="{_escapar(valor)}"' for nome, valor in rotulos)
+    return "{" + pares + "}" if pares else ""
+
+def _formatar_valor(valor):
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+class _Metrica:
+    """Base das métricas: nome, descrição, rótulos e séries indexadas pelos valores dos rótulos."""
+
+    tipo = None
+
+    def __init__(self, nome, ajuda, rotulos=()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _chave(self, rotulos):
+        return tuple(rotulos.get(nome, "") for nome in self.rotulos)
+
+    def _cabecalho(self):
+        return [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}"]
+
+class Contador(_Metrica):
+    """Valor que só cresce (eventos ocorridos)."""
+
+    tipo = "counter"
+
+    def inc(self, valor=1, **rotulos):
+        chave = self._chave(rotulos)
+        with self._lock:
+            self._series[chave] = self._series.get(chave, 0) + valor
+
+    def valor(self, **rotulos):
+        return self._series.get(self._chave(rotulos), 0)
+
+    def renderizar(self):
+        linhas = self._cabecalho()
+        with self._lock:
+            series = list(self._series.items())
+        for chave, valor in series:
+            linhas.append(f"{self.nome}{_formatar_rotulos(zip(self.rotulos, chave))} {_formatar_valor(valor)}")
+        return linhas
+
+class Medidor(Contador):
+    """Valor que sobe e desce (ex.: requisições em andamento)."""
+
+    tipo = "gauge"
+
+    def dec(self, valor=1, **rotulos):
+        self.inc(-valor, **rotulos)
+
+    def definir(self, valor, **rotulos):
+        with self._lock:
+            self._series[self._chave(rotulos)] = valor
+
+    @contextmanager
+    def acompanhar(self, **rotulos):
+        """Incrementa o medidor enquanto o bloco executa."""
+        self.inc(**rotulos)
+        try:
+            yield
+        finally:
+            self.dec(**rotulos)
+
+class Histograma(_Metrica):
+    """Distribuição de valores em faixas cumulativas, com soma e contagem."""
+
+    tipo = "histogram"
+
+    def __init__(self, nome, ajuda, rotulos=(), buckets=BUCKETS_LATENCIA):
+        super().__init__(nome, ajuda, rotulos)
+        self.buckets = tuple(sorted(buckets))
+
+    def observar(self, valor, **rotulos):
+        chave = self._chave(rotulos)
+        # Contagem por faixa (não cumulativa); o acumulado é calculado só na exportação
+        indice = bisect.bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            serie[0][indice] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def medir(self, **rotulos):
+        """Observa a duração do bloco (with), em segundos."""
+        return _Cronometro(self, rotulos)
+
+    def contagem(self, **rotulos):
+        serie = self._series.get(self._chave(rotulos))
+        return serie[2] if serie else 0
+
+    def renderizar(self):
+        linhas = self._cabecalho()
+        with self._lock:
+            series = [(chave, list(contagens), soma, total) for chave, (contagens, soma, total) in self._series.items()]
+        for chave, contagens, soma, total in series:
+            rotulos = list(zip(self.rotulos, chave))
+            acumulado = 0
+            for limite, quantidade in zip(self.buckets + (float("inf"),), contagens):
+                acumulado += quantidade
+                rotulos_bucket = _formatar_rotulos(rotulos + [("le", _formatar_valor(float(limite)))])
+                linhas.append(f"{self.nome}_bucket{rotulos_bucket} {acumulado}")
+            linhas.append(f"{self.nome}_sum{_formatar_rotulos(rotulos)} {_formatar_valor(soma)}")
+            linhas.append(f"{self.nome}_count{_formatar_rotulos(rotulos)} {total}")
+        return linhas
+
+class _Cronometro:
+    """Gerenciador de contexto leve usado por Histograma.medir."""
+
+    __slots__ = ("histograma", "rotulos", "inicio")
+
+    def __init__(self, histograma, rotulos):
+        self.histograma = histograma
+        self.rotulos = rotulos
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        self.histograma.observar(time.perf_counter() - self.inicio, **self.rotulos)
+        return False
+
+class RegistroMetricas:
+    """
+    Registro das métricas do processo, exportadas no formato texto do Prometheus.
+
+    A agregação é feita em memória, no próprio processo, com custo de um
+    dicionário e um bisect por observação. Coletores permitem exportar
+    estatísticas mantidas por outros componentes (caches, provedores) no
+    momento da leitura, sem instrumentá-los.
+    """
+
+    def __init__(self):
+        self._metricas = {}
+        self._coletores = {}
+        self._lock = threading.Lock()
+
+    def _registrar(self, classe, nome, *args, **kwargs):
+        with self._lock:
+            metrica = self._metricas.get(nome)
+            if metrica is None:
+                metrica = self._metricas[nome] = classe(nome, *args, **kwargs)
+            return metrica
+
+    def contador(self, nome, ajuda, rotulos=()):
+        return self._registrar(Contador, nome, ajuda, rotulos)
+
+    def medidor(self, nome, ajuda, rotulos=()):
+        return self._registrar(Medidor, nome, ajuda, rotulos)
+
+    def histograma(self, nome, ajuda, rotulos=(), buckets=BUCKETS_LATENCIA):
+        return self._registrar(Histograma, nome, ajuda, rotulos, buckets=buckets)
+
+    def registrar_coletor(self, nome, coletor):
+        """
+        Registra (ou substitui) uma função chamada a cada exportação.
+
+        A função deve retornar uma lista de (nome, tipo, ajuda, amostras), em que
+        amostras é uma lista de (dict de rótulos, valor).
+        """
+        with self._lock:
+            self._coletores[nome] = coletor
+
+    def renderizar(self) -> str:
+        """Exporta todas as métricas no formato texto do Prometheus."""
+        linhas = []
+        for metrica in list(self._metricas.values()):
+            linhas.extend(metrica.renderizar())
+        for coletor in list(self._coletores.values()):
+            for nome, tipo, ajuda, amostras in coletor():
+                linhas.append(f"# HELP {nome} {ajuda}")
+                linhas.append(f"# TYPE {nome} {tipo}")
+                for rotulos, valor in amostras:
+                    linhas.append(f"{nome}{_formatar_rotulos(sorted(rotulos.items()))} {_formatar_valor(valor)}")
+        return "\n".join(linhas) + "\n"
+
+# Registro compartilhado pelo processo
+metricas = RegistroMetricas()
+
+ETAPAS_CHAT = metricas.histograma(
+    "chat_etapa_segundos", "Duração de cada etapa do atendimento do chat.", ("etapa",)
+)
+RESPOSTAS_CHAT = metricas.contador(
+    "chat_respostas_total", "Respostas do chat por origem (cache, faq, intencao, catalogo, semantico, llm, generica, sobrecarga, erro).", ("origem",)
+)
+INTENCOES_CHAT = metricas.contador(
+    "chat_intencoes_total", "Respostas do motor de intenções por intenção (preco, estoque, categoria, contato, endereco).", ("intencao",)
+)
+CHAT_EM_ANDAMENTO = metricas.medidor(
+    "chat_requisicoes_em_andamento", "Requisições de chat sendo atendidas.", ("rota",)
+)
+PROVEDOR_SEGUNDOS = metricas.histograma(
+    "ia_provedor_segundos", "Duração das chamadas a cada provedor de IA.", ("provedor", "resultado")
+)
+PROVEDOR_EM_ANDAMENTO = metricas.medidor(
+    "ia_chamadas_em_andamento", "Chamadas em andamento a cada provedor de IA.", ("provedor",)
+)
+ERROS_DB = metricas.contador(
+    "db_erros_total", "Erros de banco de dados.", ("origem",)
+)
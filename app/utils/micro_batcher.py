@@ -0,0 +1,85 @@
+# app/utils/micro_batcher.py
+
+import asyncio
+import logging
+
+class MicroBatcher:
+    """
+    Agrupa chamadas concorrentes em lotes para uma função que processa listas.
+
+    Cada chamada a `submeter` entra em uma fila; um consumidor em segundo plano
+    junta os itens disponíveis (até `max_lote`, esperando no máximo `max_espera`
+    segundos por mais itens) e executa `processar_lote` uma única vez no
+    executor informado. Enquanto todos os workers estão ocupados, novos itens
+    se acumulam e formam lotes maiores.
+    """
+
+    def __init__(self, processar_lote, executor, max_lote=16, max_espera=0.002, concorrencia=1):
+        """
+        Args:
+            processar_lote (callable): Função lista -> lista de resultados, na mesma ordem.
+            executor (Executor): Executor onde os lotes são processados.
+            max_lote (int): Tamanho máximo de cada lote.
+            max_espera (float): Tempo máximo, em segundos, aguardando mais itens para o lote.
+            concorrencia (int): Número máximo de lotes processados ao mesmo tempo.
+        """
+        self.processar_lote = processar_lote
+        self.executor = executor
+        self.max_lote = max_lote
+        self.max_espera = max_espera
+        self.concorrencia = concorrencia
+        self._loop = None
+        self._fila = None
+        self._consumidor = None
+        self._semaforo = None
+        # O event loop guarda só referências fracas às tarefas: sem este conjunto,
+        # um lote em andamento poderia ser coletado e seus futuros nunca resolvidos
+        self._lotes = set()
+
+    def _iniciar(self, loop):
+        self._loop = loop
+        self._fila = asyncio.Queue()
+        self._semaforo = asyncio.Semaphore(self.concorrencia)
+        self._consumidor = loop.create_task(self._consumir())
+
+    async def submeter(self, item):
+        """Enfileira o item e aguarda o resultado do lote em que ele for processado."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._consumidor is None or self._consumidor.done():
+            self._iniciar(loop)
+        futuro = loop.create_future()
+        self._fila.put_nowait((item, futuro))
+        return await futuro
+
+    def _drenar(self, lote):
+        while len(lote) < self.max_lote and not self._fila.empty():
+            lote.append(self._fila.get_nowait())
+
+    async def _consumir(self):
+        while True:
+            # Só monta o próximo lote quando há worker livre para processá-lo
+            await self._semaforo.acquire()
+            lote = [await self._fila.get()]
+            self._drenar(lote)
+            if len(lote) < self.max_lote and self.max_espera > 0:
+                await asyncio.sleep(self.max_espera)
+                self._drenar(lote)
+            tarefa = self._loop.create_task(self._processar(lote))
+            self._lotes.add(tarefa)
+            tarefa.add_done_callback(self._lotes.discard)
+
+    async def _processar(self, lote):
+        try:
+            itens = [item for item, _ in lote]
+            resultados = await self._loop.run_in_executor(self.executor, self.processar_lote, itens)
+        except Exception as e:
+            logging.error(f"Erro ao processar lote de {len(lote)} itens: {e}")
+            for _, futuro in lote:
+                if not futuro.done():
+                    futuro.set_exception(e)
+        else:
+            for (_, futuro), resultado in zip(lote, resultados):
+                if not futuro.done():
+                    futuro.set_result(resultado)
+        finally:
+            self._semaforo.release()
@@ -0,0 +1,94 @@
+# app/utils/pagination.py
+
+import base64
+from sqlmodel import Session, select
+from app.config.settings import Configuration
+
+config = Configuration()
+
+def codificar_cursor(ultimo_id: int) -> str:
+    """Cursor opaco que aponta para o último item entregue."""
+    return base64.urlsafe_b64encode(str(ultimo_id).encode()).decode().rstrip("=")
+
+def decodificar_cursor(cursor: str) -> int:
+    """Recupera o id guardado no cursor; levanta ValueError se ele for inválido."""
+    try:
+        preenchimento = "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(cursor + preenchimento).decode())
+    except Exception:
+        raise ValueError("Cursor inválido.")
+
+def colunas(modelo, campos):
+    """Colunas pedidas na projeção (o id é sempre incluído, pois compõe o cursor)."""
+    nomes = [c.strip() for c in campos.split(",") if c.strip()]
+    invalidos = [nome for nome in nomes if nome not in modelo.__table__.columns]
+    if invalidos:
+        raise ValueError(f"Campos inválidos: {', '.join(invalidos)}")
+    if "id" not in nomes:
+        nomes.insert(0, "id")
+    return [getattr(modelo, nome) for nome in nomes]
+
+def filtrar(consulta, modelo, categoria=None, empresa_id=None, preco_min=None, preco_max=None):
+    """Aplica os filtros opcionais da listagem (categoria, empresa e faixa de preço)."""
+    if categoria is not None:
+        consulta = consulta.where(modelo.categoria == categoria)
+    if empresa_id is not None:
+        consulta = consulta.where(modelo.empresa_id == empresa_id)
+    if preco_min is not None:
+        consulta = consulta.where(modelo.preco >= preco_min)
+    if preco_max is not None:
+        consulta = consulta.where(modelo.preco <= preco_max)
+    return consulta
+
+def _consultar_pagina(modelo, cursor, limite, campos, filtros):
+    """Monta a consulta da página; retorna (consulta, limite efetivo, projeção)."""
+    limite = min(limite or config.page_size_default, config.page_size_max)
+    projecao = colunas(modelo, campos) if campos else None
+    consulta = select(*projecao) if projecao else select(modelo)
+
+    if cursor:
+        consulta = consulta.where(modelo.id > decodificar_cursor(cursor))
+    consulta = filtrar(consulta, modelo, **filtros)
+
+    # Um item a mais indica se existe próxima página
+    return consulta.order_by(modelo.id).limit(limite + 1), limite, projecao
+
+def _montar_pagina(linhas, limite, projecao):
+    proximo = None
+    if len(linhas) > limite:
+        linhas = linhas[:limite]
+        proximo = codificar_cursor(linhas[-1].id)
+
+    itens = [dict(linha._mapping) for linha in linhas] if projecao else linhas
+    return {"itens": itens, "proximo_cursor": proximo}
+
+def paginar(session: Session, modelo, cursor=None, limite=None, campos=None, **filtros) -> dict:
+    """
+    Lista os itens de um modelo com paginação por cursor (keyset).
+
+    Em vez de OFFSET, a consulta continua a partir do último id entregue
+    (WHERE id > cursor ORDER BY id), de modo que o custo de cada página não
+    cresce com a posição na lista. Os filtros usam os índices de categoria,
+    empresa_id e preco.
+
+    Args:
+        session (Session): Sessão do banco.
+        modelo: Classe da tabela (Produto ou Servico).
+        cursor (str): Valor de `proximo_cursor` da página anterior.
+        limite (int): Itens por página (limitado a PAGE_SIZE_MAX).
+        campos (str): Projeção opcional, separada por vírgulas (ex.: "nome,preco,codigo").
+        **filtros: categoria, empresa_id, preco_min e preco_max (ver `filtrar`).
+
+    Returns:
+        dict: `itens` da página e `proximo_cursor` (None na última página).
+
+    Raises:
+        ValueError: Cursor ou campos inválidos.
+    """
+    consulta, limite, projecao = _consultar_pagina(modelo, cursor, limite, campos, filtros)
+    return _montar_pagina(session.exec(consulta).all(), limite, projecao)
+
+async def apaginar(session, modelo, cursor=None, limite=None, campos=None, **filtros) -> dict:
+    """Versão assíncrona de paginar, para sessões AsyncSession."""
+    consulta, limite, projecao = _consultar_pagina(modelo, cursor, limite, campos, filtros)
+    return _montar_pagina((await session.exec(consulta)).all(), limite, projecao)
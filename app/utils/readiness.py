@@ -0,0 +1,139 @@
+# app/utils/readiness.py
+
+import asyncio
+import logging
+import threading
+import time
+
+class Prontidao:
+    """
+    Componentes carregados em segundo plano na subida da aplicação.
+
+    Cada componente registra uma função assíncrona de carga (modelo spaCy,
+    provedor de IA, catálogo). O hook de startup dispara todas sem esperar, de
+    modo que o processo aceita conexões imediatamente; a rota de prontidão só
+    responde "pronto" quando todas terminam. Quem precisa de um componente
+    antes disso aguarda a mesma carga, que é executada uma única vez (e
+    repetida na próxima espera, se tiver falhado).
+
+    Componentes com carga síncrona também podem ser carregados no processo
+    principal antes do fork dos workers (ver servidor.py); os workers já
+    nascem prontos e compartilham essas páginas de memória.
+    """
+
+    PENDENTE = "pendente"
+    CARREGANDO = "carregando"
+    PRONTO = "pronto"
+    ERRO = "erro"
+
+    def __init__(self):
+        self._cargas = {}
+        self._precargas = {}
+        self._estado = {}
+        self._tarefas = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, nome, carregar, precarregar=None):
+        """
+        Registra um componente.
+
+        Args:
+            nome (str): Nome exibido na rota de prontidão.
+            carregar (callable): Função assíncrona, sem argumentos, que carrega o componente.
+            precarregar (callable): Versão síncrona opcional, usada por precarregar().
+        """
+        with self._lock:
+            self._cargas[nome] = carregar
+            self._precargas[nome] = precarregar
+            self._estado[nome] = {"estado": self.PENDENTE}
+            self._tarefas.pop(nome, None)
+
+    def _tarefa(self, nome):
+        """Retorna a carga em andamento (ou concluída) do componente, disparando-a se preciso."""
+        with self._lock:
+            tarefa = self._tarefas.get(nome)
+            if tarefa is not None:
+                if not tarefa.done():
+                    # Cargas iniciadas em outro event loop (já encerrado) não podem ser aguardadas
+                    if tarefa.get_loop() is asyncio.get_running_loop():
+                        return tarefa
+                elif not tarefa.cancelled() and tarefa.exception() is None:
+                    return tarefa
+            tarefa = asyncio.ensure_future(self._carregar(nome))
+            self._tarefas[nome] = tarefa
+            return tarefa
+
+    async def _carregar(self, nome):
+        self._estado[nome] = {"estado": self.CARREGANDO}
+        inicio = time.perf_counter()
+        try:
+            await self._cargas[nome]()
+        except Exception as e:
+            logging.error(f"Falha ao carregar {nome}: {e}")
+            self._estado[nome] = {"estado": self.ERRO, "erro": str(e)}
+            raise
+        segundos = time.perf_counter() - inicio
+        self._estado[nome] = {"estado": self.PRONTO, "segundos": round(segundos, 3)}
+        logging.info(f"Componente {nome} carregado em {segundos:.2f}s.")
+
+    def precarregar(self):
+        """
+        Carrega, de forma síncrona e no processo atual, os componentes que têm
+        carga síncrona; os demais continuam para o hook de startup.
+        """
+        for nome, precarregar in list(self._precargas.items()):
+            if precarregar is None or self._carregado(nome):
+                continue
+            inicio = time.perf_counter()
+            precarregar()
+            segundos = time.perf_counter() - inicio
+            self._estado[nome] = {"estado": self.PRONTO, "segundos": round(segundos, 3), "precarregado": True}
+            logging.info(f"Componente {nome} pré-carregado em {segundos:.2f}s.")
+
+    def _carregado(self, nome):
+        return self._estado[nome]["estado"] == self.PRONTO and nome not in self._tarefas
+
+    def iniciar(self):
+        """Dispara a carga de todos os componentes sem aguardá-las (hook de startup)."""
+        for nome in list(self._cargas):
+            if self._carregado(nome):
+                continue
+            tarefa = self._tarefa(nome)
+            # A falha fica registrada no estado; evita o aviso de exceção não lida
+            tarefa.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def aguardar(self, nome):
+        """
+        Aguarda a carga do componente, disparando-a se ainda não tiver começado.
+
+        Raises:
+            Exception: O erro da carga, se ela falhar.
+        """
+        if self._carregado(nome):
+            return
+        tarefa = self._tarefa(nome)
+        if tarefa.done():
+            tarefa.result()
+            return
+        # shield: o cancelamento de uma requisição não interrompe a carga compartilhada
+        await asyncio.shield(tarefa)
+
+    async def encerrar(self):
+        """Cancela as cargas ainda em andamento (encerramento da aplicação)."""
+        with self._lock:
+            pendentes = [t for t in self._tarefas.values() if not t.done()]
+            self._tarefas.clear()
+        for tarefa in pendentes:
+            tarefa.cancel()
+        await asyncio.gather(*pendentes, return_exceptions=True)
+
+    @property
+    def pronto(self):
+        return all(estado["estado"] == self.PRONTO for estado in self._estado.values())
+
+    def estado(self):
+        """Estado de cada componente: pendente, carregando, pronto (com a duração) ou erro."""
+        return {nome: dict(estado) for nome, estado in self._estado.items()}
+
+# Instância compartilhada entre a aplicação e os roteadores
+prontidao = Prontidao()
@@ -1,31 +1,140 @@
 # app/utils/redis_utils.py
 
 from app.config.settings import Configuration
+from app.utils.text_utils import tokenizar
+import hashlib
 import logging
+import threading
+from cachetools import TTLCache
 from redis.exceptions import RedisError
 
 class RedisCache:
+    """
+    Cache de respostas em duas camadas: um LRU com TTL em memória, na frente do Redis.
+
+    As chaves são derivadas do texto normalizado da mensagem (sem acentos,
+    pontuação ou diferença de maiúsculas), resumido em um hash e prefixado com
+    o namespace, a empresa e a versão do catálogo, de modo que alterações no
+    catálogo invalidam respostas antigas e cada empresa tem o seu espaço de chaves.
+    """
+
     def __init__(self):
         self.config = Configuration()
         self.redis_client = self.config.get_redis_client()
+        self.async_redis_client = self.config.get_async_redis_client()
+        self.memoria = TTLCache(maxsize=self.config.cache_memory_max_items, ttl=self.config.cache_memory_ttl)
+        self._lock = threading.Lock()
+        self.estatisticas = {
+            "memoria": {"hits": 0, "misses": 0},
+            "redis": {"hits": 0, "misses": 0, "erros": 0},
+        }
+
+    def namespace(self, empresa_id: int = None) -> str:
+        """Prefixo das chaves da empresa ("<namespace>:e<empresa_id>"), ou o global sem empresa."""
+        if empresa_id is None:
+            return self.config.cache_namespace
+        return f"{self.config.cache_namespace}:e{empresa_id}"
+
+    def montar_chave(self, message: str, versao: str = None, empresa_id: int = None) -> str:
+        """
+        Monta a chave canônica do cache para a mensagem.
+
+        Args:
+            message (str): Mensagem do usuário.
+            versao (str): Versão do catálogo usada para gerar a resposta.
+            empresa_id (int): Empresa dona do catálogo, quando houver.
+
+        Returns:
+            str: Chave no formato "<namespace>[:e<empresa_id>]:<versao>:<hash>".
+        """
+        texto = " ".join(tokenizar(message))
+        resumo = hashlib.blake2b(texto.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{self.namespace(empresa_id)}:{versao or '0'}:{resumo}"
+
+    def _contar(self, camada: str, evento: str):
+        with self._lock:
+            self.estatisticas[camada][evento] += 1
+
+    def _get_memoria(self, chave: str):
+        with self._lock:
+            resposta = self.memoria.get(chave)
+        self._contar("memoria", "hits" if resposta is not None else "misses")
+        return resposta
+
+    def _set_memoria(self, chave: str, response: str):
+        with self._lock:
+            self.memoria[chave] = response
+
+    def get_cached_response(self, message: str, versao: str = None, empresa_id: int = None):
+        chave = self.montar_chave(message, versao, empresa_id)
+        resposta = self._get_memoria(chave)
+        if resposta is not None:
+            logging.info("Resposta retornada do cache em memória.")
+            return resposta
+
+        try:
+            cached_response = self.redis_client.get(chave)
+
+            if cached_response:
+                logging.info("Resposta retornada do cache do Redis.")
+                self._contar("redis", "hits")
+                resposta = cached_response.decode("utf-8") if isinstance(cached_response, bytes) else cached_response
+                self._set_memoria(chave, resposta)
+                return resposta
+            self._contar("redis", "misses")
+            return None
+
+        except RedisError as e:
+            logging.error(f"Erro ao tentar acessar o Redis: {e}")
+            self._contar("redis", "erros")
+            return None
+
+    def cache_response(self, message: str, response: str, expiration: int = 3600, versao: str = None,
+                       empresa_id: int = None):
+        chave = self.montar_chave(message, versao, empresa_id)
+        self._set_memoria(chave, response)
+        try:
+            self.redis_client.setex(chave, expiration, response)
+            logging.info("Resposta armazenada no cache do Redis.")
+
+        except RedisError as e:
+            logging.error(f"Erro ao tentar armazenar no Redis: {e}")
+            self._contar("redis", "erros")
+
+    async def aget_cached_response(self, message: str, versao: str = None, empresa_id: int = None):
+        """Versão assíncrona de get_cached_response, sem bloquear o event loop."""
+        chave = self.montar_chave(message, versao, empresa_id)
+        resposta = self._get_memoria(chave)
+        if resposta is not None:
+            logging.info("Resposta retornada do cache em memória.")
+            return resposta
 
-    def get_cached_response(self, message: str):
         try:
-            cached_response = self.redis_client.get(message)
+            cached_response = await self.async_redis_client.get(chave)
 
             if cached_response:
                 logging.info("Resposta retornada do cache do Redis.")
-                return cached_response.decode("utf-8") if isinstance(cached_response, bytes) else cached_response
+                self._contar("redis", "hits")
+                resposta = cached_response.decode("utf-8") if isinstance(cached_response, bytes) else cached_response
+                self._set_memoria(chave, resposta)
+                return resposta
+            self._contar("redis", "misses")
             return None
 
         except RedisError as e:
             logging.error(f"Erro ao tentar acessar o Redis: {e}")
+            self._contar("redis", "erros")
             return None
 
-    def cache_response(self, message: str, response: str, expiration: int = 3600):
+    async def acache_response(self, message: str, response: str, expiration: int = 3600, versao: str = None,
+                              empresa_id: int = None):
+        """Versão assíncrona de cache_response, sem bloquear o event loop."""
+        chave = self.montar_chave(message, versao, empresa_id)
+        self._set_memoria(chave, response)
         try:
-            self.redis_client.setex(message, expiration, response)
+            await self.async_redis_client.setex(chave, expiration, response)
             logging.info("Resposta armazenada no cache do Redis.")
 
         except RedisError as e:
             logging.error(f"Erro ao tentar armazenar no Redis: {e}")
+            self._contar("redis", "erros")
@@ -0,0 +1,115 @@
+# app/utils/semantic_cache.py
+
+import time
+import logging
+import threading
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+from app.config.settings import Configuration
+from app.utils.spacy_utils import normalizar_vetor
+
+config = Configuration()
+
+class SemanticCache:
+    """
+    Cache de respostas por similaridade entre perguntas.
+
+    Os vetores (normalizados) das perguntas já respondidas pela IA ficam em uma
+    única matriz NumPy; a busca é um produto matriz-vetor seguido de argmax.
+    Quando a similaridade de cosseno passa do limiar, a resposta armazenada é
+    reutilizada. Ao atingir a capacidade, a entrada usada há mais tempo é
+    substituída. Entradas de outra versão do catálogo são descartadas.
+    """
+
+    def __init__(self, limiar=None, max_entradas=None, max_mb=None, embedder=None, estatisticas=None):
+        """
+        Args:
+            limiar (float): Similaridade mínima (cosseno) para considerar as perguntas equivalentes.
+            max_entradas (int): Número máximo de perguntas armazenadas.
+            max_mb (float): Memória máxima, em MB, ocupada pela matriz de vetores.
+            embedder (callable): Função texto -> vetor. Se omitida, usa o vetor calculado pelo spaCy.
+            estatisticas (dict): Contadores de hits e misses, para somar vários caches (um por empresa).
+        """
+        self.limiar = config.semantic_cache_threshold if limiar is None else limiar
+        self.max_entradas = config.semantic_cache_max_entries if max_entradas is None else max_entradas
+        self.max_mb = config.semantic_cache_max_mb if max_mb is None else max_mb
+        self.embedder = embedder
+        self.versao = None
+        self._vetores = None
+        self._respostas = []
+        self._ultimo_uso = None
+        self._tamanho = 0
+        self._lock = threading.Lock()
+        self.estatisticas = {"hits": 0, "misses": 0} if estatisticas is None else estatisticas
+
+    def __len__(self):
+        return self._tamanho
+
+    async def avetorizar(self, texto, vetor_padrao=None):
+        """
+        Retorna o vetor da pergunta: do embedder configurado ou, na falta dele, o vetor já calculado.
+        """
+        if self.embedder is None:
+            return vetor_padrao
+        return normalizar_vetor(await run_in_threadpool(self.embedder, texto))
+
+    def _reiniciar(self, dimensao, versao):
+        capacidade = int(self.max_mb * 1024 * 1024 // (dimensao * 4))
+        capacidade = max(1, min(self.max_entradas, capacidade))
+        self._vetores = np.zeros((capacidade, dimensao), dtype=np.float32)
+        self._respostas = [None] * capacidade
+        self._ultimo_uso = np.zeros(capacidade, dtype=np.float64)
+        self._tamanho = 0
+        self.versao = versao
+
+    def buscar(self, vetor, versao=None):
+        """
+        Procura uma pergunta suficientemente parecida já respondida.
+
+        Args:
+            vetor (np.ndarray): Vetor normalizado da pergunta.
+            versao (str): Versão do catálogo atual.
+
+        Returns:
+            str | None: Resposta armazenada, ou None se não houver pergunta similar.
+        """
+        with self._lock:
+            if vetor is None or not self._tamanho or versao != self.versao or vetor.shape[0] != self._vetores.shape[1]:
+                self.estatisticas["misses"] += 1
+                return None
+
+            similaridades = self._vetores[:self._tamanho] @ vetor
+            indice = int(np.argmax(similaridades))
+            if similaridades[indice] < self.limiar:
+                self.estatisticas["misses"] += 1
+                return None
+
+            self._ultimo_uso[indice] = time.monotonic()
+            self.estatisticas["hits"] += 1
+            logging.info(f"Resposta retornada do cache semântico (similaridade {similaridades[indice]:.3f}).")
+            return self._respostas[indice]
+
+    def adicionar(self, vetor, resposta, versao=None):
+        """
+        Armazena a resposta da pergunta, substituindo a entrada menos usada se o cache estiver cheio.
+
+        Args:
+            vetor (np.ndarray): Vetor normalizado da pergunta.
+            resposta (str): Resposta a ser reutilizada.
+            versao (str): Versão do catálogo usada para gerar a resposta.
+        """
+        if vetor is None:
+            return
+        with self._lock:
+            if self._vetores is None or versao != self.versao or vetor.shape[0] != self._vetores.shape[1]:
+                self._reiniciar(vetor.shape[0], versao)
+
+            if self._tamanho < len(self._respostas):
+                indice = self._tamanho
+                self._tamanho += 1
+            else:
+                indice = int(np.argmin(self._ultimo_uso))
+
+            self._vetores[indice] = vetor
+            self._respostas[indice] = resposta
+            self._ultimo_uso[indice] = time.monotonic()
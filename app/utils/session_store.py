@@ -0,0 +1,150 @@
+# app/utils/session_store.py
+
+import logging
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Tuple
+from redis.exceptions import RedisError
+from app.config.settings import Configuration
+
+config = Configuration()
+
+# Separa pergunta e resposta dentro do registro do turno (não aparece em texto digitado)
+SEPARADOR = "\x1f"
+# Primeiro byte do registro: texto puro ou comprimido com zlib
+TEXTO = b"t"
+COMPRIMIDO = b"z"
+
+@dataclass(frozen=True, slots=True)
+class HistoricoSessao:
+    """Conversa anterior enviada à IA: resumo dos turnos antigos e os turnos recentes, em ordem."""
+    resumo: str = ""
+    turnos: Tuple[Tuple[str, str], ...] = ()
+
+    def __bool__(self):
+        return bool(self.resumo or self.turnos)
+
+def _truncar(texto, limite):
+    texto = " ".join(texto.split())
+    return texto if len(texto) <= limite else texto[:limite - 3].rstrip() + "..."
+
+def codificar_turno(pergunta, resposta, max_caracteres=None, comprimir_acima=None) -> bytes:
+    """
+    Codifica um turno em um registro compacto: um byte de tipo seguido do texto
+    "pergunta<US>resposta" em UTF-8, comprimido com zlib quando passa do limite.
+    """
+    max_caracteres = config.session_max_chars if max_caracteres is None else max_caracteres
+    comprimir_acima = config.session_compress_min_bytes if comprimir_acima is None else comprimir_acima
+    texto = (
+        _truncar(pergunta.replace(SEPARADOR, " "), max_caracteres) + SEPARADOR +
+        _truncar(resposta.replace(SEPARADOR, " "), max_caracteres)
+    ).encode("utf-8")
+    if len(texto) >= comprimir_acima:
+        comprimido = zlib.compress(texto, 6)
+        if len(comprimido) < len(texto):
+            return COMPRIMIDO + comprimido
+    return TEXTO + texto
+
+def decodificar_turno(registro: bytes) -> Tuple[str, str]:
+    """Inverso de codificar_turno."""
+    tipo, dados = registro[:1], registro[1:]
+    if tipo == COMPRIMIDO:
+        dados = zlib.decompress(dados)
+    pergunta, _, resposta = dados.decode("utf-8").partition(SEPARADOR)
+    return pergunta, resposta
+
+class SessionStore:
+    """
+    Histórico das conversas no Redis, com um registro compacto por turno.
+
+    Cada sessão é uma lista do Redis ("<namespace>[:e<empresa>]:sessao:<id>")
+    com um item por turno (ver codificar_turno). Gravar um turno é um único
+    round trip: RPUSH, LTRIM (mantém os SESSION_MAX_TURNS mais recentes) e
+    EXPIRE (SESSION_TTL a partir da última mensagem) na mesma transação.
+    Ao carregar, os SESSION_WINDOW_TURNS turnos mais recentes seguem inteiros
+    e os anteriores viram um resumo curto com as perguntas já feitas.
+
+    Se o Redis estiver indisponível, a conversa segue sem histórico.
+    """
+
+    def __init__(self, redis_client=None, namespace=None, ttl=None, max_turnos=None, janela=None, max_resumo=None):
+        """
+        Args:
+            redis_client: Cliente Redis assíncrono que retorna bytes (decode_responses=False).
+            namespace (callable): empresa_id -> prefixo das chaves (ex.: RedisCache.namespace).
+            ttl (int): Segundos sem mensagens até a sessão expirar.
+            max_turnos (int): Turnos guardados por sessão.
+            janela (int): Turnos recentes enviados inteiros à IA.
+            max_resumo (int): Tamanho máximo, em caracteres, do resumo dos turnos anteriores.
+        """
+        self.redis_client = redis_client or config.get_async_redis_client(decode_responses=False)
+        self.namespace = namespace or (lambda empresa_id: config.cache_namespace)
+        self.ttl = config.session_ttl if ttl is None else ttl
+        self.max_turnos = config.session_max_turns if max_turnos is None else max_turnos
+        self.janela = config.session_window_turns if janela is None else janela
+        self.max_resumo = config.session_summary_max_chars if max_resumo is None else max_resumo
+        self._lock = threading.Lock()
+        self.estatisticas = {"leituras": 0, "gravacoes": 0, "erros": 0}
+
+    def _contar(self, evento):
+        with self._lock:
+            self.estatisticas[evento] += 1
+
+    def chave(self, sessao_id: str, empresa_id: int = None) -> str:
+        return f"{self.namespace(empresa_id)}:sessao:{sessao_id}"
+
+    def resumir(self, turnos) -> str:
+        """Resumo extrativo dos turnos antigos: as perguntas mais recentes que couberem no limite."""
+        perguntas, tamanho = [], 0
+        for pergunta, _ in reversed(turnos):
+            if tamanho + len(pergunta) + 2 > self.max_resumo:
+                break
+            perguntas.append(pergunta)
+            tamanho += len(pergunta) + 2
+        if not perguntas:
+            return ""
+        return "O cliente já perguntou: " + "; ".join(reversed(perguntas)) + "."
+
+    async def carregar(self, sessao_id: str, empresa_id: int = None) -> HistoricoSessao:
+        """
+        Lê o histórico da sessão.
+
+        Returns:
+            HistoricoSessao: Vazio para sessões novas, expiradas ou se o Redis falhar.
+        """
+        try:
+            registros = await self.redis_client.lrange(self.chave(sessao_id, empresa_id), 0, -1)
+        except RedisError as e:
+            logging.error(f"Erro ao ler a sessão no Redis: {e}")
+            self._contar("erros")
+            return HistoricoSessao()
+        self._contar("leituras")
+        turnos = [decodificar_turno(registro) for registro in registros]
+        if self.janela <= 0:
+            return HistoricoSessao(self.resumir(turnos), ())
+        recentes, antigos = turnos[-self.janela:], turnos[:-self.janela]
+        return HistoricoSessao(self.resumir(antigos), tuple(recentes))
+
+    async def registrar(self, sessao_id: str, pergunta: str, resposta: str, empresa_id: int = None):
+        """Acrescenta o turno à sessão, descarta os mais antigos e renova a expiração."""
+        chave = self.chave(sessao_id, empresa_id)
+        try:
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.rpush(chave, codificar_turno(pergunta, resposta))
+                pipe.ltrim(chave, -self.max_turnos, -1)
+                pipe.expire(chave, self.ttl)
+                await pipe.execute()
+        except RedisError as e:
+            logging.error(f"Erro ao gravar a sessão no Redis: {e}")
+            self._contar("erros")
+            return
+        self._contar("gravacoes")
+
+    async def apagar(self, sessao_id: str, empresa_id: int = None):
+        """Encerra a sessão, apagando o histórico."""
+        try:
+            await self.redis_client.delete(self.chave(sessao_id, empresa_id))
+        except RedisError as e:
+            logging.error(f"Erro ao apagar a sessão no Redis: {e}")
+            self._contar("erros")
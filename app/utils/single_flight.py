@@ -0,0 +1,151 @@
+# app/utils/single_flight.py
+
+import asyncio
+import logging
+import uuid
+from redis.exceptions import RedisError
+from app.config.settings import Configuration
+
+config = Configuration()
+
+# Remove a trava apenas se ela ainda pertencer a quem a criou
+_LIBERAR_TRAVA = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+class SingleFlight:
+    """
+    Deduplicação de chamadas idênticas em andamento ("single-flight").
+
+    Dentro do processo, chamadas simultâneas com a mesma chave aguardam o
+    resultado de uma única execução. Entre processos (workers), a execução é
+    protegida por uma trava no Redis: quem não obtém a trava aguarda o
+    resultado aparecer no cache e só executa por conta própria se a trava
+    expirar ou for liberada sem resultado.
+    """
+
+    def __init__(self, redis_client=None, lock_ttl=None, intervalo_espera=None):
+        """
+        Args:
+            redis_client: Cliente Redis assíncrono usado para a trava distribuída (None desativa).
+            lock_ttl (float): Validade da trava, em segundos.
+            intervalo_espera (float): Intervalo, em segundos, entre consultas ao cache enquanto aguarda.
+        """
+        self.redis_client = redis_client
+        self.lock_ttl = config.single_flight_lock_ttl if lock_ttl is None else lock_ttl
+        self.intervalo_espera = config.single_flight_poll_ms / 1000 if intervalo_espera is None else intervalo_espera
+        self._em_andamento = {}
+        self.estatisticas = {"execucoes": 0, "seguidores_locais": 0, "seguidores_redis": 0}
+
+    def __len__(self):
+        return len(self._em_andamento)
+
+    def iniciar(self, chave):
+        """
+        Registra uma execução manual (por exemplo, um stream) para a chave.
+
+        Returns:
+            tuple: (futuro, lider). Se `lider` for True, quem chamou deve executar e
+            chamar `concluir`; caso contrário, basta aguardar `futuro`.
+        """
+        existente = self._em_andamento.get(chave)
+        if existente is not None:
+            self.estatisticas["seguidores_locais"] += 1
+            return asyncio.shield(existente), False
+
+        futuro = asyncio.get_running_loop().create_future()
+        self._em_andamento[chave] = futuro
+        self.estatisticas["execucoes"] += 1
+        return futuro, True
+
+    def concluir(self, chave, resultado=None, erro=None):
+        """Finaliza a execução registrada com `iniciar`, liberando quem a aguardava."""
+        futuro = self._em_andamento.pop(chave, None)
+        if futuro is None or futuro.done():
+            return
+        if erro is not None:
+            futuro.set_exception(erro)
+            # Evita o aviso de exceção não consumida quando ninguém aguardava
+            futuro.exception()
+        else:
+            futuro.set_result(resultado)
+
+    async def executar(self, chave, produzir, consultar_cache=None):
+        """
+        Executa `produzir` uma única vez por chave, compartilhando o resultado.
+
+        Args:
+            chave (str): Identificador da chamada (por exemplo, a chave do cache).
+            produzir (callable): Corrotina sem argumentos que calcula o resultado e o
+                armazena no cache antes de retornar.
+            consultar_cache (callable): Corrotina sem argumentos que lê o resultado do cache;
+                usada para aguardar a execução de outro worker.
+
+        Returns:
+            O resultado de `produzir` (desta ou de outra execução).
+        """
+        existente = self._em_andamento.get(chave)
+        if existente is not None:
+            self.estatisticas["seguidores_locais"] += 1
+            logging.info("Pergunta idêntica em andamento: aguardando a mesma resposta.")
+            return await asyncio.shield(existente)
+
+        tarefa = asyncio.ensure_future(self._executar_lider(chave, produzir, consultar_cache))
+        self._em_andamento[chave] = tarefa
+        tarefa.add_done_callback(lambda _: self._remover(chave, tarefa))
+        # O shield mantém a execução viva para os seguidores mesmo se este cliente desconectar
+        return await asyncio.shield(tarefa)
+
+    def _remover(self, chave, tarefa):
+        if self._em_andamento.get(chave) is tarefa:
+            del self._em_andamento[chave]
+
+    async def _executar_lider(self, chave, produzir, consultar_cache):
+        if self.redis_client is None or consultar_cache is None:
+            self.estatisticas["execucoes"] += 1
+            return await produzir()
+
+        chave_trava = f"lock:{chave}"
+        token = uuid.uuid4().hex
+        try:
+            adquirida = await self.redis_client.set(chave_trava, token, nx=True, px=int(self.lock_ttl * 1000))
+        except RedisError as e:
+            logging.error(f"Erro ao obter trava no Redis, executando sem coordenação: {e}")
+            adquirida = None
+
+        if adquirida or adquirida is None:
+            self.estatisticas["execucoes"] += 1
+            try:
+                return await produzir()
+            finally:
+                if adquirida:
+                    await self._liberar(chave_trava, token)
+
+        # Outro worker está calculando a mesma resposta: aguarda o cache
+        self.estatisticas["seguidores_redis"] += 1
+        logging.info("Pergunta idêntica em andamento em outro worker: aguardando o cache.")
+        loop = asyncio.get_running_loop()
+        prazo = loop.time() + self.lock_ttl
+        while loop.time() < prazo:
+            await asyncio.sleep(self.intervalo_espera)
+            resultado = await consultar_cache()
+            if resultado:
+                return resultado
+            try:
+                if not await self.redis_client.exists(chave_trava):
+                    break
+            except RedisError:
+                break
+
+        # A trava expirou ou foi liberada sem resultado: calcula localmente
+        self.estatisticas["execucoes"] += 1
+        return await produzir()
+
+    async def _liberar(self, chave_trava, token):
+        try:
+            await self.redis_client.eval(_LIBERAR_TRAVA, 1, chave_trava, token)
+        except RedisError as e:
+            logging.error(f"Erro ao liberar trava no Redis: {e}")
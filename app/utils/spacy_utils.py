@@ -1,32 +1,102 @@
 # app/utils/spacy_utils.py
 
-import spacy
+import asyncio
 import logging
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+from app.config.settings import Configuration
+from app.utils.micro_batcher import MicroBatcher
 from app.exceptions.spacy_error import SpacyModelLoadError, SpacyProcessingError
 
+config = Configuration()
+
+# Mapeia variações usadas pelos clientes para o termo usado no catálogo
+SINONIMOS = {
+    "celular": "smartphone",
+    "camisa": "camiseta",
+    "telefone": "smartphone",
+    "computador": "notebook",
+    "laptop": "notebook",
+    "pc": "notebook",
+    "tv": "televisão"
+}
+
+@dataclass(frozen=True)
+class AnaliseMensagem:
+    """Resultado do processamento de uma mensagem pelo spaCy."""
+    palavras_chave: List[str]
+    vetor: Optional[np.ndarray] = None
+
+def normalizar_vetor(vetor):
+    """Retorna o vetor com norma 1 em float32, ou None se ele for vazio ou nulo."""
+    if vetor is None or not vetor.size:
+        return None
+    vetor = np.asarray(vetor, dtype=np.float32)
+    norma = float(np.linalg.norm(vetor))
+    return vetor / norma if norma > 0 else None
+
 class SpacyProcessor:
-    def __init__(self, modelo="pt_core_news_sm"):
+    def __init__(self, modelo="pt_core_news_sm", max_workers=None, exclude=None):
         """
         Inicializa o processador spaCy.
 
         Args:
             modelo (str): Nome do modelo spaCy a ser carregado.
+            max_workers (int): Número máximo de threads usadas por aprocessar_mensagem.
+            exclude (list): Componentes do pipeline que não serão carregados.
         """
+        # Importado aqui: o spaCy leva quase um segundo para importar e só é preciso ao carregar o modelo
+        import spacy
+
+        exclude = config.spacy_exclude if exclude is None else exclude
         try:
-            self.nlp = spacy.load(modelo)
+            # Só POS e lemas são usados: parser e NER não são carregados
+            self.nlp = spacy.load(modelo, exclude=exclude)
         except OSError as e:
             logging.error(f"Erro ao carregar o modelo spaCy: {e}")
             raise SpacyModelLoadError(f"Não foi possível carregar o modelo spaCy '{modelo}': {e}")
 
-        self.SINONIMOS = {
-            "celular": "smartphone",
-            "camisa": "camiseta",
-            "telefone": "smartphone",
-            "computador": "notebook",
-            "laptop": "notebook",
-            "pc": "notebook",
-            "tv": "televisão"
-        }
+        self.SINONIMOS = SINONIMOS
+
+        # Executor limitado: o processamento é CPU-bound e não deve rodar no event loop
+        max_workers = max_workers or config.nlp_max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="spacy")
+        logging.info(f"Modelo spaCy '{modelo}' carregado com os componentes: {self.nlp.pipe_names}")
+
+        # Mensagens concorrentes são agrupadas em lotes processados com nlp.pipe
+        self.batcher = None
+        if config.nlp_batch_size > 1:
+            self.batcher = MicroBatcher(
+                self.analisar_lote,
+                self.executor,
+                max_lote=config.nlp_batch_size,
+                max_espera=config.nlp_batch_wait_ms / 1000,
+                concorrencia=max_workers
+            )
+
+    def _verificar_modelo(self):
+        if self.nlp is None:
+            logging.error("Modelo spaCy não carregado. Não é possível processar a mensagem.")
+            raise SpacyModelLoadError("Modelo spaCy não carregado.")
+
+    def _extrair_palavras_chave(self, doc):
+        """Extrai substantivos e nomes próprios relevantes de um documento já processado."""
+        palavras_chave = []
+        palavras_irrelevantes = ["preciso", "quero", "gostaria", "de", "estou", "vou", "em", "para", "a", "o", "na", "nao"]
+        substantivos_irrelevantes = ["casa", "ontem", "hoje"]
+
+        for token in doc:
+            # Otimização: Verificação de POS e lematização em uma única iteração
+            if token.pos_ in ["NOUN", "PROPN"]:
+                lemma = token.lemma_.lower()  # Lematização para reduzir variações
+                palavra_normalizada = self.SINONIMOS.get(lemma, token.text) # normalização com lema ou palavra original
+                if (palavra_normalizada.lower() not in palavras_irrelevantes and
+                    palavra_normalizada.lower() not in substantivos_irrelevantes):
+                    palavras_chave.append(palavra_normalizada)
+
+        return palavras_chave
 
     def processar_mensagem(self, mensagem):
         """
@@ -38,26 +108,94 @@ class SpacyProcessor:
         Returns:
             list: Lista de palavras-chave extraídas.
         """
-        if self.nlp is None:
-            logging.error("Modelo spaCy não carregado. Não é possível processar a mensagem.")
-            raise SpacyModelLoadError("Modelo spaCy não carregado.")
+        self._verificar_modelo()
+
+        try:
+            return self._extrair_palavras_chave(self.nlp(mensagem))
+        except Exception as e:
+            logging.error(f"Erro ao processar a mensagem com spaCy: {e}")
+            raise SpacyProcessingError(f"Erro ao processar a mensagem: {e}")
+
+    def analisar_mensagem(self, mensagem):
+        """
+        Processa a mensagem uma única vez, extraindo palavras-chave e o vetor da frase.
+
+        Args:
+            mensagem (str): Mensagem a ser processada.
+
+        Returns:
+            AnaliseMensagem: Palavras-chave e vetor normalizado (None se o modelo não gerar vetores).
+        """
+        self._verificar_modelo()
 
         try:
             doc = self.nlp(mensagem)
-            palavras_chave = []
-            palavras_irrelevantes = ["preciso", "quero", "gostaria", "de", "estou", "vou", "em", "para", "a", "o", "na", "nao"]
-            substantivos_irrelevantes = ["casa", "ontem", "hoje"]
-
-            for token in doc:
-                # Otimização: Verificação de POS e lematização em uma única iteração
-                if token.pos_ in ["NOUN", "PROPN"]:
-                    lemma = token.lemma_.lower()  # Lematização para reduzir variações
-                    palavra_normalizada = self.SINONIMOS.get(lemma, token.text) # normalização com lema ou palavra original
-                    if (palavra_normalizada.lower() not in palavras_irrelevantes and
-                        palavra_normalizada.lower() not in substantivos_irrelevantes):
-                        palavras_chave.append(palavra_normalizada)
-
-            return palavras_chave
+            return AnaliseMensagem(self._extrair_palavras_chave(doc), normalizar_vetor(doc.vector))
         except Exception as e:
             logging.error(f"Erro ao processar a mensagem com spaCy: {e}")
-            raise SpacyProcessingError(f"Erro ao processar a mensagem: {e}")
\ No newline at end of file
+            raise SpacyProcessingError(f"Erro ao processar a mensagem: {e}")
+
+    def analisar_lote(self, mensagens):
+        """
+        Processa várias mensagens de uma vez com nlp.pipe, amortizando o custo por chamada.
+
+        Args:
+            mensagens (list): Mensagens a serem processadas.
+
+        Returns:
+            list: Uma AnaliseMensagem por mensagem, na mesma ordem.
+        """
+        self._verificar_modelo()
+
+        try:
+            return [
+                AnaliseMensagem(self._extrair_palavras_chave(doc), normalizar_vetor(doc.vector))
+                for doc in self.nlp.pipe(mensagens, batch_size=max(len(mensagens), 1))
+            ]
+        except Exception as e:
+            logging.error(f"Erro ao processar o lote de mensagens com spaCy: {e}")
+            raise SpacyProcessingError(f"Erro ao processar o lote de mensagens: {e}")
+
+    def processar_lote(self, mensagens):
+        """
+        Versão em lote de processar_mensagem.
+
+        Args:
+            mensagens (list): Mensagens a serem processadas.
+
+        Returns:
+            list: Lista de palavras-chave de cada mensagem, na mesma ordem.
+        """
+        return [analise.palavras_chave for analise in self.analisar_lote(mensagens)]
+
+    async def aprocessar_mensagem(self, mensagem):
+        """
+        Versão assíncrona de processar_mensagem, executada no executor dedicado.
+
+        Args:
+            mensagem (str): Mensagem a ser processada.
+
+        Returns:
+            list: Lista de palavras-chave extraídas.
+        """
+        if self.batcher is not None:
+            return (await self.batcher.submeter(mensagem)).palavras_chave
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.processar_mensagem, mensagem)
+
+    async def aanalisar_mensagem(self, mensagem):
+        """
+        Versão assíncrona de analisar_mensagem, executada no executor dedicado.
+        Com micro-lotes ativos, a mensagem é processada junto com as demais que
+        chegarem no mesmo intervalo.
+
+        Args:
+            mensagem (str): Mensagem a ser processada.
+
+        Returns:
+            AnaliseMensagem: Palavras-chave e vetor da mensagem.
+        """
+        if self.batcher is not None:
+            return await self.batcher.submeter(mensagem)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.analisar_mensagem, mensagem)
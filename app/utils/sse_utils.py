@@ -0,0 +1,18 @@
+# app/utils/sse_utils.py
+
+import json
+
+def formatar_evento_sse(dados: dict, evento: str = None) -> str:
+    """
+    Formata um evento no padrão Server-Sent Events.
+
+    Args:
+        dados (dict): Conteúdo do evento, serializado como JSON (preserva quebras de linha).
+        evento (str): Nome do evento. Se omitido, o cliente recebe um evento "message".
+
+    Returns:
+        str: Evento pronto para ser enviado ao cliente.
+    """
+    linhas = f"event: {evento}\n" if evento else ""
+    linhas += f"data: {json.dumps(dados, ensure_ascii=False)}\n\n"
+    return linhas
@@ -0,0 +1,48 @@
+# app/utils/text_utils.py
+
+import re
+import unicodedata
+
+_PADRAO_TOKEN = re.compile(r"[a-z0-9]+")
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Normaliza o texto para comparações: minúsculas, sem acentos e com espaços simples.
+
+    Args:
+        texto (str): Texto original.
+
+    Returns:
+        str: Texto normalizado.
+    """
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(texto.split())
+
+def tokenizar(texto: str) -> list:
+    """Quebra o texto normalizado em tokens alfanuméricos."""
+    return _PADRAO_TOKEN.findall(normalizar_texto(texto))
+
+def singularizar(token: str) -> str:
+    """
+    Reduz plurais regulares do português à forma singular (aproximação leve de lematização).
+
+    Args:
+        token (str): Token já normalizado (minúsculo e sem acentos).
+
+    Returns:
+        str: Token no singular.
+    """
+    if len(token) <= 3:
+        return token
+    if token.endswith(("oes", "aes")):
+        return token[:-3] + "ao"
+    if token.endswith("ais"):
+        return token[:-3] + "al"
+    if token.endswith("ns"):
+        return token[:-2] + "m"
+    if token.endswith(("res", "zes")):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
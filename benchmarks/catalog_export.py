@@ -0,0 +1,148 @@
+# benchmarks/catalog_export.py
+
+"""
+Benchmark de memória da exportação do catálogo.
+
+Para cada tamanho de catálogo, gera um banco SQLite temporário e mede, em
+processos separados (para que o pico de memória de um não afete o outro):
+
+    lista   o caminho antigo de list_produtos: todos os objetos Produto do ORM
+            carregados e serializados de uma vez em uma lista JSON
+    ndjson  a exportação em streaming (exportar_ndjson), com cursor no servidor
+
+O resultado mostra o tempo, o volume gerado e o pico de RSS acima da memória
+do processo após as importações.
+
+Uso:
+    python -m benchmarks.catalog_export --tamanhos 10000 100000 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+MODOS = ("lista", "ndjson")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark de memória da exportação do catálogo")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--medir", choices=MODOS, help=argparse.SUPPRESS)
+    parser.add_argument("--banco", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def rss_atual_mb():
+    """RSS atual do processo (Linux); fora dele, o pico registrado pelo sistema."""
+    try:
+        with open("/proc/self/statm") as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class MonitorRSS(threading.Thread):
+    """Amostra o RSS a cada poucos milissegundos e guarda o maior valor."""
+
+    def __init__(self, intervalo=0.005):
+        super().__init__(daemon=True)
+        self.intervalo = intervalo
+        self.pico = rss_atual_mb()
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            self.pico = max(self.pico, rss_atual_mb())
+
+    def parar(self):
+        self._parar.set()
+        self.join()
+        self.pico = max(self.pico, rss_atual_mb())
+        return self.pico
+
+
+def gerar_banco(caminho, tamanho, semente=42):
+    from sqlalchemy import insert
+    from sqlmodel import SQLModel, Session, create_engine
+    from app.models.models import Empresa, Produto
+
+    engine = create_engine(f"sqlite:///{caminho}")
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(semente)
+    with Session(engine) as session:
+        empresa = Empresa(nome="Loja", descricao="", cnpj="", telefone="", endereco="", tipo="produtos")
+        session.add(empresa)
+        session.commit()
+        for inicio in range(0, tamanho, 50000):
+            session.execute(insert(Produto), [
+                {
+                    "nome": f"Produto {i}",
+                    "descricao": "Descrição do produto com alguns detalhes técnicos " * 2,
+                    "preco": round(rng.uniform(5, 5000), 2),
+                    "categoria": f"Categoria {i % 50}",
+                    "estoque": rng.randint(0, 100),
+                    "imagem": f"https://example.com/produto-{i}.jpg",
+                    "codigo": f"P{i}",
+                    "empresa_id": empresa.id,
+                }
+                for i in range(inicio, min(inicio + 50000, tamanho))
+            ])
+            session.commit()
+    engine.dispose()
+
+
+def medir(modo, caminho):
+    """Executado no processo filho: exporta o catálogo e imprime as medidas em JSON."""
+    from fastapi.encoders import jsonable_encoder
+    from sqlmodel import Session, create_engine, select
+    from app.models.models import Produto
+    from app.utils.catalog_export import exportar_ndjson
+
+    engine = create_engine(f"sqlite:///{caminho}")
+    base = rss_atual_mb()
+    monitor = MonitorRSS()
+    monitor.start()
+    inicio = time.perf_counter()
+    if modo == "lista":
+        with Session(engine) as session:
+            produtos = session.exec(select(Produto)).all()
+            volume = len(json.dumps(jsonable_encoder(produtos)).encode("utf-8"))
+    else:
+        volume = sum(len(trecho) for trecho in exportar_ndjson(engine, Produto))
+    segundos = time.perf_counter() - inicio
+    print(json.dumps({
+        "segundos": segundos,
+        "mb": volume / 1024 / 1024,
+        "rss_extra": monitor.parar() - base,
+    }))
+
+
+def main():
+    args = parse_args()
+    if args.medir:
+        medir(args.medir, args.banco)
+        return
+
+    print(f"{'itens':>9} {'modo':>7} {'tempo s':>9} {'saída MB':>9} {'pico RSS extra MB':>18}")
+    for tamanho in args.tamanhos:
+        with tempfile.TemporaryDirectory(prefix="bench-export-") as diretorio:
+            caminho = os.path.join(diretorio, "catalogo.db")
+            gerar_banco(caminho, tamanho)
+            for modo in MODOS:
+                saida = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.catalog_export", "--medir", modo, "--banco", caminho],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                r = json.loads(saida.strip().splitlines()[-1])
+                print(f"{tamanho:>9} {modo:>7} {r['segundos']:>9.2f} {r['mb']:>9.1f} {r['rss_extra']:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
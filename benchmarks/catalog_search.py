@@ -0,0 +1,96 @@
+# benchmarks/catalog_search.py
+
+"""
+Micro-benchmark da busca de itens no catálogo.
+
+Compara a varredura linear original de ChatRouter._buscar_itens (nome exato
+contido na lista de palavras-chave) com o índice invertido, para catálogos de
+diferentes tamanhos. Também mede a construção do índice e a sincronização
+incremental após a alteração de um único item.
+
+Uso:
+    python -m benchmarks.catalog_search --tamanhos 100 1000 10000 50000
+"""
+
+import argparse
+import random
+import time
+from dataclasses import replace
+
+from app.utils.catalog_cache import CatalogSnapshot, ItemCatalogo
+from app.utils.catalog_index import CatalogIndex
+from app.utils.spacy_utils import SINONIMOS
+
+TIPOS = ["Camiseta", "Notebook", "Caneca", "Mochila", "Tênis", "Smartphone", "Relógio", "Fone", "Cadeira", "Mesa"]
+ATRIBUTOS = ["Azul", "Preto", "Gamer", "Premium", "Básico", "Slim", "Pro", "Max", "Térmica", "Esportivo"]
+MARCAS = ["Alfa", "Beta", "Gama", "Delta", "Omega", "Sigma", "Kappa", "Zeta"]
+
+
+def gerar_snapshot(tamanho, semente=42):
+    rng = random.Random(semente)
+    produtos = tuple(
+        ItemCatalogo(i, "produto", f"{rng.choice(TIPOS)} {rng.choice(ATRIBUTOS)} {rng.choice(MARCAS)} {i}",
+                     "", round(rng.uniform(5, 500), 2), "Geral", f"P{i}", rng.randint(0, 100))
+        for i in range(tamanho)
+    )
+    return CatalogSnapshot(1, None, produtos, (), 0.0)
+
+
+def gerar_consultas(quantidade, semente=7):
+    """Metade das consultas é genérica (tipo + atributo), metade inclui também a marca."""
+    rng = random.Random(semente)
+    consultas = []
+    for i in range(quantidade):
+        consulta = [rng.choice(TIPOS).lower(), rng.choice(ATRIBUTOS).lower()]
+        if i % 2:
+            consulta.append(rng.choice(MARCAS).lower())
+        consultas.append(consulta)
+    return consultas
+
+
+def busca_linear(nomes, palavras_chave):
+    """Implementação original: nome inteiro contido na lista de palavras-chave."""
+    return [p for p in nomes if p.lower() in palavras_chave]
+
+
+def medir(funcao, consultas):
+    inicio = time.perf_counter()
+    for consulta in consultas:
+        funcao(consulta)
+    return (time.perf_counter() - inicio) / len(consultas) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da busca de itens no catálogo")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--consultas", type=int, default=500)
+    args = parser.parse_args()
+
+    consultas = gerar_consultas(args.consultas)
+    print(f"{'itens':>8} | {'linear (µs)':>12} | {'índice (µs)':>12} | {'construção (ms)':>16} | {'sync 1 item (ms)':>16}")
+    for tamanho in args.tamanhos:
+        snapshot = gerar_snapshot(tamanho)
+        nomes = snapshot.nomes_produtos
+
+        indice = CatalogIndex(sinonimos=SINONIMOS)
+        inicio = time.perf_counter()
+        indice.sincronizar(snapshot)
+        construcao_ms = (time.perf_counter() - inicio) * 1000
+
+        # Simula a edição de um único produto seguida da sincronização incremental
+        produtos = list(snapshot.produtos)
+        produtos[0] = replace(produtos[0], nome="Camiseta Edição Limitada")
+        alterado = replace(snapshot, versao=2, produtos=tuple(produtos))
+        inicio = time.perf_counter()
+        indice.sincronizar(alterado)
+        sync_ms = (time.perf_counter() - inicio) * 1000
+
+        linear_us = medir(lambda c: busca_linear(nomes, c), consultas)
+        indice_us = medir(lambda c: indice.buscar(c, limite=10), consultas)
+        print(f"{tamanho:>8} | {linear_us:>12.1f} | {indice_us:>12.1f} | {construcao_ms:>16.1f} | {sync_ms:>16.1f}")
+
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+    main()
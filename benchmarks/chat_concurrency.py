@@ -0,0 +1,65 @@
+# benchmarks/chat_concurrency.py
+
+"""
+Benchmark de concorrência da rota /chat.
+
+Dispara N requisições simultâneas que não acertam cache nem FAQ (todas vão
+para o MockProvider com latência artificial) e compara o tempo total com a
+latência de uma única chamada ao provedor. Com o pipeline não bloqueante, o
+tempo total deve ficar próximo de 1x a latência, e não de N x.
+
+Uso:
+    python -m benchmarks.chat_concurrency --requests 50 --latency-ms 500
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark de concorrência da rota /chat")
+    parser.add_argument("--requests", type=int, default=50, help="Número de requisições simultâneas")
+    parser.add_argument("--latency-ms", type=int, default=500, help="Latência artificial do MockProvider")
+    return parser.parse_args()
+
+
+async def run(total, latency_ms):
+    import httpx
+    from app import create_app
+
+    app = create_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Aquecimento: carrega modelo, conexões e caminhos de código
+        await client.post("/chat", json={"message": "aquecimento do benchmark"})
+
+        async def enviar(i):
+            inicio = time.perf_counter()
+            response = await client.post("/chat", json={"message": f"pergunta {i} sobre garantia estendida"})
+            response.raise_for_status()
+            return time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        latencias = await asyncio.gather(*(enviar(i) for i in range(total)))
+        total_s = time.perf_counter() - inicio
+
+    latencias.sort()
+    upstream_s = latency_ms / 1000
+    print(f"Requisições simultâneas: {total}")
+    print(f"Latência do provedor:    {upstream_s:.3f}s")
+    print(f"Tempo total:             {total_s:.3f}s ({total_s / upstream_s:.2f}x a latência do provedor)")
+    print(f"Tempo se serializado:    {total * upstream_s:.3f}s")
+    print(f"p50: {latencias[len(latencias) // 2]:.3f}s  p99: {latencias[int(len(latencias) * 0.99) - 1]:.3f}s")
+
+
+def main():
+    args = parse_args()
+    os.environ["IA_PROVIDER"] = "mock"
+    os.environ["MOCK_LATENCY_MS"] = str(args.latency_ms)
+    asyncio.run(run(args.requests, args.latency_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/db_concurrency.py
+
+"""
+Benchmark de leituras e escritas concorrentes no SQLite.
+
+Gera um banco temporário com um catálogo e, por alguns segundos, executa em
+paralelo threads leitoras (páginas filtradas por categoria, como GET
+/produtos/) e escritoras (um insert ou update por transação, como POST
+/produtos/). Compara o engine padrão, usado antes (journal DELETE, synchronous
+FULL, pool pequeno), com o engine ajustado de criar_engine (WAL, synchronous
+NORMAL, cache maior, pool dimensionado e espera por travas).
+
+Uso:
+    python -m benchmarks.db_concurrency --leitores 16 --escritores 4 --duracao 10
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+ENGINES = ("padrao", "ajustado")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark de leituras e escritas concorrentes no SQLite")
+    parser.add_argument("--itens", type=int, default=50000, help="Produtos no banco")
+    parser.add_argument("--leitores", type=int, default=16)
+    parser.add_argument("--escritores", type=int, default=4)
+    parser.add_argument("--duracao", type=float, default=10, help="Segundos de medição por engine")
+    return parser.parse_args()
+
+
+def gerar_banco(engine, itens):
+    from sqlalchemy import insert
+    from sqlmodel import SQLModel, Session
+    from app.models.models import Empresa, Produto
+
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Empresa(nome="Loja", descricao="", cnpj="", telefone="", endereco="", tipo="produtos"))
+        session.commit()
+        session.execute(insert(Produto), [
+            {"nome": f"Produto {i}", "descricao": "Descrição do produto", "preco": float(i % 1000),
+             "categoria": f"Categoria {i % 50}", "estoque": i % 100, "imagem": "", "codigo": f"P{i}", "empresa_id": 1}
+            for i in range(itens)
+        ])
+        session.commit()
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))]
+
+
+def executar(engine, args):
+    from sqlalchemy import update
+    from sqlmodel import Session
+    from app.models.models import Produto
+    from app.utils.pagination import paginar
+
+    fim = time.perf_counter() + args.duracao
+    leituras, escritas, erros = [], [], []
+
+    def leitor(semente):
+        rng = random.Random(semente)
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            try:
+                with Session(engine) as session:
+                    paginar(session, Produto, limite=50, categoria=f"Categoria {rng.randrange(50)}")
+                leituras.append(time.perf_counter() - inicio)
+            except Exception as e:
+                erros.append(type(e).__name__)
+
+    def escritor(semente):
+        rng = random.Random(semente)
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            try:
+                with Session(engine) as session:
+                    if rng.random() < 0.5:
+                        session.add(Produto(nome="Novo", descricao="", preco=1.0, categoria="Categoria 1",
+                                            estoque=1, imagem="", codigo=f"N{semente}-{inicio}", empresa_id=1))
+                    else:
+                        session.execute(update(Produto).where(Produto.id == rng.randrange(1, args.itens))
+                                        .values(estoque=rng.randrange(100)))
+                    session.commit()
+                escritas.append(time.perf_counter() - inicio)
+            except Exception as e:
+                erros.append(type(e).__name__)
+
+    threads = [threading.Thread(target=leitor, args=(i,)) for i in range(args.leitores)]
+    threads += [threading.Thread(target=escritor, args=(1000 + i,)) for i in range(args.escritores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(leituras), sorted(escritas), erros
+
+
+def main():
+    args = parse_args()
+    from sqlmodel import create_engine
+    from app.models.database import criar_engine
+
+    print(f"{args.itens} itens, {args.leitores} leitores, {args.escritores} escritores, {args.duracao:.0f}s por engine")
+    print(f"{'engine':<10}{'leit/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'escr/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'erros':>7}")
+    for nome in ENGINES:
+        with tempfile.TemporaryDirectory(prefix="bench-db-") as diretorio:
+            caminho = os.path.join(diretorio, "bench.db")
+            if nome == "padrao":
+                engine = create_engine(f"sqlite:///{caminho}")
+            else:
+                engine = criar_engine(f"sqlite:///{caminho}")
+            gerar_banco(engine, args.itens)
+            leituras, escritas, erros = executar(engine, args)
+            engine.dispose()
+        print(f"{nome:<10}{len(leituras) / args.duracao:>9.0f}"
+              f"{percentil(leituras, 50) * 1000:>9.1f}{percentil(leituras, 99) * 1000:>9.1f}"
+              f"{len(escritas) / args.duracao:>9.0f}"
+              f"{percentil(escritas, 50) * 1000:>9.1f}{percentil(escritas, 99) * 1000:>9.1f}{len(erros):>7}")
+        if erros:
+            print(f"          erros: {', '.join(sorted(set(erros)))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/faq_matcher.py
+
+"""
+Micro-benchmark do casamento de perguntas frequentes.
+
+Compara o laço original de ChatRouter.chat (uma verificação `chave in
+mensagem.lower()` por entrada do FAQ) com o autômato Aho-Corasick do
+FaqMatcher, para FAQs de diferentes tamanhos.
+
+Uso:
+    python -m benchmarks.faq_matcher --tamanhos 5 100 1000 5000
+"""
+
+import argparse
+import random
+import time
+
+from app.utils.faq_matcher import FaqMatcher
+
+PALAVRAS = ["entrega", "troca", "prazo", "frete", "garantia", "pagamento", "pix", "boleto", "cartão",
+            "parcelamento", "loja", "horário", "endereço", "retirada", "devolução", "nota", "fiscal",
+            "cupom", "desconto", "estoque", "pedido", "rastreio", "cancelamento", "reembolso"]
+
+
+def gerar_faq(tamanho, semente=42):
+    rng = random.Random(semente)
+    return [(" ".join(rng.sample(PALAVRAS, 3)) + f" {i}", f"Resposta {i}") for i in range(tamanho)]
+
+
+def gerar_mensagens(quantidade, semente=7):
+    rng = random.Random(semente)
+    return [f"Olá, gostaria de saber sobre {' '.join(rng.sample(PALAVRAS, 4))} do meu pedido" for _ in range(quantidade)]
+
+
+def laco_original(faq, mensagem):
+    for chave, resposta in faq.items():
+        if chave in mensagem.lower():
+            return resposta
+    return None
+
+
+def medir(funcao, mensagens):
+    inicio = time.perf_counter()
+    for mensagem in mensagens:
+        funcao(mensagem)
+    return (time.perf_counter() - inicio) / len(mensagens) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do casamento de FAQ")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[5, 100, 1000, 5000])
+    parser.add_argument("--mensagens", type=int, default=1000)
+    args = parser.parse_args()
+
+    mensagens = gerar_mensagens(args.mensagens)
+    print(f"{'entradas':>8} | {'laço (µs)':>10} | {'autômato (µs)':>14} | {'compilação (ms)':>16}")
+    for tamanho in args.tamanhos:
+        entradas = gerar_faq(tamanho)
+        faq = dict(entradas)
+
+        inicio = time.perf_counter()
+        matcher = FaqMatcher(entradas)
+        compilacao_ms = (time.perf_counter() - inicio) * 1000
+
+        laco_us = medir(lambda m: laco_original(faq, m), mensagens)
+        automato_us = medir(matcher.buscar, mensagens)
+        print(f"{tamanho:>8} | {laco_us:>10.1f} | {automato_us:>14.1f} | {compilacao_ms:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
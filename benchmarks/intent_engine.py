@@ -0,0 +1,135 @@
+# benchmarks/intent_engine.py
+
+"""
+Micro-benchmark do motor de intenções (preço, estoque, categoria, contato).
+
+Gera um catálogo sintético com categorias e estoque e uma mistura de
+perguntas rotuladas: as objetivas (preço, estoque, categoria, contato e
+endereço, com variações de escrita) e as abertas, que devem seguir para o
+catálogo e a IA. Para cada tamanho de catálogo, mostra:
+
+    - a fração de cada tipo de pergunta respondida pelo motor e a fração
+      do total de mensagens respondida sem spaCy nem IA (depende da mistura
+      assumida em MISTURA);
+    - as respostas dadas a perguntas abertas (falsos positivos);
+    - o custo por mensagem, em microssegundos, quando responde e quando não
+      reconhece nenhuma intenção (custo acrescentado às demais mensagens).
+
+Em produção, a mesma fração aparece no /metrics como
+chat_respostas_total{origem="intencao"} sobre o total de respostas, e
+chat_intencoes_total detalha as intenções.
+
+Uso:
+    python -m benchmarks.intent_engine --tamanhos 1000 10000 --perguntas 5000
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+
+from app.utils.catalog_cache import CatalogSnapshot, EmpresaSnapshot, ItemCatalogo
+from app.utils.catalog_index import CatalogIndex
+from app.utils.intent_engine import MotorIntencoes
+from app.utils.spacy_utils import SINONIMOS
+from benchmarks.catalog_search import TIPOS, ATRIBUTOS, MARCAS
+
+CATEGORIAS = {
+    "Camiseta": "Vestuário", "Tênis": "Vestuário", "Mochila": "Acessórios", "Relógio": "Acessórios",
+    "Notebook": "Informática", "Smartphone": "Informática", "Fone": "Informática",
+    "Caneca": "Casa", "Cadeira": "Móveis", "Mesa": "Móveis",
+}
+
+MODELOS = {
+    "preco": ["Quanto custa o {item}?", "qual o preço da {item}", "Qual o valor do {item}?", "{item}, quanto custa?"],
+    "estoque": ["Tem {item} em estoque?", "o {item} está disponível?", "ainda tem {item}?", "{item} a pronta entrega?"],
+    "categoria": ["Quais produtos de {categoria} vocês têm?", "o que vocês têm de {categoria}?",
+                  "Quais categorias vocês têm?"],
+    "contato": ["Qual o telefone de contato?", "me passa o whatsapp", "Como falo com vocês?"],
+    "endereco": ["Qual o endereço da loja?", "Onde vocês ficam?", "vocês têm loja física?"],
+    "aberta": ["Vocês têm {item}?", "Qual {item} é melhor para trabalhar?", "O {item} serve para jogos?",
+               "Qual a diferença entre os modelos de {item}?", "Me indica um presente até 200 reais",
+               "Quanto tempo demora a entrega?", "Qual o telefone mais barato?"],
+}
+MISTURA = {"preco": 25, "estoque": 10, "categoria": 5, "contato": 4, "endereco": 4, "aberta": 52}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Micro-benchmark do motor de intenções")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--perguntas", type=int, default=5000)
+    parser.add_argument("--semente", type=int, default=42)
+    return parser.parse_args()
+
+
+def gerar_catalogo(tamanho, rng):
+    produtos = []
+    for i in range(tamanho):
+        tipo = rng.choice(TIPOS)
+        produtos.append(ItemCatalogo(
+            i, "produto", f"{tipo} {rng.choice(ATRIBUTOS)} {rng.choice(MARCAS)} {i}", "",
+            round(rng.uniform(5, 5000), 2), CATEGORIAS[tipo], f"P{i}", rng.randint(0, 20)
+        ))
+    empresa = EmpresaSnapshot(1, "Loja", "", "", "(11) 0000-0000", "Rua das Flores, 10", "produtos")
+    indice = CatalogIndex(sinonimos=SINONIMOS)
+    indice.sincronizar(CatalogSnapshot(1, None, tuple(produtos), (), 0.0))
+    return MotorIntencoes(empresa, produtos), indice
+
+
+def gerar_perguntas(quantidade, rng):
+    """Perguntas rotuladas; os itens citados variam entre tipo, tipo + atributo e tipo + atributo + marca."""
+    rotulos = list(MISTURA)
+    perguntas = []
+    for _ in range(quantidade):
+        rotulo = rng.choices(rotulos, [MISTURA[r] for r in rotulos])[0]
+        partes = [rng.choice(TIPOS)]
+        if rng.random() < 0.6:
+            partes.append(rng.choice(ATRIBUTOS))
+        if rng.random() < 0.3:
+            partes.append(rng.choice(MARCAS))
+        texto = rng.choice(MODELOS[rotulo]).format(
+            item=" ".join(partes).lower(), categoria=rng.choice(sorted(set(CATEGORIAS.values()))).lower()
+        )
+        perguntas.append((rotulo, texto))
+    return perguntas
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.semente)
+    perguntas = gerar_perguntas(args.perguntas, rng)
+    tipos = {"produto"}
+
+    for tamanho in args.tamanhos:
+        motor, indice = gerar_catalogo(tamanho, random.Random(args.semente))
+        respondidas, totais, tempos = Counter(), Counter(), {"respondida": [], "sem intenção": []}
+        falsos_positivos = []
+        for rotulo, texto in perguntas:
+            inicio = time.perf_counter()
+            resposta = motor.responder(texto, indice, tipos)
+            tempos["respondida" if resposta else "sem intenção"].append(time.perf_counter() - inicio)
+            totais[rotulo] += 1
+            if resposta:
+                respondidas[rotulo] += 1
+                if rotulo == "aberta":
+                    falsos_positivos.append((texto, resposta.intencao))
+
+        print(f"\nCatálogo com {tamanho} produtos, {len(perguntas)} perguntas")
+        print(f"{'pergunta':<12}{'total':>7}{'respondidas':>13}{'fração':>8}")
+        for rotulo in MISTURA:
+            print(f"{rotulo:<12}{totais[rotulo]:>7}{respondidas[rotulo]:>13}"
+                  f"{respondidas[rotulo] / max(totais[rotulo], 1):>8.0%}")
+        absorvidas = sum(respondidas.values()) - respondidas["aberta"]
+        print(f"Respondidas pelo motor (sem spaCy nem IA): {absorvidas / len(perguntas):.1%} das mensagens; "
+              f"falsos positivos em perguntas abertas: {len(falsos_positivos)}")
+        for texto, intencao in sorted(set(falsos_positivos))[:5]:
+            print(f"  {intencao:<10} {texto}")
+        for situacao, valores in tempos.items():
+            if valores:
+                valores.sort()
+                print(f"{situacao:<14} p50 {valores[len(valores) // 2] * 1e6:7.1f} µs   "
+                      f"p95 {valores[int(len(valores) * 0.95)] * 1e6:7.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+# benchmarks/load_test.py
+
+"""
+Teste de carga do serviço de chat com o MockProvider.
+
+Sobe a aplicação com create_app() em um diretório temporário (banco SQLite
+próprio), gera um catálogo do tamanho pedido, usa um Redis local em memória
+(fakeredis) e dispara uma mistura realista de requisições contra /chat,
+/produtos/ e /servicos/ com N clientes concorrentes. Ao final, mostra RPS e
+percentis de latência por caminho, além de quais ramos do chat responderam.
+
+Caminhos simulados:
+    chat:faq        perguntas cobertas pelo FAQ
+    chat:catalogo   perguntas sobre itens do catálogo (spaCy + índice)
+    chat:repetida   perguntas populares que vão à IA uma vez e depois vêm do cache
+    chat:llm        perguntas inéditas, sempre respondidas pela IA
+    produtos        GET /produtos/
+    servicos        GET /servicos/
+
+Os resultados podem ser salvos em JSON e comparados com uma execução
+anterior; a comparação falha (código de saída 1) se o RPS cair ou o p95
+subir além da tolerância, para uso antes do deploy.
+
+Uso:
+    python -m benchmarks.load_test --duracao 20 --concorrencia 32 --latency-ms 300 --catalogo 5000
+    python -m benchmarks.load_test --salvar base.json
+    python -m benchmarks.load_test --comparar base.json --tolerancia 0.2
+    python -m benchmarks.load_test --redis servidor    # usa REDIS_HOST/REDIS_PORT
+
+O Redis local requer `pip install fakeredis[lua]` (não faz parte de
+requirements.txt). Execuções curtas oscilam bastante: para comparar versões,
+use a mesma máquina, a mesma semente e ao menos 20-30 segundos de medição.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MISTURA_PADRAO = "chat:faq=15,chat:catalogo=25,chat:repetida=20,chat:llm=25,produtos=7.5,servicos=7.5"
+
+PERGUNTAS_FAQ = [
+    "Qual a política de troca?",
+    "Vocês aceitam trocas?",
+    "Como funcionam as devoluções?",
+    "Fazem entrega no RJ?",
+    "Vocês fazem entregas no Rio de Janeiro?",
+]
+
+PERGUNTAS_POPULARES = [
+    "Qual o prazo de garantia?",
+    "Vocês parcelam no cartão?",
+    "Qual o horário de atendimento?",
+    "Tem desconto para pagamento à vista?",
+    "Vocês emitem nota fiscal?",
+    "Posso retirar na loja?",
+]
+
+SERVICOS = ["Instalação", "Manutenção", "Consultoria", "Suporte Técnico", "Montagem", "Limpeza"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Teste de carga do chat com o MockProvider")
+    parser.add_argument("--duracao", type=float, default=10, help="Duração da medição, em segundos")
+    parser.add_argument("--concorrencia", type=int, default=16, help="Clientes simultâneos")
+    parser.add_argument("--latency-ms", type=int, default=300, help="Latência artificial do MockProvider")
+    parser.add_argument("--catalogo", type=int, default=1000, help="Número de produtos gerados")
+    parser.add_argument("--servicos", type=int, default=None, help="Número de serviços gerados (padrão: catálogo / 10)")
+    parser.add_argument("--mistura", default=MISTURA_PADRAO, help="Pesos por caminho (caminho=peso,...)")
+    parser.add_argument("--redis", choices=["local", "servidor", "nenhum"], default="local",
+                        help="local: fakeredis em memória; servidor: REDIS_HOST/REDIS_PORT; nenhum: sem Redis")
+    parser.add_argument("--aquecimento", type=int, default=20, help="Requisições de aquecimento (não medidas)")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--salvar", help="Salva o resultado em JSON")
+    parser.add_argument("--comparar", help="Compara com um resultado salvo anteriormente")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Piora relativa aceita na comparação")
+    return parser.parse_args()
+
+
+def ler_mistura(texto):
+    pesos = {}
+    for parte in texto.split(","):
+        caminho, peso = parte.split("=")
+        pesos[caminho.strip()] = float(peso)
+    return pesos
+
+
+def preparar_ambiente(args, diretorio):
+    """
+    Configura variáveis de ambiente e o Redis antes de importar a aplicação
+    (as configurações são lidas na importação dos módulos de app).
+    """
+    os.environ["IA_PROVIDER"] = "mock"
+    os.environ["MOCK_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["ENVIRONMENT"] = "development"
+    if args.redis == "nenhum":
+        os.environ["REDIS_PORT"] = "1"
+
+    # O banco (workana.db) é criado no diretório atual: isola a execução do banco de desenvolvimento
+    sys.path.insert(0, RAIZ)
+    os.chdir(diretorio)
+    # Os logs por requisição distorceriam a medição
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.redis == "local":
+        try:
+            import fakeredis
+        except ImportError:
+            sys.exit("Instale o fakeredis (pip install fakeredis[lua]) ou use --redis servidor/nenhum.")
+        try:
+            import lupa  # noqa: F401
+        except ImportError:
+            print("Aviso: sem o lupa, o fakeredis não executa scripts Lua; limitador e travas usarão o modo local.")
+        from app.config.settings import Configuration
+
+        servidor = fakeredis.FakeServer()
+        Configuration.get_redis_client = lambda self: fakeredis.FakeRedis(server=servidor, decode_responses=True)
+        Configuration.get_async_redis_client = lambda self, decode_responses=True: fakeredis.FakeAsyncRedis(
+            server=servidor, decode_responses=decode_responses)
+
+
+def gerar_catalogo(args):
+    """Insere o catálogo sintético em lote e recarrega o snapshot em memória."""
+    from sqlalchemy import insert
+    from sqlmodel import Session, select
+    from app.models.database import engine
+    from app.models.models import Empresa, Produto, Servico
+    from app.utils.catalog_cache import catalog_cache
+    from benchmarks.catalog_search import TIPOS, ATRIBUTOS, MARCAS
+
+    rng = random.Random(args.semente)
+    total_servicos = args.servicos if args.servicos is not None else max(1, args.catalogo // 10)
+    with Session(engine) as session:
+        empresa = session.exec(select(Empresa)).first()
+        empresa.tipo = "produtos_servicos"
+        session.add(empresa)
+        session.execute(insert(Produto), [
+            {
+                "nome": f"{rng.choice(TIPOS)} {rng.choice(ATRIBUTOS)} {rng.choice(MARCAS)} {i}",
+                "descricao": f"{rng.choice(TIPOS)} de qualidade, linha {rng.choice(ATRIBUTOS).lower()}",
+                "preco": round(rng.uniform(5, 5000), 2),
+                "categoria": rng.choice(["Vestuário", "Informática", "Casa", "Esporte"]),
+                "estoque": rng.randint(0, 100),
+                "imagem": "",
+                "codigo": f"BENCH-P{i}",
+                "empresa_id": empresa.id,
+            }
+            for i in range(args.catalogo)
+        ])
+        session.execute(insert(Servico), [
+            {
+                "nome": f"{rng.choice(SERVICOS)} {rng.choice(MARCAS)} {i}",
+                "descricao": f"Serviço de {rng.choice(SERVICOS).lower()} com garantia",
+                "preco": round(rng.uniform(50, 2000), 2),
+                "categoria": "Serviços",
+                "imagem": "",
+                "codigo": f"BENCH-S{i}",
+                "empresa_id": empresa.id,
+            }
+            for i in range(total_servicos)
+        ])
+        session.commit()
+    snapshot = catalog_cache.rebuild()
+    return len(snapshot.produtos), len(snapshot.servicos)
+
+
+class GeradorRequisicoes:
+    """Sorteia o próximo caminho conforme a mistura e monta a requisição correspondente."""
+
+    def __init__(self, pesos, semente):
+        from benchmarks.catalog_search import TIPOS, ATRIBUTOS
+        self.tipos, self.atributos = TIPOS, ATRIBUTOS
+        self.caminhos = list(pesos)
+        self.pesos = [pesos[c] for c in self.caminhos]
+        self.rng = random.Random(semente)
+        self.sequencia = 0
+
+    def proxima(self):
+        caminho = self.rng.choices(self.caminhos, self.pesos)[0]
+        self.sequencia += 1
+        if caminho == "produtos":
+            return caminho, "GET", "/produtos/", None
+        if caminho == "servicos":
+            return caminho, "GET", "/servicos/", None
+        if caminho == "chat:faq":
+            mensagem = self.rng.choice(PERGUNTAS_FAQ)
+        elif caminho == "chat:catalogo":
+            mensagem = f"Vocês têm {self.rng.choice(self.tipos).lower()} {self.rng.choice(self.atributos).lower()}?"
+        elif caminho == "chat:repetida":
+            mensagem = self.rng.choice(PERGUNTAS_POPULARES)
+        else:
+            mensagem = f"Pergunta inédita número {self.sequencia} sobre garantia estendida"
+        return caminho, "POST", "/chat", {"message": mensagem}
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    indice = min(len(valores) - 1, max(0, round(p / 100 * (len(valores) - 1))))
+    return valores[indice]
+
+
+def ler_respostas_por_origem(texto_metricas):
+    origens = {}
+    for linha in texto_metricas.splitlines():
+        encontrado = re.match(r'chat_respostas_total\{origem="([^"]+)"\} (\S+)', linha)
+        if encontrado:
+            origens[encontrado.group(1)] = float(encontrado.group(2))
+    return origens
+
+
+async def executar(args):
+    import httpx
+    from app import create_app
+
+    app = create_app()
+    produtos, servicos = gerar_catalogo(args)
+    print(f"Catálogo gerado: {produtos} produtos, {servicos} serviços")
+
+    gerador = GeradorRequisicoes(ler_mistura(args.mistura), args.semente)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def enviar(metodo, rota, corpo):
+            if metodo == "GET":
+                return await client.get(rota)
+            return await client.post(rota, json=corpo)
+
+        # Aquecimento: modelo spaCy, índices e conexões
+        for _ in range(args.aquecimento):
+            _, metodo, rota, corpo = gerador.proxima()
+            await enviar(metodo, rota, corpo)
+        origens_antes = ler_respostas_por_origem((await client.get("/metrics")).text)
+
+        latencias = defaultdict(list)
+        erros = defaultdict(int)
+        fim = time.perf_counter() + args.duracao
+
+        async def cliente():
+            while time.perf_counter() < fim:
+                caminho, metodo, rota, corpo = gerador.proxima()
+                inicio = time.perf_counter()
+                try:
+                    resposta = await enviar(metodo, rota, corpo)
+                    ok = resposta.status_code < 400
+                except Exception:
+                    ok = False
+                latencias[caminho].append(time.perf_counter() - inicio)
+                if not ok:
+                    erros[caminho] += 1
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(cliente() for _ in range(args.concorrencia)))
+        decorrido = time.perf_counter() - inicio
+        origens_depois = ler_respostas_por_origem((await client.get("/metrics")).text)
+
+    # O ASGITransport não executa o lifespan: libera aqui as conexões assíncronas do banco
+    from app.models.database import get_async_engine
+    await get_async_engine().dispose()
+
+    resultado = {"parametros": vars(args).copy(), "duracao": decorrido, "caminhos": {}}
+    todas = []
+    for caminho in sorted(latencias):
+        valores = sorted(latencias[caminho])
+        todas.extend(valores)
+        resultado["caminhos"][caminho] = resumir(valores, erros[caminho], decorrido)
+    resultado["total"] = resumir(sorted(todas), sum(erros.values()), decorrido)
+    resultado["origens"] = {
+        origem: origens_depois.get(origem, 0) - origens_antes.get(origem, 0) for origem in origens_depois
+    }
+    return resultado
+
+
+def resumir(valores, erros, decorrido):
+    return {
+        "requisicoes": len(valores),
+        "erros": erros,
+        "rps": len(valores) / decorrido if decorrido else 0.0,
+        "p50": percentil(valores, 50),
+        "p90": percentil(valores, 90),
+        "p95": percentil(valores, 95),
+        "p99": percentil(valores, 99),
+        "max": valores[-1] if valores else 0.0,
+    }
+
+
+def imprimir(resultado):
+    p = resultado["parametros"]
+    print(f"\nDuração: {resultado['duracao']:.1f}s  concorrência: {p['concorrencia']}  "
+          f"latência do provedor: {p['latency_ms']}ms  redis: {p['redis']}")
+    print(f"{'caminho':<15}{'req':>7}{'erros':>7}{'rps':>9}{'p50 ms':>9}{'p90 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    linhas = list(resultado["caminhos"].items()) + [("TOTAL", resultado["total"])]
+    for caminho, r in linhas:
+        print(f"{caminho:<15}{r['requisicoes']:>7}{r['erros']:>7}{r['rps']:>9.1f}"
+              f"{r['p50'] * 1000:>9.1f}{r['p90'] * 1000:>9.1f}{r['p95'] * 1000:>9.1f}"
+              f"{r['p99'] * 1000:>9.1f}{r['max'] * 1000:>9.1f}")
+    if resultado["origens"]:
+        origens = ", ".join(f"{o}={int(v)}" for o, v in sorted(resultado["origens"].items()) if v)
+        print(f"\nRespostas do chat por origem: {origens}")
+
+
+def comparar(resultado, base, tolerancia):
+    """Retorna as regressões em relação à execução de referência."""
+    regressoes = []
+    for caminho, atual in list(resultado["caminhos"].items()) + [("TOTAL", resultado["total"])]:
+        anterior = base["total"] if caminho == "TOTAL" else base["caminhos"].get(caminho)
+        if not anterior:
+            continue
+        if anterior["rps"] and atual["rps"] < anterior["rps"] * (1 - tolerancia):
+            regressoes.append(f"{caminho}: RPS {anterior['rps']:.1f} -> {atual['rps']:.1f}")
+        if anterior["p95"] and atual["p95"] > anterior["p95"] * (1 + tolerancia):
+            regressoes.append(f"{caminho}: p95 {anterior['p95'] * 1000:.1f}ms -> {atual['p95'] * 1000:.1f}ms")
+    return regressoes
+
+
+def main():
+    args = parse_args()
+    base = None
+    if args.comparar:
+        with open(os.path.abspath(args.comparar), encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+    destino = os.path.abspath(args.salvar) if args.salvar else None
+
+    with tempfile.TemporaryDirectory(prefix="bench-chat-") as diretorio:
+        preparar_ambiente(args, diretorio)
+        resultado = asyncio.run(executar(args))
+        os.chdir(RAIZ)
+
+    imprimir(resultado)
+    if destino:
+        with open(destino, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+        print(f"\nResultado salvo em {destino}")
+    if base is not None:
+        regressoes = comparar(resultado, base, args.tolerancia)
+        if regressoes:
+            print("\nRegressões acima da tolerância:")
+            for regressao in regressoes:
+                print(f"  - {regressao}")
+            sys.exit(1)
+        print(f"\nSem regressões acima de {args.tolerancia:.0%} em relação a {args.comparar}.")
+
+
+if __name__ == "__main__":
+    main()
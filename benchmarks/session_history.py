@@ -0,0 +1,220 @@
+# benchmarks/session_history.py
+
+"""
+Benchmark do histórico das conversas (session_id no /chat).
+
+Mede três coisas:
+
+    memória     bytes guardados no Redis por sessão com a codificação compacta
+                (um item de lista por turno, texto com separador e zlib acima do
+                limite) versus uma lista JSON de mensagens {"role", "content"}
+                guardada como string, para sessões de 1 a SESSION_MAX_TURNS turnos.
+                Com --redis servidor, também mostra o MEMORY USAGE das chaves.
+    tokens      tokens de histórico enviados ao provedor com janela + resumo
+                versus o histórico completo, conforme a conversa cresce.
+    latência    /chat com e sem session_id (mesmas perguntas, respondidas pelo
+                catálogo ou pela IA), via ASGI e com o MockProvider sem latência,
+                para isolar o custo de ler e gravar o histórico; e as operações
+                do SessionStore isoladas.
+
+O cache semântico é desativado na medição de latência: perguntas com histórico
+não o consultam, e acertos nele distorceriam a comparação.
+
+Uso:
+    python -m benchmarks.session_history --conversas 50 --turnos 10
+    python -m benchmarks.session_history --redis servidor    # usa REDIS_HOST/REDIS_PORT
+
+O Redis local requer `pip install fakeredis` (não faz parte de requirements.txt).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.load_test import preparar_ambiente, gerar_catalogo, percentil, ler_respostas_por_origem
+
+PERGUNTAS = [
+    "Quanto custa a instalação do ar-condicionado?",
+    "E se eu comprar dois aparelhos, tem desconto?",
+    "Vocês parcelam em quantas vezes sem juros?",
+    "Qual o prazo de entrega para o interior de São Paulo?",
+    "A garantia cobre defeitos de fabricação e mau uso?",
+    "Posso agendar a instalação para o sábado de manhã?",
+    "O técnico leva o suporte ou preciso comprar separado?",
+    "Tem algum modelo mais silencioso para o quarto?",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark do histórico das conversas")
+    parser.add_argument("--conversas", type=int, default=30, help="Conversas simuladas na medição de latência")
+    parser.add_argument("--turnos", type=int, default=8, help="Mensagens por conversa")
+    parser.add_argument("--resposta", type=int, default=200, help="Tamanho das respostas sintéticas, em caracteres")
+    parser.add_argument("--catalogo", type=int, default=1000, help="Número de produtos gerados")
+    parser.add_argument("--redis", choices=["local", "servidor"], default="local",
+                        help="local: fakeredis em memória; servidor: REDIS_HOST/REDIS_PORT")
+    parser.add_argument("--semente", type=int, default=42)
+    return parser.parse_args()
+
+
+def conversa_sintetica(turnos, tamanho_resposta, rng):
+    """Turnos (pergunta, resposta) com respostas do tamanho típico do provedor."""
+    palavras = ("o aparelho tem garantia de um ano e a instalação inclui suporte, tubulação de até três metros "
+                "e teste de funcionamento; o pagamento pode ser parcelado em até dez vezes no cartão").split()
+    conversa = []
+    for i in range(turnos):
+        resposta = []
+        while len(" ".join(resposta)) < tamanho_resposta:
+            resposta.append(rng.choice(palavras))
+        conversa.append((PERGUNTAS[i % len(PERGUNTAS)], " ".join(resposta)[:tamanho_resposta]))
+    return conversa
+
+
+def json_ingenuo(turnos):
+    """Histórico como lista JSON de mensagens de chat, guardada inteira em uma string."""
+    mensagens = []
+    for pergunta, resposta in turnos:
+        mensagens.append({"role": "user", "content": pergunta})
+        mensagens.append({"role": "assistant", "content": resposta})
+    return json.dumps(mensagens, ensure_ascii=False).encode("utf-8")
+
+
+async def medir_memoria(args, config, redis_client):
+    from app.utils.session_store import SessionStore, codificar_turno
+
+    rng = random.Random(args.semente)
+    conversa = conversa_sintetica(config.session_max_turns, args.resposta, rng)
+    sessoes = SessionStore(redis_client, namespace=lambda empresa_id: "bench")
+    real = args.redis == "servidor"
+
+    print(f"\nMemória por sessão (respostas de {args.resposta} caracteres; valores em bytes)")
+    print(f"{'turnos':>7}{'compacto':>10}{'JSON':>8}{'redução':>9}" + (f"{'MEMORY compacto':>17}{'MEMORY JSON':>13}" if real else ""))
+    for turnos in sorted({1, 5, 10, config.session_max_turns}):
+        compacto = sum(len(codificar_turno(p, r)) for p, r in conversa[:turnos])
+        ingenuo = len(json_ingenuo(conversa[:turnos]))
+        linha = f"{turnos:>7}{compacto:>10}{ingenuo:>8}{1 - compacto / ingenuo:>9.0%}"
+        if real:
+            chave = sessoes.chave(f"memoria-{turnos}")
+            await redis_client.delete(chave, "bench:json")
+            for pergunta, resposta in conversa[:turnos]:
+                await sessoes.registrar(f"memoria-{turnos}", pergunta, resposta)
+            await redis_client.set("bench:json", json_ingenuo(conversa[:turnos]))
+            linha += f"{await redis_client.memory_usage(chave):>17}{await redis_client.memory_usage('bench:json'):>13}"
+            await redis_client.delete(chave, "bench:json")
+        print(linha)
+    maximo = sum(len(codificar_turno(p, r)) for p, r in conversa)
+    print(f"Sessões ativas por 100 MB de Redis (só os dados, {config.session_max_turns} turnos): "
+          f"~{100 * 1024 * 1024 // maximo:,}")
+
+
+def medir_tokens(args, config):
+    from app.gateway.prompt_builder import PromptBuilder, estimar_tokens
+    from app.utils.session_store import SessionStore, HistoricoSessao
+
+    rng = random.Random(args.semente)
+    conversa = conversa_sintetica(config.session_max_turns, args.resposta, rng)
+    builder = PromptBuilder("Ana")
+    completo = PromptBuilder("Ana", max_tokens_historico=10 ** 9)
+    sessoes = SessionStore(redis_client=object())
+    base = sum(estimar_tokens(m["content"]) for m in builder.montar_mensagens([], [], "oi"))
+
+    print(f"\nTokens de histórico enviados ao provedor (janela de {config.session_window_turns} turnos, "
+          f"orçamento de {config.session_history_max_tokens})")
+    print(f"{'turnos':>7}{'janela+resumo':>15}{'completo':>10}")
+    for turnos in sorted({2, 5, 10, config.session_max_turns}):
+        anteriores = conversa[:turnos]
+        recentes, antigos = anteriores[-sessoes.janela:], anteriores[:-sessoes.janela]
+        historico = HistoricoSessao(sessoes.resumir(antigos), tuple(recentes))
+        janela = sum(estimar_tokens(m["content"]) for m in builder.montar_mensagens([], [], "oi", historico)) - base
+        inteiro = sum(estimar_tokens(m["content"])
+                      for m in completo.montar_mensagens([], [], "oi", HistoricoSessao("", tuple(anteriores)))) - base
+        print(f"{turnos:>7}{janela:>15}{inteiro:>10}")
+
+
+async def medir_latencia(args, redis_binario):
+    import httpx
+    from app import create_app
+    from app.utils.session_store import SessionStore
+
+    app = create_app()
+    gerar_catalogo(args)
+
+    transport = httpx.ASGITransport(app=app)
+    latencias = {"sem sessão": [], "com sessão": []}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Aquecimento: modelo spaCy, índices e conexões
+        for i in range(10):
+            await client.post("/chat", json={"message": f"Aquecimento {i} sobre garantia estendida"})
+        origens_antes = ler_respostas_por_origem((await client.get("/metrics")).text)
+
+        for c in range(args.conversas):
+            for t in range(args.turnos):
+                # Perguntas inéditas nos dois modos: sem acertos no cache de respostas
+                mensagem = f"{PERGUNTAS[t % len(PERGUNTAS)]} (conversa {c})"
+                for modo, corpo in (("sem sessão", {"message": mensagem + " avulsa"}),
+                                    ("com sessão", {"message": mensagem, "session_id": f"bench-{c}"})):
+                    inicio = time.perf_counter()
+                    resposta = await client.post("/chat", json=corpo)
+                    latencias[modo].append(time.perf_counter() - inicio)
+                    resposta.raise_for_status()
+        origens_depois = ler_respostas_por_origem((await client.get("/metrics")).text)
+
+    from app.models.database import get_async_engine
+    await get_async_engine().dispose()
+
+    print(f"\nLatência do /chat ({args.conversas} conversas x {args.turnos} mensagens; ms)")
+    print(f"{'modo':<12}{'p50':>8}{'p95':>8}{'média':>8}")
+    for modo, valores in latencias.items():
+        valores.sort()
+        print(f"{modo:<12}{percentil(valores, 50) * 1000:>8.2f}{percentil(valores, 95) * 1000:>8.2f}"
+              f"{statistics.mean(valores) * 1000:>8.2f}")
+    origens = {origem: total - origens_antes.get(origem, 0) for origem, total in origens_depois.items()}
+    print("Respostas por origem: " + ", ".join(f"{o}={n}" for o, n in sorted(origens.items()) if n))
+    print("(a partir da 2ª mensagem, as perguntas com sessão não consultam o cache de respostas)")
+
+    # Operações do histórico isoladas (o que a sessão acrescenta a cada mensagem)
+    sessoes = SessionStore(redis_binario, namespace=lambda empresa_id: "bench")
+    rng = random.Random(args.semente)
+    conversa = conversa_sintetica(sessoes.max_turnos, args.resposta, rng)
+    for pergunta, resposta in conversa:
+        await sessoes.registrar("isolada", pergunta, resposta)
+    tempos = {"carregar": [], "registrar": []}
+    for i in range(500):
+        inicio = time.perf_counter()
+        await sessoes.carregar("isolada")
+        tempos["carregar"].append(time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        await sessoes.registrar("isolada", *conversa[i % len(conversa)])
+        tempos["registrar"].append(time.perf_counter() - inicio)
+    print(f"\nSessionStore com {sessoes.max_turnos} turnos guardados (500 execuções; ms)")
+    for operacao, valores in tempos.items():
+        valores.sort()
+        print(f"{operacao:<12}{percentil(valores, 50) * 1000:>8.3f}{percentil(valores, 95) * 1000:>8.3f}")
+
+
+def main():
+    args = parse_args()
+    args.latency_ms, args.servicos = 0, None
+    os.environ["SEMANTIC_CACHE_ENABLED"] = "false"
+    with tempfile.TemporaryDirectory(prefix="bench-sessoes-") as diretorio:
+        preparar_ambiente(args, diretorio)
+        from app.config.settings import Configuration
+
+        config = Configuration()
+        redis_binario = config.get_async_redis_client(decode_responses=False)
+
+        async def executar():
+            await medir_memoria(args, config, redis_binario)
+            medir_tokens(args, config)
+            await medir_latencia(args, redis_binario)
+
+        asyncio.run(executar())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/spacy_throughput.py
+
+"""
+Throughput (mensagens/s) do processamento com spaCy.
+
+Compara:
+  1. pipeline completo do pt_core_news_sm, uma mensagem por chamada (comportamento original);
+  2. pipeline reduzido (sem parser/NER), uma mensagem por chamada;
+  3. pipeline reduzido com nlp.pipe em lotes;
+  4. SpacyProcessor.aanalisar_mensagem com chamadas concorrentes agrupadas pelo MicroBatcher.
+
+Uso:
+    python -m benchmarks.spacy_throughput --mensagens 2000 --lote 16
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import spacy
+
+from app.utils.spacy_utils import SpacyProcessor
+
+FRASES = [
+    "Vocês têm notebook com 16GB de memória?",
+    "Quero comprar uma camiseta azul tamanho M",
+    "Qual o prazo de entrega para o Rio de Janeiro?",
+    "Preciso de suporte técnico para meu computador",
+    "A caneca térmica mantém a bebida quente por quanto tempo?",
+    "Gostaria de contratar uma consultoria em informática",
+    "Vocês aceitam pagamento por pix ou boleto?",
+    "Meu celular não liga, vocês consertam?",
+]
+
+
+def medir(funcao, mensagens):
+    inicio = time.perf_counter()
+    funcao(mensagens)
+    return len(mensagens) / (time.perf_counter() - inicio)
+
+
+async def concorrente(processor, mensagens):
+    await asyncio.gather(*(processor.aanalisar_mensagem(m) for m in mensagens))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput do processamento com spaCy")
+    parser.add_argument("--mensagens", type=int, default=2000)
+    parser.add_argument("--lote", type=int, default=16)
+    parser.add_argument("--modelo", default="pt_core_news_sm")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    mensagens = [rng.choice(FRASES) + f" ({i})" for i in range(args.mensagens)]
+
+    completo = spacy.load(args.modelo)
+    processor = SpacyProcessor(args.modelo)
+    reduzido = processor.nlp
+
+    resultados = [
+        ("completo, 1 por chamada", medir(lambda ms: [completo(m) for m in ms], mensagens)),
+        ("reduzido, 1 por chamada", medir(lambda ms: [reduzido(m) for m in ms], mensagens)),
+        (f"reduzido, nlp.pipe (lote {args.lote})", medir(lambda ms: list(reduzido.pipe(ms, batch_size=args.lote)), mensagens)),
+        ("SpacyProcessor concorrente (micro-lotes)", medir(lambda ms: asyncio.run(concorrente(processor, ms)), mensagens)),
+    ]
+
+    print(f"Componentes completos: {completo.pipe_names}")
+    print(f"Componentes reduzidos: {reduzido.pipe_names}")
+    for nome, taxa in resultados:
+        print(f"{nome:<42} {taxa:>10.0f} mensagens/s")
+
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+    main()
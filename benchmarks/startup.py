@@ -0,0 +1,128 @@
+# benchmarks/startup.py
+
+"""
+Benchmark de partida a frio da aplicação.
+
+Cada rodada usa um interpretador novo, em um diretório temporário (banco
+SQLite próprio), e mede:
+
+    import      tempo de `from app import create_app`
+    create_app  criação da aplicação (tabelas, dados iniciais e roteadores)
+    vivo        até o hook de startup liberar o processo (/health responde)
+    pronto      até /ready responder 200 (modelo spaCy, provedor de IA e catálogo)
+
+Também lista os módulos mais caros de importar (python -X importtime) e se
+os SDKs dos provedores e o spaCy foram importados antes da carga em segundo plano.
+
+Uso:
+    python -m benchmarks.startup --rodadas 5 --provedor mock
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ETAPAS = ("import", "create_app", "vivo", "pronto")
+MODULOS_PESADOS = ("spacy", "openai", "google.generativeai", "requests")
+
+# Executado no processo filho: imprime as medidas em JSON na última linha
+SCRIPT_FILHO = r"""
+import asyncio, json, logging, sys, time
+inicio = time.perf_counter()
+from app import create_app
+medidas = {"import": time.perf_counter() - inicio}
+logging.disable(logging.CRITICAL)
+pesados = {m: m in sys.modules for m in %(pesados)r}
+
+async def subir():
+    marco = time.perf_counter()
+    app = create_app()
+    logging.disable(logging.CRITICAL)
+    medidas["create_app"] = time.perf_counter() - marco
+    from app.utils.readiness import prontidao
+    async with app.router.lifespan_context(app):
+        medidas["vivo"] = time.perf_counter() - inicio
+        while not prontidao.pronto:
+            if any(e["estado"] == "erro" for e in prontidao.estado().values()):
+                raise SystemExit(f"Falha na carga: {prontidao.estado()}")
+            await asyncio.sleep(0.005)
+        medidas["pronto"] = time.perf_counter() - inicio
+        medidas["componentes"] = prontidao.estado()
+
+asyncio.run(subir())
+medidas["pesados_no_import"] = pesados
+print(json.dumps(medidas))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark de partida a frio da aplicação")
+    parser.add_argument("--rodadas", type=int, default=5)
+    parser.add_argument("--provedor", default="mock", help="IA_PROVIDER usado nas rodadas")
+    parser.add_argument("--top", type=int, default=10, help="Módulos mais caros exibidos")
+    return parser.parse_args()
+
+
+def ambiente(args):
+    env = dict(os.environ, IA_PROVIDER=args.provedor, ENVIRONMENT="development")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [RAIZ, env.get("PYTHONPATH")]))
+    return env
+
+
+def rodar(args):
+    with tempfile.TemporaryDirectory(prefix="bench-startup-") as diretorio:
+        saida = subprocess.run(
+            [sys.executable, "-c", SCRIPT_FILHO % {"pesados": MODULOS_PESADOS}],
+            cwd=diretorio, env=ambiente(args), capture_output=True, text=True
+        )
+    if saida.returncode:
+        sys.exit(saida.stderr.strip().splitlines()[-1] if saida.stderr.strip() else "Falha no processo filho")
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def modulos_mais_caros(args):
+    """Tempo acumulado de importação dos módulos de primeiro nível mais caros."""
+    with tempfile.TemporaryDirectory(prefix="bench-startup-") as diretorio:
+        saida = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "from app import create_app"],
+            cwd=diretorio, env=ambiente(args), capture_output=True, text=True
+        )
+    tempos = {}
+    for linha in saida.stderr.splitlines():
+        encontrado = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)", linha)
+        if encontrado and len(encontrado.group(2)) <= 2:
+            tempos[encontrado.group(3)] = int(encontrado.group(1)) / 1e6
+    return sorted(tempos.items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+
+def main():
+    args = parse_args()
+    rodadas = [rodar(args) for _ in range(args.rodadas)]
+
+    print(f"{args.rodadas} rodadas, IA_PROVIDER={args.provedor}")
+    print(f"{'etapa':<12}{'mediana s':>11}{'mín s':>9}{'máx s':>9}")
+    for etapa in ETAPAS:
+        valores = [r[etapa] for r in rodadas]
+        print(f"{etapa:<12}{statistics.median(valores):>11.3f}{min(valores):>9.3f}{max(valores):>9.3f}")
+
+    print("\nCarga em segundo plano (última rodada):")
+    for nome, estado in rodadas[-1]["componentes"].items():
+        print(f"  {nome:<10} {estado['estado']:<10} {estado.get('segundos', 0):.3f}s")
+
+    carregados = [m for m, sim in rodadas[-1]["pesados_no_import"].items() if sim]
+    print(f"\nMódulos pesados importados por `import app`: {', '.join(carregados) or 'nenhum'}")
+
+    print("\nMódulos mais caros no import (acumulado):")
+    for modulo, segundos in modulos_mais_caros(args):
+        print(f"  {modulo:<40}{segundos:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
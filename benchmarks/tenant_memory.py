@@ -0,0 +1,150 @@
+# benchmarks/tenant_memory.py
+
+"""
+Benchmark de memória por empresa no chat multiempresa.
+
+Sobe a aplicação como o teste de carga (banco temporário, MockProvider e
+Redis local), cadastra N empresas com catálogo e FAQ próprios e, depois de
+aquecer o processo com a empresa padrão (modelo spaCy, provedor e índices
+carregados), conversa com cada empresa em sequência. A cada passo mede o RSS
+do processo, de modo que a diferença mostra quanto custa cada empresa a mais:
+snapshot, índice de busca, BM25, FAQ compilado e cache semântico. O modelo
+spaCy e o provedor de IA são carregados uma única vez.
+
+Uso:
+    python -m benchmarks.tenant_memory --empresas 50 --produtos 500 --servicos 50 --faqs 20
+"""
+
+import argparse
+import asyncio
+import gc
+import random
+import tempfile
+
+from benchmarks.catalog_export import rss_atual_mb
+from benchmarks.load_test import PERGUNTAS_FAQ, SERVICOS, preparar_ambiente
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark de memória por empresa no chat multiempresa")
+    parser.add_argument("--empresas", type=int, default=50, help="Empresas além da padrão")
+    parser.add_argument("--produtos", type=int, default=500, help="Produtos por empresa")
+    parser.add_argument("--servicos", type=int, default=50, help="Serviços por empresa")
+    parser.add_argument("--faqs", type=int, default=20, help="Perguntas frequentes por empresa")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Latência artificial do MockProvider")
+    parser.add_argument("--redis", choices=["local", "nenhum"], default="local")
+    parser.add_argument("--semente", type=int, default=42)
+    return parser.parse_args()
+
+
+def gerar_empresas(args):
+    """Cadastra as empresas com catálogo e FAQ próprios e retorna os ids."""
+    from sqlalchemy import insert
+    from sqlmodel import Session
+    from app.models.database import engine
+    from app.models.models import Empresa, Faq, Produto, Servico
+    from benchmarks.catalog_search import TIPOS, ATRIBUTOS, MARCAS
+
+    rng = random.Random(args.semente)
+    ids = []
+    with Session(engine) as session:
+        for n in range(args.empresas):
+            empresa = Empresa(nome=f"Empresa {n}", descricao="", cnpj="", telefone="", endereco="",
+                              tipo="produtos_servicos")
+            session.add(empresa)
+            session.commit()
+            ids.append(empresa.id)
+            session.execute(insert(Produto), [
+                {
+                    "nome": f"{rng.choice(TIPOS)} {rng.choice(ATRIBUTOS)} {rng.choice(MARCAS)} {i}",
+                    "descricao": f"{rng.choice(TIPOS)} de qualidade, linha {rng.choice(ATRIBUTOS).lower()}",
+                    "preco": round(rng.uniform(5, 5000), 2),
+                    "categoria": rng.choice(["Vestuário", "Informática", "Casa", "Esporte"]),
+                    "estoque": rng.randint(0, 100),
+                    "imagem": "",
+                    "codigo": f"E{n}-P{i}",
+                    "empresa_id": empresa.id,
+                }
+                for i in range(args.produtos)
+            ])
+            if args.servicos:
+                session.execute(insert(Servico), [
+                    {
+                        "nome": f"{rng.choice(SERVICOS)} {rng.choice(MARCAS)} {i}",
+                        "descricao": f"Serviço de {rng.choice(SERVICOS).lower()} com garantia",
+                        "preco": round(rng.uniform(50, 2000), 2),
+                        "categoria": "Serviços",
+                        "imagem": "",
+                        "codigo": f"E{n}-S{i}",
+                        "empresa_id": empresa.id,
+                    }
+                    for i in range(args.servicos)
+                ])
+            if args.faqs:
+                session.execute(insert(Faq), [
+                    {"chave": f"pergunta {i} da empresa {n}", "resposta": f"Resposta {i} da empresa {n}.",
+                     "empresa_id": empresa.id}
+                    for i in range(args.faqs)
+                ])
+            session.commit()
+    return ids
+
+
+def medir_rss():
+    gc.collect()
+    return rss_atual_mb()
+
+
+async def executar(args):
+    import httpx
+    from app import create_app
+    from app.models.database import get_async_engine
+    from app.utils.catalog_cache import catalogos
+    from benchmarks.catalog_search import TIPOS
+
+    app = create_app()
+    ids = gerar_empresas(args)
+    rng = random.Random(args.semente)
+
+    def mensagens(empresa_id):
+        return [
+            {"message": rng.choice(PERGUNTAS_FAQ), "empresa_id": empresa_id},
+            {"message": f"Vocês têm {rng.choice(TIPOS).lower()}?", "empresa_id": empresa_id},
+            {"message": f"Pergunta inédita sobre garantia para a empresa {empresa_id}", "empresa_id": empresa_id},
+        ]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Aquecimento com a empresa padrão: spaCy, provedor, índices e conexões
+        for corpo in mensagens(None):
+            (await client.post("/chat", json=corpo)).raise_for_status()
+        base = medir_rss()
+        print(f"{args.empresas} empresas extras, {args.produtos} produtos, {args.servicos} serviços, "
+              f"{args.faqs} perguntas frequentes cada")
+        print(f"RSS após aquecimento (empresa padrão): {base:.1f} MB")
+        print(f"{'empresas':>9}{'RSS MB':>9}{'extra MB':>10}{'MB/empresa':>12}")
+
+        passo = max(1, len(ids) // 10)
+        for n, empresa_id in enumerate(ids, start=1):
+            for corpo in mensagens(empresa_id):
+                (await client.post("/chat", json=corpo)).raise_for_status()
+            if n % passo == 0 or n == len(ids):
+                rss = medir_rss()
+                print(f"{n:>9}{rss:>9.1f}{rss - base:>10.1f}{(rss - base) / n:>12.2f}")
+
+        desconhecida = await client.post("/chat", json={"message": "oi", "empresa_id": 10 ** 9})
+        print(f"Catálogos em memória: {len(catalogos)} (empresa inexistente: HTTP {desconhecida.status_code})")
+
+    # O ASGITransport não executa o lifespan: libera aqui as conexões assíncronas do banco
+    await get_async_engine().dispose()
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory(prefix="bench-tenants-") as diretorio:
+        preparar_ambiente(args, diretorio)
+        asyncio.run(executar(args))
+
+
+if __name__ == "__main__":
+    main()
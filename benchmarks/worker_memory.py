@@ -0,0 +1,184 @@
+# benchmarks/worker_memory.py
+
+"""
+Benchmark de memória por worker: uvicorn --workers versus servidor.py.
+
+Sobe a aplicação com N workers em três arranjos, sobre o mesmo banco com um
+catálogo sintético:
+
+    uvicorn         `uvicorn main:app --workers N` (processos novos: cada worker
+                    importa tudo e carrega o seu modelo spaCy e catálogo)
+    fork            servidor.py --sem-precarga (fork após importar a aplicação,
+                    mas modelos e catálogo carregados em cada worker)
+    precarga        servidor.py (modelos e catálogo carregados antes do fork,
+                    com gc.freeze)
+
+Depois de aquecer os workers com mensagens de chat (FAQ, catálogo e IA), lê
+/proc/<pid>/smaps_rollup de cada processo e mostra RSS, PSS (RSS com as
+páginas compartilhadas divididas entre os processos que as usam), memória
+compartilhada e privada por worker, além do PSS total, que é o custo real
+do conjunto.
+
+Uso:
+    python -m benchmarks.worker_memory --workers 4 --catalogo 5000
+"""
+
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODOS = ("uvicorn", "fork", "precarga")
+MENSAGENS = ["Qual a política de troca?", "Vocês têm notebook?", "Qual o prazo de garantia estendida?"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark de memória por worker")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--catalogo", type=int, default=5000, help="Produtos gerados no banco")
+    parser.add_argument("--modos", nargs="+", choices=MODOS, default=list(MODOS))
+    parser.add_argument("--mensagens", type=int, default=60, help="Mensagens de aquecimento por worker")
+    parser.add_argument("--gerar-banco", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def ambiente():
+    env = dict(os.environ, IA_PROVIDER="mock", MOCK_LATENCY_MS="0", ENVIRONMENT="development", REDIS_PORT="1")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [RAIZ, env.get("PYTHONPATH")]))
+    return env
+
+
+def gerar_banco(args):
+    """Executado no diretório temporário: cria o banco e o catálogo sintético."""
+    from benchmarks.load_test import gerar_catalogo
+    from app import create_app
+
+    create_app()
+    args.servicos, args.semente = None, 42
+    gerar_catalogo(args)
+
+
+def porta_livre():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def comando(modo, args, porta):
+    if modo == "uvicorn":
+        return [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", RAIZ, "--workers", str(args.workers),
+                "--port", str(porta), "--log-level", "warning"]
+    extra = ["--sem-precarga"] if modo == "fork" else []
+    return [sys.executable, os.path.join(RAIZ, "servidor.py"), "--workers", str(args.workers),
+            "--host", "127.0.0.1", "--port", str(porta), "--log-level", "warning", *extra]
+
+
+def filhos(pid):
+    """Workers do servidor (ignora o resource_tracker do multiprocessing)."""
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as arquivo:
+            pids = [int(p) for p in arquivo.read().split()]
+    except OSError:
+        return []
+    workers = []
+    for filho in pids:
+        with open(f"/proc/{filho}/cmdline", "rb") as arquivo:
+            if b"resource_tracker" not in arquivo.read():
+                workers.append(filho)
+    return workers
+
+
+def memoria(pid):
+    """RSS, PSS, compartilhada e privada do processo, em MB."""
+    campos = {}
+    with open(f"/proc/{pid}/smaps_rollup") as arquivo:
+        for linha in arquivo:
+            partes = linha.split()
+            if len(partes) == 3 and partes[2] == "kB":
+                campos[partes[0].rstrip(":")] = int(partes[1]) / 1024
+    return {
+        "rss": campos.get("Rss", 0),
+        "pss": campos.get("Pss", 0),
+        "compartilhada": campos.get("Shared_Clean", 0) + campos.get("Shared_Dirty", 0),
+        "privada": campos.get("Private_Clean", 0) + campos.get("Private_Dirty", 0),
+    }
+
+
+def aguardar_estavel(pids, limite=30):
+    """Espera o RSS somado dos processos parar de crescer (cargas em segundo plano concluídas)."""
+    anterior, fim = None, time.perf_counter() + limite
+    while time.perf_counter() < fim:
+        total = sum(memoria(pid)["rss"] for pid in pids)
+        if anterior is not None and abs(total - anterior) < 1:
+            return
+        anterior = total
+        time.sleep(1)
+
+
+def medir(modo, args, diretorio):
+    import httpx
+
+    porta = porta_livre()
+    processo = subprocess.Popen(comando(modo, args, porta), cwd=diretorio, env=ambiente(),
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        url = f"http://127.0.0.1:{porta}"
+        fim = time.perf_counter() + 120
+        while True:
+            try:
+                if httpx.get(f"{url}/ready", timeout=5).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.perf_counter() > fim or processo.poll() is not None:
+                raise RuntimeError(f"O servidor ({modo}) não ficou pronto.")
+            time.sleep(0.1)
+
+        workers = filhos(processo.pid)
+        with httpx.Client(base_url=url, timeout=30) as cliente:
+            for i in range(args.mensagens * args.workers):
+                cliente.post("/chat", json={"message": f"{MENSAGENS[i % len(MENSAGENS)]} {i}"})
+        aguardar_estavel(workers)
+
+        por_worker = [memoria(pid) for pid in workers]
+        principal = memoria(processo.pid)
+    finally:
+        processo.send_signal(signal.SIGTERM)
+        try:
+            processo.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            processo.kill()
+    return principal, por_worker
+
+
+def main():
+    args = parse_args()
+    if args.gerar_banco:
+        gerar_banco(args)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="bench-workers-") as diretorio:
+        geracao = subprocess.run([sys.executable, "-m", "benchmarks.worker_memory", "--gerar-banco",
+                                  "--catalogo", str(args.catalogo)], cwd=diretorio, env=ambiente(),
+                                 capture_output=True, text=True)
+        if geracao.returncode:
+            sys.exit(geracao.stderr)
+        print(f"{args.workers} workers, {args.catalogo} produtos; valores em MB (média por worker)")
+        print(f"{'modo':<10}{'RSS':>8}{'PSS':>8}{'compart.':>10}{'privada':>9}"
+              f"{'RSS princ.':>12}{'PSS total':>11}")
+        for modo in args.modos:
+            principal, por_worker = medir(modo, args, diretorio)
+            media = {campo: sum(w[campo] for w in por_worker) / len(por_worker) for campo in principal}
+            pss_total = principal["pss"] + sum(w["pss"] for w in por_worker)
+            print(f"{modo:<10}{media['rss']:>8.1f}{media['pss']:>8.1f}{media['compartilhada']:>10.1f}"
+                  f"{media['privada']:>9.1f}{principal['rss']:>12.1f}{pss_total:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
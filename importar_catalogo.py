@@ -0,0 +1,47 @@
+# importar_catalogo.py
+
+"""
+Importa produtos ou serviços de um arquivo JSON Lines ou CSV direto no banco.
+
+O arquivo é lido linha a linha e gravado em lotes, com upsert por
+(empresa_id, codigo). Ao final, mostra o relatório com linhas por segundo.
+
+Uso:
+    python importar_catalogo.py produtos catalogo.jsonl
+    python importar_catalogo.py servicos servicos.csv --empresa-id 1 --recarregar http://localhost:8000
+"""
+
+import argparse
+import json
+
+from app.models.database import engine
+from app.utils.catalog_import import CatalogImporter, FORMATOS, MODELOS, detectar_formato
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa produtos ou serviços de um arquivo JSON Lines ou CSV")
+    parser.add_argument("tipo", choices=list(MODELOS))
+    parser.add_argument("arquivo")
+    parser.add_argument("--formato", choices=FORMATOS, help="Padrão: deduzido da extensão do arquivo")
+    parser.add_argument("--empresa-id", type=int, help="Empresa dos registros sem empresa_id (padrão: a primeira)")
+    parser.add_argument("--lote", type=int, help="Registros por transação (padrão: IMPORT_BATCH_SIZE)")
+    parser.add_argument("--recarregar", metavar="URL",
+                        help="URL da aplicação em execução; ao final, chama POST /faq/reload para publicar o novo catálogo")
+    args = parser.parse_args()
+
+    importador = CatalogImporter(engine, args.tipo, detectar_formato(args.arquivo, args.formato),
+                                 args.empresa_id, args.lote)
+    with open(args.arquivo, encoding="utf-8-sig", newline="") as arquivo:
+        relatorio = importador.importar(arquivo)
+    print(json.dumps(relatorio, indent=2, ensure_ascii=False))
+
+    # O snapshot do catálogo vive no processo da aplicação: uma única recarga ao final
+    if args.recarregar:
+        import httpx
+        resposta = httpx.post(args.recarregar.rstrip("/") + "/faq/reload", timeout=60)
+        resposta.raise_for_status()
+        print("Catálogo recarregado na aplicação.")
+    else:
+        print("Use POST /faq/reload (ou --recarregar) para publicar o novo catálogo na aplicação em execução.")
+
+if __name__ == "__main__":
+    main()
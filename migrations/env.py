@@ -0,0 +1,46 @@
+# migrations/env.py
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+from sqlmodel import SQLModel
+
+from app.config.settings import Configuration
+import app.models.models  # noqa: F401  (registra as tabelas em SQLModel.metadata)
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = SQLModel.metadata
+
+def _url():
+    # Permite `alembic -x url=...`; por padrão, usa DATABASE_URL como a aplicação
+    return context.get_x_argument(as_dictionary=True).get("url") or Configuration().database_url
+
+def run_migrations_offline() -> None:
+    """Gera o SQL das migrações sem conectar ao banco (alembic upgrade --sql)."""
+    context.configure(
+        url=_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online() -> None:
+    """Aplica as migrações conectando ao banco."""
+    engine = create_engine(_url(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        # Modo batch: o SQLite não suporta a maior parte dos ALTER TABLE
+        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
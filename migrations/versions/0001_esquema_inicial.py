@@ -0,0 +1,94 @@
+"""Esquema inicial: empresa, produto, servico e faq, com os índices da listagem e da importação
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 03:43:44
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('empresa',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nome', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('descricao', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('cnpj', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('telefone', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('endereco', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('tipo', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('faq',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('chave', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('resposta', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('empresa_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['empresa_id'], ['empresa.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('produto',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nome', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('descricao', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('preco', sa.Float(), nullable=False),
+    sa.Column('categoria', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('estoque', sa.Integer(), nullable=False),
+    sa.Column('imagem', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('empresa_id', sa.Integer(), nullable=False),
+    sa.Column('codigo', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.ForeignKeyConstraint(['empresa_id'], ['empresa.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('produto', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_produto_categoria'), ['categoria'], unique=False)
+        batch_op.create_index(batch_op.f('ix_produto_codigo'), ['codigo'], unique=False)
+        batch_op.create_index(batch_op.f('ix_produto_empresa_id'), ['empresa_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_produto_preco'), ['preco'], unique=False)
+
+    op.create_table('servico',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nome', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('descricao', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('preco', sa.Float(), nullable=False),
+    sa.Column('categoria', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('imagem', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('empresa_id', sa.Integer(), nullable=False),
+    sa.Column('codigo', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.ForeignKeyConstraint(['empresa_id'], ['empresa.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('servico', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_servico_categoria'), ['categoria'], unique=False)
+        batch_op.create_index(batch_op.f('ix_servico_codigo'), ['codigo'], unique=False)
+        batch_op.create_index(batch_op.f('ix_servico_empresa_id'), ['empresa_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_servico_preco'), ['preco'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('servico', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_servico_preco'))
+        batch_op.drop_index(batch_op.f('ix_servico_empresa_id'))
+        batch_op.drop_index(batch_op.f('ix_servico_codigo'))
+        batch_op.drop_index(batch_op.f('ix_servico_categoria'))
+
+    op.drop_table('servico')
+    with op.batch_alter_table('produto', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_produto_preco'))
+        batch_op.drop_index(batch_op.f('ix_produto_empresa_id'))
+        batch_op.drop_index(batch_op.f('ix_produto_codigo'))
+        batch_op.drop_index(batch_op.f('ix_produto_categoria'))
+
+    op.drop_table('produto')
+    op.drop_table('faq')
+    op.drop_table('empresa')
@@ -0,0 +1,138 @@
+# servidor.py
+
+"""
+Servidor com vários workers que compartilham o modelo spaCy e o catálogo.
+
+O processo principal cria a aplicação, carrega o modelo spaCy e o snapshot do
+catálogo (com o índice BM25), congela os objetos no coletor de lixo
+(gc.freeze) e só então cria os workers com fork. O provedor de IA, com seus
+clientes HTTP e canais gRPC, não é seguro para fork e é criado em cada worker
+na subida. As páginas de memória
+carregadas antes do fork ficam compartilhadas (copy-on-write) entre todos os
+workers, em vez de cada um carregar a sua cópia como no `uvicorn --workers`,
+que inicia processos novos. Os workers aceitam conexões no mesmo socket e o
+processo principal recria os que terminarem inesperadamente.
+
+Escritas no catálogo feitas por um worker incrementam a versão do catálogo no
+Redis (ver VersaoCatalogo); os demais a consultam a cada
+CATALOG_VERSION_CHECK_INTERVAL segundos e só recarregam o snapshot quando ela
+muda, mantendo o compartilhado enquanto o catálogo não for alterado.
+
+Requer fork (Linux ou macOS). Em desenvolvimento, continue usando
+`uvicorn main:app --reload`.
+
+Uso:
+    python servidor.py --workers 4 --port 8000
+    python servidor.py --workers 4 --sem-precarga   # cada worker carrega os próprios modelos
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Servidor com vários workers e modelos compartilhados")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--sem-precarga", action="store_true",
+                        help="Não carrega modelos e catálogo antes do fork (cada worker carrega os seus)")
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args()
+
+def abrir_socket(host, port):
+    """Socket de escuta criado no processo principal e herdado pelos workers."""
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+def executar_worker(app, sock, args):
+    """Executado no processo filho: serve a aplicação no socket herdado."""
+    import uvicorn
+    from app.models.database import descartar_conexoes_herdadas
+
+    # O uvicorn instala os próprios tratadores de sinal
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    gc.enable()
+    descartar_conexoes_herdadas()
+    config = uvicorn.Config(app, log_level=args.log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+def iniciar_worker(app, sock, args):
+    pid = os.fork()
+    if pid == 0:
+        codigo = 0
+        try:
+            executar_worker(app, sock, args)
+        except BaseException:
+            logging.exception("Worker encerrado com erro.")
+            codigo = 1
+        finally:
+            os._exit(codigo)
+    logging.info(f"Worker {pid} iniciado.")
+    return pid
+
+def main():
+    args = parse_args()
+    if not hasattr(os, "fork"):
+        sys.exit("O servidor com vários workers requer fork (Linux ou macOS); use `uvicorn main:app`.")
+
+    # Sem coletas no processo principal: evita "buracos" em páginas que serão compartilhadas
+    gc.disable()
+    from app import create_app
+    from app.utils.readiness import prontidao
+
+    app = create_app()
+    if not args.sem_precarga:
+        inicio = time.perf_counter()
+        prontidao.precarregar()
+        logging.info(f"Modelos e catálogo pré-carregados em {time.perf_counter() - inicio:.2f}s.")
+
+    sock = abrir_socket(args.host, args.port)
+    logging.info(f"Servindo em {args.host}:{args.port} com {args.workers} workers.")
+
+    encerrando = False
+    workers = set()
+
+    def encerrar(signum, _frame):
+        nonlocal encerrando
+        encerrando = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, encerrar)
+    signal.signal(signal.SIGINT, encerrar)
+
+    # Objetos criados até aqui não são mais visitados pelo coletor nos workers,
+    # que assim não escrevem (e copiam) as páginas compartilhadas
+    gc.freeze()
+    for _ in range(args.workers):
+        workers.add(iniciar_worker(app, sock, args))
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        workers.discard(pid)
+        if not encerrando:
+            logging.warning(f"Worker {pid} terminou inesperadamente (status {status}); iniciando outro.")
+            time.sleep(1)
+            workers.add(iniciar_worker(app, sock, args))
+    sock.close()
+    logging.info("Servidor encerrado.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# tests/unit/test_catalog_cache.py
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine
+from app.models.database import DatabaseManager
+from app.models.models import Empresa, Faq, Produto
+from app.utils.catalog_cache import CatalogCache, CatalogCaches
+
+@pytest.fixture
+def engine_teste():
+    # Banco em memória compartilhado entre as sessões do teste
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(DatabaseManager().get_default_empresa())
+        session.commit()
+    return engine
+
+def test_snapshot_contem_catalogo(engine_teste):
+    """
+    Testa se o snapshot traz a empresa, os produtos e os serviços cadastrados.
+    """
+    snapshot = CatalogCache(engine_teste).get_snapshot()
+    assert snapshot.empresa.nome == "Loja Exemplo"
+    assert snapshot.nomes_produtos == ["Camiseta", "Notebook", "Caneca"]
+    assert snapshot.nomes_servicos == ["Consultoria", "Suporte Técnico"]
+    assert snapshot.produtos[1].preco == 149.99
+
+def test_snapshot_reutilizado_ate_rebuild(engine_teste):
+    """
+    Testa se o snapshot é reutilizado entre chamadas e substituído após uma escrita no catálogo.
+    """
+    cache = CatalogCache(engine_teste)
+    primeiro = cache.get_snapshot()
+    assert cache.get_snapshot() is primeiro
+
+    with Session(engine_teste) as session:
+        session.add(Produto(nome="Mochila", descricao="Mochila resistente.", preco=89.9, categoria="Acessórios",
+                            estoque=5, imagem="", codigo="MOC001", empresa_id=primeiro.empresa.id))
+        session.commit()
+
+    # Sem rebuild o snapshot antigo continua sendo servido
+    assert "Mochila" not in cache.get_snapshot().nomes_produtos
+
+    novo = cache.rebuild()
+    assert novo.versao == primeiro.versao + 1
+    assert "Mochila" in cache.get_snapshot().nomes_produtos
+    assert "Mochila" not in primeiro.nomes_produtos
+
+def test_snapshot_sem_empresa():
+    """
+    Testa o snapshot vazio quando não há empresa cadastrada.
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    snapshot = CatalogCache(engine).get_snapshot()
+    assert snapshot.empresa is None
+    assert snapshot.produtos == ()
+
+def test_catalogos_por_empresa(engine_teste):
+    """
+    Testa se cada empresa tem o seu snapshot e FAQ e se o rebuild atinge só a empresa alterada.
+    """
+    with Session(engine_teste) as session:
+        outra = Empresa(nome="Oficina", descricao="", cnpj="", telefone="", endereco="", tipo="servicos")
+        session.add(outra)
+        session.commit()
+        session.add(Faq(chave="horario", resposta="Abrimos às 8h.", empresa_id=outra.id))
+        session.commit()
+        outra_id = outra.id
+
+    catalogos = CatalogCaches(engine_teste, max_empresas=2)
+    padrao = catalogos.obter().get_snapshot()
+    assert catalogos.obter(padrao.empresa.id) is catalogos.padrao
+
+    oficina = catalogos.obter(outra_id)
+    snapshot = oficina.get_snapshot()
+    assert snapshot.empresa.nome == "Oficina"
+    assert snapshot.produtos == ()
+    assert snapshot.faq.buscar("qual o horario?") == "Abrimos às 8h."
+    assert padrao.faq.buscar("qual o horario?") is None
+    assert catalogos.obter(outra_id) is oficina
+
+    # Escrita na outra empresa não recarrega o catálogo padrão
+    catalogos.rebuild(outra_id)
+    assert oficina.get_snapshot().versao == snapshot.versao + 1
+    assert catalogos.padrao.get_snapshot() is padrao
+
+    # Empresas inexistentes não têm empresa no snapshot e podem ser descartadas
+    assert catalogos.obter(999).get_snapshot().empresa is None
+    catalogos.descartar(999)
+    assert len(catalogos) == 1
+
+class RedisVersoes:
+    """Redis em memória com os comandos de hash usados pela versão do catálogo."""
+
+    def __init__(self):
+        self.versoes = {}
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self):
+        pass
+
+    def hincrby(self, chave, campo, valor):
+        self.versoes[campo] = str(int(self.versoes.get(campo, 0)) + valor)
+
+    def hmget(self, chave, campos):
+        return [self.versoes.get(campo) for campo in campos]
+
+def test_escrita_em_um_worker_recarrega_os_demais(engine_teste):
+    """
+    Testa se a versão publicada no Redis faz outro processo recarregar o catálogo, sem depender da idade máxima.
+    """
+    from app.utils.catalog_cache import VersaoCatalogo
+
+    redis_client = RedisVersoes()
+    worker_a, worker_b = (
+        CatalogCaches(engine_teste, versoes=VersaoCatalogo(redis_client, object(), namespace="t", intervalo=0))
+        for _ in range(2)
+    )
+    for worker in (worker_a, worker_b):
+        worker.padrao.max_age = 0
+    antes = worker_b.obter().get_snapshot()
+    assert worker_b.obter().get_snapshot() is antes
+
+    with Session(engine_teste) as session:
+        session.add(Produto(nome="Caneca", descricao="", preco=9.9, categoria="Casa", estoque=1, imagem="",
+                            codigo="CAN1", empresa_id=antes.empresa.id))
+        session.commit()
+    worker_a.rebuild(antes.empresa.id)
+
+    depois = worker_b.obter().get_snapshot()
+    assert depois is not antes
+    assert "Caneca" in depois.nomes_produtos
+    assert worker_b.obter().get_snapshot() is depois
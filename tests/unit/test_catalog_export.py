@@ -0,0 +1,36 @@
+# tests/unit/test_catalog_export.py
+import json
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine
+from app.models.database import DatabaseManager
+from app.models.models import Produto
+from app.utils.catalog_export import exportar_ndjson
+
+@pytest.fixture
+def engine_teste():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(DatabaseManager().get_default_empresa())
+        session.commit()
+    return engine
+
+def test_exporta_ndjson_em_lotes(engine_teste):
+    """
+    Testa se a exportação gera uma linha JSON por item, em lotes, respeitando filtros e projeção.
+    """
+    trechos = list(exportar_ndjson(engine_teste, Produto, tamanho_lote=2))
+    linhas = [json.loads(linha) for linha in b"".join(trechos).decode("utf-8").splitlines()]
+    assert len(trechos) == 2
+    assert [p["codigo"] for p in linhas] == ["CAM123", "NB456", "CAN789"]
+    assert linhas[0]["descricao"] == "Camiseta de algodão, confortável e durável."
+
+    filtrado = b"".join(exportar_ndjson(engine_teste, Produto, campos="nome,preco", preco_max=20))
+    assert [json.loads(l) for l in filtrado.splitlines()] == [
+        {"id": 1, "nome": "Camiseta", "preco": 19.99},
+        {"id": 3, "nome": "Caneca", "preco": 9.99},
+    ]
+
+    with pytest.raises(ValueError):
+        exportar_ndjson(engine_teste, Produto, campos="senha")
@@ -0,0 +1,91 @@
+# tests/unit/test_catalog_import.py
+import asyncio
+import json
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine, select
+from app.models.database import DatabaseManager
+from app.models.models import Produto
+from app.utils.catalog_import import CatalogImporter, LeitorRegistros, linhas_do_stream
+
+@pytest.fixture
+def engine_teste():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(DatabaseManager().get_default_empresa())
+        session.commit()
+    return engine
+
+def _produto(codigo, nome, preco=10.0):
+    return json.dumps({"nome": nome, "descricao": "", "preco": preco, "categoria": "Geral",
+                       "estoque": 1, "imagem": "", "codigo": codigo}) + "\n"
+
+def test_leitor_csv_com_quebra_de_linha():
+    """
+    Testa a leitura de CSV linha a linha, incluindo campo entre aspas com quebra de linha.
+    """
+    leitor = LeitorRegistros("csv")
+    linhas = ["nome,descricao,preco\n", 'Caneca,"Caneca\n', 'térmica",9.9\n']
+    registros = [r for r in map(leitor.ler, linhas) if r is not None]
+    assert registros == [{"nome": "Caneca", "descricao": "Caneca\ntérmica", "preco": "9.9"}]
+
+def test_upsert_por_codigo_em_lotes(engine_teste):
+    """
+    Testa se registros com código existente são atualizados e os demais inseridos, em vários lotes.
+    """
+    linhas = [_produto("CAM123", "Camiseta Nova", 25.0)] + [_produto(f"X{i}", f"Item {i}") for i in range(5)]
+    relatorio = CatalogImporter(engine_teste, "produtos", tamanho_lote=2).importar(linhas)
+
+    assert (relatorio["inseridos"], relatorio["atualizados"], relatorio["rejeitados"]) == (5, 1, 0)
+    with Session(engine_teste) as session:
+        produtos = session.exec(select(Produto)).all()
+        assert len(produtos) == 8
+        camiseta = session.exec(select(Produto).where(Produto.codigo == "CAM123")).one()
+        assert (camiseta.nome, camiseta.preco) == ("Camiseta Nova", 25.0)
+
+def test_linhas_invalidas_sao_rejeitadas(engine_teste):
+    """
+    Testa se linhas mal formadas ou incompletas são relatadas sem interromper a importação.
+    """
+    async def corpo():
+        # Trechos que cortam as linhas ao meio, como em um upload em streaming
+        texto = "{quebrado\n" + json.dumps({"nome": "Sem preço", "codigo": "Z1"}) + "\n" + _produto("Z2", "Ok")
+        dados = texto.encode("utf-8")
+        for i in range(0, len(dados), 7):
+            yield dados[i:i + 7]
+
+    importador = CatalogImporter(engine_teste, "produtos")
+    relatorio = asyncio.run(importador.aimportar(linhas_do_stream(corpo())))
+    assert relatorio["inseridos"] == 1
+    assert relatorio["rejeitados"] == 2
+    assert [erro["linha"] for erro in relatorio["erros"]] == [1, 2]
+
+def test_erro_do_banco_no_lote_e_relatado(engine_teste):
+    """
+    Testa se um lote recusado pelo banco é relatado como rejeitado, mantendo os lotes já gravados.
+    """
+    def linhas():
+        yield _produto("A1", "Item A1")
+        yield _produto("A2", "Item A2")
+        # O primeiro lote já foi gravado; o próximo encontra a tabela removida
+        Produto.__table__.drop(engine_teste)
+        yield _produto("A3", "Item A3")
+
+    importador = CatalogImporter(engine_teste, "produtos", tamanho_lote=2)
+    relatorio = importador.importar(linhas())
+    assert (relatorio["inseridos"], relatorio["rejeitados"]) == (2, 1)
+    assert "não gravado" in relatorio["erros"][0]["erro"]
+    assert importador.gravou
+
+def test_empresa_inexistente_e_rejeitada(engine_teste):
+    """
+    Testa se registros de empresas não cadastradas são rejeitados e se a empresa informada é verificada.
+    """
+    linha = json.loads(_produto("E1", "Órfão"))
+    relatorio = CatalogImporter(engine_teste, "produtos").importar([json.dumps({**linha, "empresa_id": 99}) + "\n"])
+    assert (relatorio["inseridos"], relatorio["rejeitados"]) == (0, 1)
+    assert "não cadastrada" in relatorio["erros"][0]["erro"]
+
+    with pytest.raises(ValueError):
+        CatalogImporter(engine_teste, "produtos", empresa_id=99).importar([_produto("E2", "Outro")])
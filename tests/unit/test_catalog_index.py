@@ -0,0 +1,100 @@
+# tests/unit/test_catalog_index.py
+from app.utils.catalog_cache import CatalogSnapshot, ItemCatalogo
+from app.utils.catalog_index import CatalogIndex
+
+def _snapshot(versao, *itens):
+    produtos = tuple(i for i in itens if i.tipo == "produto")
+    servicos = tuple(i for i in itens if i.tipo == "servico")
+    return CatalogSnapshot(versao, None, produtos, servicos, 0.0)
+
+def _produto(id, nome):
+    return ItemCatalogo(id, "produto", nome, "", 10.0, "Geral", f"P{id}", 1)
+
+def _servico(id, nome):
+    return ItemCatalogo(id, "servico", nome, "", 10.0, "Geral", f"S{id}")
+
+def _nomes(itens):
+    return [item.nome for item in itens]
+
+def test_busca_exata_plural_e_acentos():
+    """
+    Testa se o índice casa nomes independentemente de plural, maiúsculas e acentos.
+    """
+    indice = CatalogIndex()
+    indice.sincronizar(_snapshot(1, _produto(1, "Camiseta"), _produto(2, "Notebook"), _servico(1, "Suporte Técnico")))
+    assert _nomes(indice.buscar(["camisetas"])) == ["Camiseta"]
+    assert _nomes(indice.buscar(["tecnico"])) == ["Suporte Técnico"]
+
+def test_nome_com_varias_palavras_ordena_por_cobertura():
+    """
+    Testa se itens com maior parte do nome presente na mensagem aparecem primeiro.
+    """
+    indice = CatalogIndex()
+    indice.sincronizar(_snapshot(1, _servico(1, "Suporte Técnico"), _servico(2, "Suporte Remoto Premium")))
+    assert _nomes(indice.buscar(["suporte", "técnico"])) == ["Suporte Técnico", "Suporte Remoto Premium"]
+
+def test_busca_parcial_e_sinonimos():
+    """
+    Testa a busca por prefixo e a expansão de sinônimos.
+    """
+    indice = CatalogIndex(sinonimos={"laptop": "notebook"})
+    indice.sincronizar(_snapshot(1, _produto(1, "Notebook Gamer"), _produto(2, "Caneca")))
+    assert _nomes(indice.buscar(["note"])) == ["Notebook Gamer"]
+    assert _nomes(indice.buscar(["laptop"])) == ["Notebook Gamer"]
+    assert indice.buscar(["geladeira"]) == []
+
+def test_filtro_por_tipo():
+    """
+    Testa se a busca respeita os tipos de item aceitos.
+    """
+    indice = CatalogIndex()
+    indice.sincronizar(_snapshot(1, _produto(1, "Consultoria em Caixa"), _servico(1, "Consultoria")))
+    assert _nomes(indice.buscar(["consultoria"], tipos={"servico"})) == ["Consultoria"]
+
+def test_sincronizacao_incremental():
+    """
+    Testa se itens alterados e removidos são refletidos após uma nova sincronização.
+    """
+    indice = CatalogIndex()
+    indice.sincronizar(_snapshot(1, _produto(1, "Camiseta"), _produto(2, "Caneca")))
+    indice.sincronizar(_snapshot(2, _produto(1, "Camiseta Polo"), _produto(3, "Mochila")))
+    assert indice.versao == 2
+    assert len(indice) == 2
+    assert indice.buscar(["caneca"]) == []
+    assert _nomes(indice.buscar(["polo"])) == ["Camiseta Polo"]
+    assert _nomes(indice.buscar(["mochila"])) == ["Mochila"]
+
+def test_contendo_durante_sincronizacao_concorrente():
+    """
+    Testa se contendo não falha enquanto outra thread remove e readiciona itens do índice.
+    """
+    import sys
+    import threading
+
+    indice = CatalogIndex()
+    completo = _snapshot(1, *(_produto(i, f"Notebook Gamer {i}") for i in range(300)))
+    metade = _snapshot(2, *(_produto(i, f"Notebook Gamer {i}") for i in range(0, 300, 2)))
+    indice.sincronizar(completo)
+    erros, terminou = [], threading.Event()
+
+    def sincronizar():
+        for i in range(100):
+            indice.sincronizar(metade if i % 2 == 0 else completo)
+        terminou.set()
+
+    intervalo = sys.getswitchinterval()
+    # Trocas de thread frequentes para intercalar remover e contendo
+    sys.setswitchinterval(1e-6)
+    try:
+        escritor = threading.Thread(target=sincronizar)
+        escritor.start()
+        while not terminou.is_set():
+            try:
+                indice.contendo({"notebook", "gamer"}, limite=500)
+            except Exception as e:
+                erros.append(e)
+        escritor.join()
+    finally:
+        sys.setswitchinterval(intervalo)
+    assert not erros
+    assert len(indice.contendo({"notebook", "gamer"}, limite=500)) == 300
@@ -0,0 +1,34 @@
+# tests/unit/test_catalog_retriever.py
+
+from app.utils.catalog_cache import ItemCatalogo
+from app.utils.catalog_retriever import CatalogRetriever
+
+ITENS = [
+    ItemCatalogo(1, "produto", "Notebook Gamer", "Placa de vídeo dedicada para jogos", 5000.0, "Informática", "P1"),
+    ItemCatalogo(2, "produto", "Cadeira Ergonômica", "Apoio lombar para longas jornadas", 900.0, "Móveis", "P2"),
+    ItemCatalogo(3, "produto", "Smartphone", "Tela AMOLED e câmera tripla", 2500.0, "Telefonia", "P3"),
+    ItemCatalogo(1, "servico", "Instalação de Rede", "Cabeamento e configuração de roteadores", 300.0, "Infraestrutura", "S1"),
+]
+
+def test_ranqueia_pela_descricao():
+    """Itens são encontrados por termos da descrição, não só do nome."""
+    retriever = CatalogRetriever(ITENS)
+    itens = retriever.buscar("quero algo bom para jogos")
+    assert itens[0].nome == "Notebook Gamer"
+
+def test_nome_pesa_mais_que_descricao():
+    """Um termo no nome vale mais que o mesmo termo apenas na descrição."""
+    itens = ITENS + [ItemCatalogo(4, "produto", "Capa", "Capa para smartphone", 50.0, "Acessórios", "P4")]
+    retriever = CatalogRetriever(itens)
+    assert [i.nome for i in retriever.buscar("smartphone")] == ["Smartphone", "Capa"]
+
+def test_sinonimos_e_filtro_de_tipo():
+    """Sinônimos são aplicados e o filtro de tipos é respeitado."""
+    retriever = CatalogRetriever(ITENS, sinonimos={"celular": "smartphone"})
+    assert [i.nome for i in retriever.buscar("celulares")] == ["Smartphone"]
+    assert retriever.buscar("celular", tipos={"servico"}) == []
+
+def test_sem_termos_relevantes():
+    """Mensagens sem termos do catálogo não retornam itens."""
+    assert CatalogRetriever(ITENS).buscar("bom dia") == []
+    assert CatalogRetriever([]).buscar("notebook") == []
@@ -0,0 +1,52 @@
+# tests/unit/test_database.py
+import asyncio
+from sqlalchemy import text
+from sqlmodel import Session
+from app.models.database import DatabaseManager, get_engine, get_async_engine, url_async
+from app.utils.catalog_cache import CatalogCache
+
+def test_engine_compartilhado_e_ajustado(tmp_path):
+    """
+    Testa se os gerenciadores do mesmo banco compartilham um único engine com WAL e os pragmas configurados.
+    """
+    caminho = str(tmp_path / "teste.db")
+    url = f"sqlite:///{caminho}"
+    assert DatabaseManager(db_name=caminho).engine is DatabaseManager(db_url=url).engine
+    assert get_engine(url) is DatabaseManager(db_name=caminho).engine
+
+    with get_engine(url).connect() as conexao:
+        assert conexao.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conexao.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conexao.execute(text("PRAGMA cache_size")).scalar() < 0
+    get_engine(url).dispose()
+
+def test_url_async():
+    """
+    Testa a dedução da URL com driver assíncrono a partir da URL síncrona.
+    """
+    assert url_async("sqlite:///workana.db") == "sqlite+aiosqlite:///workana.db"
+    assert url_async("postgresql://u:s@db/loja") == "postgresql+asyncpg://u:s@db/loja"
+
+def test_catalogo_recarregado_pelo_engine_assincrono(tmp_path):
+    """
+    Testa se o snapshot carregado pelo engine assíncrono é igual ao carregado pelo síncrono.
+    """
+    url = f"sqlite:///{tmp_path / 'catalogo.db'}"
+    gerenciador = DatabaseManager(db_url=url)
+    gerenciador.create_tables()
+    with Session(gerenciador.engine) as session:
+        session.add(gerenciador.get_default_empresa())
+        session.commit()
+
+    async def carregar():
+        cache = CatalogCache(gerenciador.engine, async_engine=get_async_engine(url_async(url)))
+        snapshot = await cache.aget_snapshot()
+        await cache.async_engine.dispose()
+        return snapshot
+
+    assincrono = asyncio.run(carregar())
+    sincrono = CatalogCache(gerenciador.engine).get_snapshot()
+    assert assincrono.versao == 1
+    assert assincrono.nomes_produtos == ["Camiseta", "Notebook", "Caneca"]
+    assert assincrono.assinatura == sincrono.assinatura
+    gerenciador.engine.dispose()
@@ -0,0 +1,54 @@
+# tests/unit/test_faq_matcher.py
+import pytest
+from app.utils.faq_matcher import FaqMatcher
+
+@pytest.fixture
+def matcher():
+    return FaqMatcher([
+        ("politica de troca", "troca"),
+        ("trocas", "trocas"),
+        ("devoluções", "devolucao"),
+        ("entrega rj", "entrega"),
+        ("entregas rio de janeiro", "entrega"),
+    ])
+
+@pytest.mark.parametrize("mensagem, esperado", [
+    ("Qual a POLÍTICA DE TROCA?", "troca"),
+    ("Vocês aceitam trocas?", "trocas"),
+    ("como funcionam as devolucoes", "devolucao"),
+    ("Fazem entregas Rio de Janeiro?", "entrega"),
+    ("tem entrega rj", "entrega"),
+])
+def test_busca_normaliza_acentos_e_caixa(matcher, mensagem, esperado):
+    """
+    Testa se as chaves casam independentemente de acentos e maiúsculas.
+    """
+    assert matcher.buscar(mensagem) == esperado
+
+def test_busca_respeita_limite_de_palavra(matcher):
+    """
+    Testa se chaves não casam dentro de outras palavras.
+    """
+    assert matcher.buscar("entregarj") is None
+    assert matcher.buscar("destrocas") is None
+
+def test_prioridade_segue_ordem_do_cadastro(matcher):
+    """
+    Testa se, com várias chaves presentes, vence a cadastrada primeiro.
+    """
+    assert matcher.buscar("trocas e politica de troca") == "troca"
+
+def test_padroes_sobrepostos():
+    """
+    Testa padrões que são sufixos/prefixos uns dos outros (links de falha do autômato).
+    """
+    matcher = FaqMatcher([("he", "he"), ("she", "she"), ("hers", "hers")])
+    assert matcher.buscar("she said") == "she"
+    assert matcher.buscar("is it hers") == "hers"
+    assert matcher.buscar("ushers") is None
+
+def test_faq_vazio():
+    """
+    Testa o casador sem entradas.
+    """
+    assert FaqMatcher().buscar("qualquer coisa") is None
@@ -0,0 +1,55 @@
+# tests/unit/test_intent_engine.py
+import pytest
+from app.utils.catalog_cache import CatalogSnapshot, EmpresaSnapshot, ItemCatalogo
+from app.utils.catalog_index import CatalogIndex
+from app.utils.intent_engine import MotorIntencoes
+from app.utils.spacy_utils import SINONIMOS
+
+ITENS = (
+    ItemCatalogo(1, "produto", "Camiseta", "Algodão", 49.9, "Roupas", "P1", 50),
+    ItemCatalogo(2, "produto", "Notebook", "i5", 3500.0, "Eletrônicos", "P2", 0),
+    ItemCatalogo(3, "produto", "Notebook Gamer", "i7", 7200.5, "Eletrônicos", "P3", 3),
+    ItemCatalogo(1, "servico", "Consultoria", "Por hora", 300.0, "Consultoria", "S1"),
+)
+EMPRESA = EmpresaSnapshot(1, "Loja", "", "", "(11) 0000-0000", "Rua das Flores, 10", "produtos_servicos")
+
+@pytest.fixture
+def motor():
+    indice = CatalogIndex(sinonimos=SINONIMOS)
+    indice.sincronizar(CatalogSnapshot(1, None, ITENS[:3], ITENS[3:], 0.0))
+    motor = MotorIntencoes(EMPRESA, ITENS, max_itens=5)
+    return lambda mensagem, tipos=None: motor.responder(mensagem, indice, tipos)
+
+def test_preco_de_um_ou_varios_itens(motor):
+    """O preço vem do catálogo; sem especificar o modelo, todos os itens citados são listados."""
+    resposta = motor("Quanto custa o notebook gamer?")
+    assert (resposta.intencao, resposta.resposta) == ("preco", "Notebook Gamer custa R$ 7.200,50.")
+    assert motor("Qual o preço do computador?").resposta == (
+        "Preços:\n- Notebook: R$ 3.500,00\n- Notebook Gamer: R$ 7.200,50"
+    )
+    assert motor("Qual o valor da consultoria?").resposta == "Consultoria custa R$ 300,00."
+
+def test_estoque_apenas_de_produtos(motor):
+    """Estoque é respondido para produtos; serviços seguem para a IA."""
+    assert motor("Tem camiseta em estoque?").resposta == "Temos Camiseta em estoque (50 unidades)."
+    assert motor("o notebook gamer está disponível?").intencao == "estoque"
+    assert "Notebook: sem estoque" in motor("ainda tem notebook?").resposta
+    assert motor("a consultoria está disponível?") is None
+
+def test_contato_endereco_e_categoria(motor):
+    """Telefone e endereço vêm da empresa; categorias listam os itens com preço."""
+    assert motor("Qual o telefone de contato?").resposta == "Nosso telefone de contato é (11) 0000-0000."
+    assert motor("Onde vocês ficam?").resposta == "Nosso endereço é Rua das Flores, 10."
+    assert motor("Quais produtos de eletrônicos vocês têm?").resposta == (
+        "Em Eletrônicos, temos:\n- Notebook (R$ 3.500,00)\n- Notebook Gamer (R$ 7.200,50)"
+    )
+    assert motor("Quais categorias vocês têm?", {"produto"}).resposta == (
+        "Trabalhamos com as categorias: Eletrônicos, Roupas."
+    )
+
+def test_sem_intencao_segue_para_a_ia(motor):
+    """Perguntas sem intenção reconhecida, ou sobre itens fora do catálogo, não são respondidas."""
+    assert motor("Vocês têm camiseta?") is None
+    assert motor("Quanto custa a entrega?") is None
+    assert motor("Qual o telefone mais barato?") is None
+    assert motor("Qual o preço da consultoria?", {"produto"}) is None
@@ -0,0 +1,49 @@
+# tests/unit/test_metrics.py
+from app.utils.metrics import RegistroMetricas
+
+def test_contador_e_medidor():
+    """Contadores acumulam por rótulo e medidores acompanham blocos em andamento."""
+    registro = RegistroMetricas()
+    respostas = registro.contador("respostas_total", "Respostas.", ("origem",))
+    em_andamento = registro.medidor("em_andamento", "Em andamento.", ("rota",))
+
+    respostas.inc(origem="faq")
+    respostas.inc(2, origem="faq")
+    with em_andamento.acompanhar(rota="chat"):
+        assert em_andamento.valor(rota="chat") == 1
+    assert em_andamento.valor(rota="chat") == 0
+
+    texto = registro.renderizar()
+    assert "# TYPE respostas_total counter" in texto
+    assert 'respostas_total{origem="faq"} 3' in texto
+    assert 'em_andamento{rota="chat"} 0' in texto
+
+def test_histograma_cumulativo():
+    """As faixas do histograma são exportadas de forma cumulativa, com soma e contagem."""
+    registro = RegistroMetricas()
+    etapas = registro.histograma("etapa_segundos", "Etapas.", ("etapa",), buckets=(0.1, 1))
+
+    for valor in (0.05, 0.1, 0.5, 3):
+        etapas.observar(valor, etapa="llm")
+    with etapas.medir(etapa="cache"):
+        pass
+
+    texto = registro.renderizar()
+    assert 'etapa_segundos_bucket{etapa="llm",le="0.1"} 2' in texto
+    assert 'etapa_segundos_bucket{etapa="llm",le="1.0"} 3' in texto
+    assert 'etapa_segundos_bucket{etapa="llm",le="+Inf"} 4' in texto
+    assert 'etapa_segundos_sum{etapa="llm"} 3.65' in texto
+    assert 'etapa_segundos_count{etapa="llm"} 4' in texto
+    assert etapas.contagem(etapa="cache") == 1
+
+def test_coletores_e_registro_unico():
+    """Coletores são exportados na leitura e registrar de novo substitui o anterior."""
+    registro = RegistroMetricas()
+    assert registro.contador("x_total", "X.") is registro.contador("x_total", "X.")
+
+    registro.registrar_coletor("cache", lambda: [("cache_hits", "counter", "Hits.", [({"camada": "memoria"}, 1)])])
+    registro.registrar_coletor("cache", lambda: [("cache_hits", "counter", "Hits.", [({"camada": "memoria"}, 5)])])
+
+    texto = registro.renderizar()
+    assert texto.count("# TYPE cache_hits counter") == 1
+    assert 'cache_hits{camada="memoria"} 5' in texto
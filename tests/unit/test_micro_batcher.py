@@ -0,0 +1,61 @@
+# tests/unit/test_micro_batcher.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.utils.micro_batcher import MicroBatcher
+
+def test_chamadas_concorrentes_sao_agrupadas():
+    """
+    Testa se chamadas simultâneas são processadas em poucos lotes, com os resultados na ordem certa.
+    """
+    lotes = []
+
+    def dobrar(itens):
+        lotes.append(len(itens))
+        return [item * 2 for item in itens]
+
+    async def executar():
+        batcher = MicroBatcher(dobrar, ThreadPoolExecutor(max_workers=1), max_lote=8, max_espera=0.01)
+        return await asyncio.gather(*(batcher.submeter(i) for i in range(20)))
+
+    assert asyncio.run(executar()) == [i * 2 for i in range(20)]
+    assert sum(lotes) == 20
+    assert max(lotes) <= 8
+    assert len(lotes) < 20
+
+def test_erro_no_lote_propaga_para_as_chamadas():
+    """
+    Testa se uma falha no processamento do lote é repassada a quem aguardava.
+    """
+    def falhar(itens):
+        raise ValueError("falha no lote")
+
+    async def executar():
+        batcher = MicroBatcher(falhar, ThreadPoolExecutor(max_workers=1))
+        return await batcher.submeter("mensagem")
+
+    with pytest.raises(ValueError):
+        asyncio.run(executar())
+
+def test_lotes_em_andamento_mantem_referencia():
+    """
+    Testa se o lote em processamento fica referenciado até terminar e é descartado em seguida.
+    """
+    liberar = threading.Event()
+
+    def aguardar(itens):
+        liberar.wait(1)
+        return itens
+
+    async def executar():
+        batcher = MicroBatcher(aguardar, ThreadPoolExecutor(max_workers=1), max_espera=0)
+        pendente = asyncio.ensure_future(batcher.submeter("mensagem"))
+        await asyncio.sleep(0.01)
+        em_andamento = len(batcher._lotes)
+        liberar.set()
+        resultado = await pendente
+        await asyncio.sleep(0)
+        return em_andamento, resultado, len(batcher._lotes)
+
+    assert asyncio.run(executar()) == (1, "mensagem", 0)
@@ -0,0 +1,58 @@
+# tests/unit/test_pagination.py
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine
+from app.models.database import DatabaseManager
+from app.models.models import Produto
+from app.utils.pagination import paginar, codificar_cursor, decodificar_cursor
+
+@pytest.fixture
+def session_teste():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        empresa = DatabaseManager().get_default_empresa()
+        session.add(empresa)
+        session.commit()
+        session.add_all([
+            Produto(nome=f"Produto {i}", descricao="", preco=float(i), categoria="Par" if i % 2 == 0 else "Ímpar",
+                    estoque=1, imagem="", codigo=f"P{i}", empresa_id=empresa.id)
+            for i in range(20)
+        ])
+        session.commit()
+        yield session
+
+def test_percorre_todas_as_paginas(session_teste):
+    """
+    Testa se as páginas seguidas pelo cursor cobrem todos os itens, sem repetição.
+    """
+    ids, cursor, paginas = [], None, 0
+    while True:
+        pagina = paginar(session_teste, Produto, cursor, limite=7)
+        ids.extend(p.id for p in pagina["itens"])
+        paginas += 1
+        cursor = pagina["proximo_cursor"]
+        if cursor is None:
+            break
+    assert len(ids) == 23  # 3 produtos da empresa padrão + 20
+    assert ids == sorted(set(ids))
+    assert paginas == 4
+
+def test_filtros_e_projecao(session_teste):
+    """
+    Testa os filtros por categoria e faixa de preço e a projeção de campos.
+    """
+    pagina = paginar(session_teste, Produto, campos="nome,preco", categoria="Par", preco_min=4, preco_max=10)
+    assert [item["preco"] for item in pagina["itens"]] == [4.0, 6.0, 8.0, 10.0]
+    assert set(pagina["itens"][0]) == {"id", "nome", "preco"}
+    assert pagina["proximo_cursor"] is None
+
+def test_entradas_invalidas(session_teste):
+    """
+    Testa a rejeição de cursores e campos inválidos.
+    """
+    assert decodificar_cursor(codificar_cursor(42)) == 42
+    with pytest.raises(ValueError):
+        paginar(session_teste, Produto, cursor="!!!")
+    with pytest.raises(ValueError):
+        paginar(session_teste, Produto, campos="nome,senha")
@@ -0,0 +1,64 @@
+# tests/unit/test_prompt_builder.py
+
+from app.gateway.prompt_builder import PromptBuilder, estimar_tokens, formatar_preco
+from app.utils.catalog_cache import ItemCatalogo
+
+def _produto(i, descricao="Descrição do produto"):
+    return ItemCatalogo(i, "produto", f"Produto {i}", descricao, 1234.5, "Categoria", f"P{i}")
+
+def test_item_com_preco_e_descricao():
+    """Cada item aparece com preço no formato brasileiro, categoria e descrição."""
+    builder = PromptBuilder("Ana")
+    assert formatar_preco(1234.5) == "R$ 1.234,50"
+    assert builder.formatar_item(_produto(1)) == "- Produto 1 (R$ 1.234,50; Categoria): Descrição do produto"
+    assert builder.formatar_item("Consultoria") == "- Consultoria"
+
+def test_respeita_orcamento_de_tokens():
+    """Itens que não cabem no orçamento são descartados, mantendo a ordem de relevância."""
+    builder = PromptBuilder("Ana", max_tokens=100)
+    contexto = builder.montar_contexto([_produto(i) for i in range(50)], [])
+    assert estimar_tokens(contexto) <= 110
+    assert "Produto 0 " in contexto
+    assert "Produto 49 " not in contexto
+
+def test_alterna_produtos_e_servicos():
+    """Com orçamento curto, produtos e serviços dividem o espaço."""
+    builder = PromptBuilder("Ana", max_tokens=60)
+    servicos = [ItemCatalogo(i, "servico", f"Serviço {i}", "", 10.0, "", f"S{i}") for i in range(10)]
+    contexto = builder.montar_contexto([_produto(i) for i in range(10)], servicos)
+    assert "Produtos:" in contexto and "Serviços:" in contexto
+
+def test_descricao_longa_e_truncada():
+    """Descrições longas são cortadas no limite configurado."""
+    builder = PromptBuilder("Ana", max_descricao=20)
+    linha = builder.formatar_item(_produto(1, descricao="x" * 100))
+    assert linha.endswith("...")
+    assert len(linha.split(": ", 1)[1]) == 20
+
+def test_mensagens_de_chat():
+    """O prompt de chat traz as instruções, o contexto e a pergunta do usuário."""
+    mensagens = PromptBuilder("Ana").montar_mensagens([], [], "Olá")
+    assert mensagens[0]["role"] == "system"
+    assert "Ana" in mensagens[0]["content"]
+    assert "Nenhum item do catálogo" in mensagens[0]["content"]
+    assert mensagens[1] == {"role": "user", "content": "Olá"}
+
+def test_historico_dentro_do_orcamento():
+    """Entram os turnos mais recentes que cabem no orçamento e, se sobrar espaço, o resumo."""
+    from app.utils.session_store import HistoricoSessao
+
+    builder = PromptBuilder("Ana", max_tokens_historico=12)
+    historico = HistoricoSessao("O cliente já perguntou: frete.", (
+        ("Tem notebook?", "Temos o Notebook X por R$ 3.000,00."),
+        ("E a garantia?", "Um ano."),
+    ))
+    mensagens = builder.montar_mensagens([], [], "Parcela?", historico)
+    assert [m["role"] for m in mensagens] == ["system", "user", "assistant", "user"]
+    assert mensagens[1]["content"] == "E a garantia?"
+    assert "Conversa anterior" not in mensagens[0]["content"]
+
+    builder = PromptBuilder("Ana", max_tokens_historico=200)
+    prompt = builder.montar_prompt([], [], "Parcela?", historico)
+    assert "Conversa anterior: O cliente já perguntou: frete." in prompt
+    assert "Cliente: Tem notebook?\nAssistente: Temos o Notebook X" in prompt
+    assert builder.montar_mensagens([], [], "oi") == builder.montar_mensagens([], [], "oi", HistoricoSessao())
@@ -0,0 +1,32 @@
+# tests/unit/test_provider_factory.py
+import asyncio
+from app.gateway.provider_factory import get_ia_provider
+from app.gateway.mock_provider import MockProvider
+
+def test_get_ia_provider_retorna_singleton():
+    """
+    Testa se o provedor de IA é criado uma única vez e reutilizado.
+    """
+    assert get_ia_provider() is get_ia_provider()
+
+def test_mock_provider_agerar_resposta():
+    """
+    Testa a versão assíncrona do MockProvider.
+    """
+    provedor = MockProvider(mock_file="inexistente.json", latency_ms=0)
+    resposta = asyncio.run(provedor.agerar_resposta([], [], "Olá"))
+    assert resposta == provedor.gerar_resposta([], [], "Olá")
+
+def test_mock_provider_astream_resposta():
+    """
+    Testa se o streaming do MockProvider emite vários trechos que, juntos, formam a resposta completa.
+    """
+    provedor = MockProvider(mock_file="inexistente.json", latency_ms=0)
+    provedor.stream_interval = 0
+
+    async def coletar():
+        return [trecho async for trecho in provedor.astream_resposta([], [], "Olá")]
+
+    trechos = asyncio.run(coletar())
+    assert len(trechos) > 1
+    assert "".join(trechos) == provedor.gerar_resposta([], [], "Olá")
@@ -0,0 +1,174 @@
+# tests/unit/test_provider_router.py
+import asyncio
+import pytest
+from app.gateway.ia_provider import IAProvider
+from app.gateway.circuit_breaker import CircuitBreaker
+from app.gateway.provider_router import ProviderRouter
+from app.exceptions.ia_provider_error import IAProviderError, IAProviderIndisponivelError, IAProviderTimeoutError
+
+class FakeProvider(IAProvider):
+    """Provedor local com atraso e falha configuráveis."""
+
+    def __init__(self, resposta, atraso=0.0, falhar=False):
+        self.resposta = resposta
+        self.atraso = atraso
+        self.falhar = falhar
+        self.chamadas = 0
+        self.cancelados = 0
+
+    def gerar_resposta(self, produtos, servicos, mensagem):
+        self.chamadas += 1
+        if self.falhar:
+            raise IAProviderError("falha simulada")
+        return self.resposta
+
+    async def agerar_resposta(self, produtos, servicos, mensagem):
+        self.chamadas += 1
+        try:
+            await asyncio.sleep(self.atraso)
+        except asyncio.CancelledError:
+            self.cancelados += 1
+            raise
+        if self.falhar:
+            raise IAProviderError("falha simulada")
+        return self.resposta
+
+def _roteador(provedores, **kwargs):
+    kwargs.setdefault("timeout", 1.0)
+    kwargs.setdefault("atraso_hedge", 0.05)
+    kwargs.setdefault("atraso_minimo", 0.01)
+    kwargs.setdefault("limite_falhas", 2)
+    kwargs.setdefault("tempo_abertura", 60)
+    return ProviderRouter(provedores, **kwargs)
+
+def test_hedge_dispara_segundo_provedor_quando_o_primeiro_demora():
+    """O segundo provedor é chamado após o atraso do hedge e o mais lento é cancelado."""
+    lento, rapido = FakeProvider("lento", atraso=0.5), FakeProvider("rapido", atraso=0.01)
+    roteador = _roteador({"lento": lento, "rapido": rapido}, modo="hedge")
+
+    assert asyncio.run(roteador.agerar_resposta([], [], "oi")) == "rapido"
+    assert lento.cancelados == 1
+    assert roteador.hedges_disparados == 1
+
+def test_hedge_nao_dispara_quando_o_primeiro_e_rapido():
+    """Se o primeiro provedor responde antes do atraso, o segundo nem é chamado."""
+    primeiro, segundo = FakeProvider("a"), FakeProvider("b")
+    roteador = _roteador({"a": primeiro, "b": segundo}, modo="hedge")
+
+    assert asyncio.run(roteador.agerar_resposta([], [], "oi")) == "a"
+    assert segundo.chamadas == 0
+
+def test_failover_apos_erro_e_timeout():
+    """Falhas e tempo limite estourado passam a vez ao próximo provedor."""
+    roteador = _roteador({
+        "erro": FakeProvider("x", falhar=True),
+        "travado": FakeProvider("y", atraso=5),
+        "ok": FakeProvider("ok")
+    }, modo="failover", timeout=0.05)
+
+    assert asyncio.run(roteador.agerar_resposta([], [], "oi")) == "ok"
+    estatisticas = roteador.estatisticas()
+    assert estatisticas["erro"]["falhas"] == 1
+    assert estatisticas["travado"]["timeouts"] == 1
+    assert estatisticas["ok"]["sucessos"] == 1
+
+def test_race_usa_a_primeira_resposta_boa():
+    """No modo race todos são chamados juntos e vence a primeira resposta sem erro."""
+    roteador = _roteador({
+        "erro": FakeProvider("x", falhar=True),
+        "lento": FakeProvider("lento", atraso=0.2),
+        "medio": FakeProvider("medio", atraso=0.05)
+    }, modo="race")
+
+    assert asyncio.run(roteador.agerar_resposta([], [], "oi")) == "medio"
+
+def test_disjuntor_abre_e_pula_provedor():
+    """Após falhas consecutivas o disjuntor abre e o provedor deixa de ser chamado."""
+    instavel, reserva = FakeProvider("x", falhar=True), FakeProvider("reserva")
+    roteador = _roteador({"instavel": instavel, "reserva": reserva}, modo="failover")
+
+    for _ in range(4):
+        assert asyncio.run(roteador.agerar_resposta([], [], "oi")) == "reserva"
+    assert instavel.chamadas == 2
+    assert roteador.estatisticas()["instavel"]["estado"] == CircuitBreaker.ABERTO
+
+def test_todos_falham():
+    """Sem nenhum provedor saudável, o roteador lança IAProviderIndisponivelError."""
+    roteador = _roteador({"a": FakeProvider("a", falhar=True)}, limite_falhas=1)
+
+    with pytest.raises(IAProviderIndisponivelError):
+        asyncio.run(roteador.agerar_resposta([], [], "oi"))
+    with pytest.raises(IAProviderIndisponivelError):
+        asyncio.run(roteador.agerar_resposta([], [], "oi"))
+
+def test_stream_usa_o_provedor_mais_rapido():
+    """No streaming, vence o provedor que produz o primeiro trecho antes."""
+    roteador = _roteador({"lento": FakeProvider("lento", atraso=0.5), "rapido": FakeProvider("rapido")})
+
+    async def coletar():
+        return [trecho async for trecho in roteador.astream_resposta([], [], "oi")]
+
+    assert asyncio.run(coletar()) == ["rapido"]
+
+def test_disjuntor_meio_aberto():
+    """Depois do tempo de abertura, uma única chamada de teste é liberada."""
+    agora = [0.0]
+    disjuntor = CircuitBreaker(limite_falhas=1, tempo_abertura=10, relogio=lambda: agora[0])
+    disjuntor.registrar_falha()
+    assert not disjuntor.permitir()
+
+    agora[0] = 10
+    assert disjuntor.permitir()
+    assert not disjuntor.permitir()
+    disjuntor.registrar_sucesso()
+    assert disjuntor.estado == CircuitBreaker.FECHADO
+
+def test_limite_de_requisicoes_descarta_sem_abrir_disjuntor():
+    """Chamadas descartadas pelo limite geram IAProviderLimiteError e não contam como falha."""
+    from app.gateway.rate_limiter import RateLimiter
+    from app.exceptions.ia_provider_error import IAProviderLimiteError
+
+    provedor = FakeProvider("ok")
+    limitador = RateLimiter("a", requisicoes=1, intervalo="10s", max_espera=0.01)
+    roteador = _roteador({"a": provedor}, limitadores={"a": limitador}, limite_falhas=1)
+
+    assert asyncio.run(roteador.agerar_resposta([], [], "oi")) == "ok"
+    with pytest.raises(IAProviderLimiteError):
+        asyncio.run(roteador.agerar_resposta([], [], "oi"))
+    estatisticas = roteador.estatisticas()["a"]
+    assert estatisticas["estado"] == CircuitBreaker.FECHADO
+    assert estatisticas["limitados"] == 1
+    assert provedor.chamadas == 1
+
+def test_sincrono_libera_chamada_de_teste_dos_provedores_nao_usados():
+    """Na versão síncrona, um disjuntor meio aberto que não chegou a ser chamado volta a aceitar a chamada de teste."""
+    agora = [0.0]
+    roteador = _roteador({"a": FakeProvider("a"), "b": FakeProvider("b")})
+    roteador.disjuntores["b"] = CircuitBreaker(limite_falhas=1, tempo_abertura=10, relogio=lambda: agora[0])
+    roteador.disjuntores["b"].registrar_falha()
+    agora[0] = 10
+
+    assert roteador.gerar_resposta([], [], "oi") == "a"
+    assert roteador.disjuntores["b"].permitir()
+
+def test_stream_parado_no_meio_excede_o_tempo_limite():
+    """Um provedor que para de enviar trechos depois do primeiro gera timeout e conta como falha no disjuntor."""
+
+    class Travado(FakeProvider):
+        async def astream_resposta(self, produtos, servicos, mensagem):
+            yield "primeiro"
+            await asyncio.sleep(10)
+            yield "nunca"
+
+    roteador = _roteador({"travado": Travado("x")}, timeout=0.05, limite_falhas=1)
+    trechos = []
+
+    async def coletar():
+        async for trecho in roteador.astream_resposta([], [], "oi"):
+            trechos.append(trecho)
+
+    with pytest.raises(IAProviderTimeoutError):
+        asyncio.run(coletar())
+    assert trechos == ["primeiro"]
+    estatisticas = roteador.estatisticas()["travado"]
+    assert (estatisticas["estado"], estatisticas["timeouts"]) == (CircuitBreaker.ABERTO, 1)
@@ -0,0 +1,90 @@
+# tests/unit/test_rate_limiter.py
+import asyncio
+import time
+import pytest
+from app.gateway.rate_limiter import RateLimiter, converter_intervalo
+
+def test_converter_intervalo():
+    """Intervalos da configuração e das APIs dos provedores são convertidos em segundos."""
+    assert converter_intervalo("10s") == 10
+    assert converter_intervalo("1m") == 60
+    assert converter_intervalo("500ms") == 0.5
+    assert converter_intervalo(30) == 30
+    with pytest.raises(ValueError):
+        converter_intervalo("dez segundos")
+
+def test_sem_limite_admite_tudo():
+    """Com limite zero, todas as chamadas são admitidas na hora."""
+    limitador = RateLimiter("teste", requisicoes=0, intervalo="1s")
+
+    async def cenario():
+        return await asyncio.gather(*(limitador.adquirir() for _ in range(50)))
+
+    assert all(asyncio.run(cenario()))
+
+def test_rajada_e_fila():
+    """A rajada passa direto; o excedente espera a reposição das fichas."""
+    limitador = RateLimiter("teste", requisicoes=20, intervalo="1s", capacidade=2, max_espera=1.0)
+
+    async def cenario():
+        inicio = time.perf_counter()
+        resultados = await asyncio.gather(*(limitador.adquirir() for _ in range(4)))
+        return resultados, time.perf_counter() - inicio
+
+    resultados, duracao = asyncio.run(cenario())
+    assert all(resultados)
+    # Duas fichas extras a 20/s levam cerca de 100ms
+    assert 0.08 <= duracao < 0.5
+    assert limitador.estatisticas()["espera_p95"] > 0
+    assert limitador.fila == 0
+
+def test_descarta_excedente():
+    """Chamadas que esperariam além do máximo, ou com a fila cheia, são descartadas."""
+    limitador = RateLimiter("teste", requisicoes=1, intervalo="10s", max_espera=0.05, max_fila=2)
+
+    async def cenario():
+        return await asyncio.gather(*(limitador.adquirir() for _ in range(5)))
+
+    resultados = asyncio.run(cenario())
+    assert resultados.count(True) == 1
+    assert limitador.estatisticas()["descartados"] == 4
+
+def test_atualizar_limites():
+    """Limites descobertos na API do provedor substituem os configurados."""
+    limitador = RateLimiter("teste", requisicoes=0, intervalo="1s")
+    assert not limitador.ativo
+    limitador.atualizar_limites(10, "10s")
+    assert limitador.ativo
+    assert limitador.taxa == 1
+
+class RedisHashes:
+    """Redis em memória com os comandos de hash usados pelos limites publicados."""
+
+    def __init__(self):
+        self.dados = {}
+
+    async def hset(self, chave, mapping):
+        self.dados.setdefault(chave, {}).update({campo: str(valor) for campo, valor in mapping.items()})
+
+    async def hmget(self, chave, *campos):
+        return [self.dados.get(chave, {}).get(campo) for campo in campos]
+
+    async def eval(self, *args):
+        from redis.exceptions import RedisError
+        raise RedisError("sem scripts")
+
+def test_limites_publicados_valem_para_todos_os_workers():
+    """Limites descobertos em um worker são publicados no Redis, na chave do namespace, e lidos pelos demais."""
+    redis_client = RedisHashes()
+    worker_a = RateLimiter("openai", requisicoes=0, intervalo="1s", redis_client=redis_client, namespace="loja")
+    worker_b = RateLimiter("openai", requisicoes=0, intervalo="1s", redis_client=redis_client, namespace="loja")
+    assert worker_a.chave == "loja:ratelimit:openai"
+
+    async def cenario():
+        await worker_a.publicar_limites(10, "10s")
+        return await worker_b.adquirir()
+
+    assert asyncio.run(cenario())
+    assert worker_b.ativo
+    assert (worker_b.requisicoes, worker_b.intervalo, worker_b.capacidade) == (10, 10.0, 10)
+    assert redis_client.dados["loja:ratelimit:openai:limites"]["requisicoes"] == "10"
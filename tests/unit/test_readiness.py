@@ -0,0 +1,68 @@
+# tests/unit/test_readiness.py
+
+import asyncio
+import pytest
+from app.utils.readiness import Prontidao
+
+def test_carga_unica_e_compartilhada():
+    """A carga disparada no startup é executada uma vez e aguardada por quem chegar antes do fim."""
+    cargas = []
+
+    async def carregar():
+        cargas.append(1)
+        await asyncio.sleep(0.01)
+
+    async def cenario():
+        prontidao = Prontidao()
+        prontidao.registrar("modelos", carregar)
+        prontidao.iniciar()
+        assert not prontidao.pronto
+        await asyncio.gather(*(prontidao.aguardar("modelos") for _ in range(5)))
+        await prontidao.aguardar("modelos")
+        return prontidao
+
+    prontidao = asyncio.run(cenario())
+    assert len(cargas) == 1
+    assert prontidao.pronto
+    assert prontidao.estado()["modelos"]["estado"] == "pronto"
+
+def test_falha_registrada_e_repetida():
+    """Uma carga que falha aparece na prontidão e é tentada novamente na próxima espera."""
+    tentativas = []
+
+    async def carregar():
+        tentativas.append(1)
+        if len(tentativas) == 1:
+            raise RuntimeError("modelo ausente")
+
+    async def cenario():
+        prontidao = Prontidao()
+        prontidao.registrar("modelos", carregar)
+        with pytest.raises(RuntimeError):
+            await prontidao.aguardar("modelos")
+        assert prontidao.estado()["modelos"] == {"estado": "erro", "erro": "modelo ausente"}
+        await prontidao.aguardar("modelos")
+        return prontidao
+
+    assert asyncio.run(cenario()).pronto
+    assert len(tentativas) == 2
+
+def test_precarga_dispensa_carga_no_startup():
+    """Componentes pré-carregados (antes do fork) já nascem prontos e não são carregados de novo."""
+    cargas = []
+
+    async def carregar():
+        cargas.append("assincrona")
+
+    prontidao = Prontidao()
+    prontidao.registrar("catalogo", carregar, precarregar=lambda: cargas.append("sincrona"))
+    prontidao.precarregar()
+    assert prontidao.pronto
+    assert prontidao.estado()["catalogo"]["precarregado"]
+
+    async def cenario():
+        prontidao.iniciar()
+        await prontidao.aguardar("catalogo")
+
+    asyncio.run(cenario())
+    assert cargas == ["sincrona"]
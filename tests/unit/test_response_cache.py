@@ -0,0 +1,46 @@
+# tests/unit/test_response_cache.py
+import pytest
+from app.utils.redis_utils import RedisCache
+
+@pytest.fixture
+def cache(monkeypatch):
+    # Aponta para uma porta sem Redis: apenas a camada em memória responde
+    monkeypatch.setenv("REDIS_PORT", "1")
+    return RedisCache()
+
+def test_chave_normalizada(cache):
+    """
+    Testa se variações de pontuação, acentos e maiúsculas geram a mesma chave.
+    """
+    assert cache.montar_chave("Trocas?") == cache.montar_chave("  trocas ")
+    assert cache.montar_chave("Devoluções") == cache.montar_chave("devolucoes!")
+    assert cache.montar_chave("trocas") != cache.montar_chave("entregas")
+
+def test_chave_inclui_namespace_e_versao(cache):
+    """
+    Testa se a versão do catálogo faz parte da chave.
+    """
+    chave = cache.montar_chave("trocas", versao="abc123")
+    assert chave.startswith("chat:abc123:")
+    assert chave != cache.montar_chave("trocas", versao="def456")
+
+def test_chave_separada_por_empresa(cache):
+    """
+    Testa se cada empresa tem o seu namespace de chaves e respostas.
+    """
+    assert cache.montar_chave("trocas", versao="v1", empresa_id=7).startswith("chat:e7:v1:")
+    cache.cache_response("trocas", "Trocas da empresa 1", versao="v1", empresa_id=1)
+    assert cache.get_cached_response("trocas", versao="v1", empresa_id=1) == "Trocas da empresa 1"
+    assert cache.get_cached_response("trocas", versao="v1", empresa_id=2) is None
+
+def test_camada_em_memoria_e_contadores(cache):
+    """
+    Testa se a camada em memória atende sem o Redis e se os contadores são atualizados.
+    """
+    assert cache.get_cached_response("Trocas?", versao="v1") is None
+    cache.cache_response("Trocas?", "Resposta de trocas", versao="v1")
+    assert cache.get_cached_response("trocas", versao="v1") == "Resposta de trocas"
+    assert cache.get_cached_response("trocas", versao="v2") is None
+
+    assert cache.estatisticas["memoria"] == {"hits": 1, "misses": 2}
+    assert cache.estatisticas["redis"]["erros"] >= 1
@@ -0,0 +1,56 @@
+# tests/unit/test_semantic_cache.py
+import numpy as np
+from app.utils.semantic_cache import SemanticCache
+from app.utils.spacy_utils import normalizar_vetor
+
+def _vetor(*valores):
+    return normalizar_vetor(np.array(valores, dtype=np.float32))
+
+def test_pergunta_parecida_reutiliza_resposta():
+    """
+    Testa se perguntas com vetores próximos reutilizam a resposta e perguntas distantes não.
+    """
+    cache = SemanticCache(limiar=0.9, max_entradas=10, max_mb=1)
+    cache.adicionar(_vetor(1, 0, 0), "Entregamos no Rio.", versao="v1")
+
+    assert cache.buscar(_vetor(0.95, 0.1, 0), versao="v1") == "Entregamos no Rio."
+    assert cache.buscar(_vetor(0, 1, 0), versao="v1") is None
+    assert cache.estatisticas == {"hits": 1, "misses": 1}
+
+def test_versao_do_catalogo_invalida_entradas():
+    """
+    Testa se uma nova versão do catálogo descarta as respostas anteriores.
+    """
+    cache = SemanticCache(limiar=0.9, max_entradas=10, max_mb=1)
+    cache.adicionar(_vetor(1, 0), "Resposta antiga", versao="v1")
+    assert cache.buscar(_vetor(1, 0), versao="v2") is None
+
+    cache.adicionar(_vetor(0, 1), "Resposta nova", versao="v2")
+    assert len(cache) == 1
+    assert cache.buscar(_vetor(1, 0), versao="v2") is None
+
+def test_capacidade_substitui_entrada_menos_usada():
+    """
+    Testa se, com o cache cheio, a entrada usada há mais tempo é substituída.
+    """
+    cache = SemanticCache(limiar=0.99, max_entradas=2, max_mb=1)
+    cache.adicionar(_vetor(1, 0, 0), "A")
+    cache.adicionar(_vetor(0, 1, 0), "B")
+    assert cache.buscar(_vetor(1, 0, 0)) == "A"  # "A" passa a ser a mais recente
+
+    cache.adicionar(_vetor(0, 0, 1), "C")
+    assert len(cache) == 2
+    assert cache.buscar(_vetor(0, 1, 0)) is None
+    assert cache.buscar(_vetor(1, 0, 0)) == "A"
+    assert cache.buscar(_vetor(0, 0, 1)) == "C"
+
+def test_limite_de_memoria():
+    """
+    Testa se a capacidade respeita o limite de memória da matriz de vetores.
+    """
+    cache = SemanticCache(max_entradas=1000, max_mb=1 / 1024)  # 1 KB: 2 vetores de 128 floats
+    for i in range(5):
+        vetor = np.zeros(128, dtype=np.float32)
+        vetor[i] = 1
+        cache.adicionar(vetor, str(i))
+    assert len(cache) == 2
@@ -0,0 +1,103 @@
+# tests/unit/test_session_store.py
+import asyncio
+from app.utils.session_store import SessionStore, HistoricoSessao, codificar_turno, decodificar_turno
+
+class RedisListas:
+    """Redis mínimo em memória: listas, com a expiração apenas registrada."""
+
+    def __init__(self):
+        self.listas = {}
+        self.expiracoes = {}
+
+    async def lrange(self, chave, inicio, fim):
+        lista = self.listas.get(chave, [])
+        return lista[inicio:] if fim == -1 else lista[inicio:fim + 1]
+
+    async def delete(self, chave):
+        self.listas.pop(chave, None)
+
+    def pipeline(self, transaction=True):
+        return PipelineListas(self)
+
+class PipelineListas:
+    def __init__(self, redis):
+        self.redis = redis
+        self.comandos = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def rpush(self, chave, valor):
+        self.comandos.append(lambda: self.redis.listas.setdefault(chave, []).append(valor))
+
+    def ltrim(self, chave, inicio, fim):
+        self.comandos.append(lambda: self.redis.listas.__setitem__(chave, self.redis.listas[chave][inicio:]))
+
+    def expire(self, chave, segundos):
+        self.comandos.append(lambda: self.redis.expiracoes.__setitem__(chave, segundos))
+
+    async def execute(self):
+        for comando in self.comandos:
+            comando()
+
+def test_codificacao_compacta_e_reversivel():
+    """Turnos curtos ficam em texto puro, os longos comprimidos; ambos voltam iguais."""
+    curto = codificar_turno("Tem notebook?", "Temos sim.", comprimir_acima=256)
+    assert curto.startswith(b"t")
+    assert decodificar_turno(curto) == ("Tem notebook?", "Temos sim.")
+
+    resposta = "O notebook tem garantia de um ano e entrega em todo o Brasil. " * 6
+    longo = codificar_turno("E a garantia?", resposta, max_caracteres=1000, comprimir_acima=256)
+    assert longo.startswith(b"z")
+    assert len(longo) < len(resposta)
+    assert decodificar_turno(longo) == ("E a garantia?", resposta.strip())
+
+def test_mensagens_longas_sao_truncadas():
+    """Cada mensagem guardada respeita o limite de caracteres."""
+    pergunta, resposta = decodificar_turno(codificar_turno("a" * 50, "b" * 50, max_caracteres=20))
+    assert len(pergunta) == 20 and pergunta.endswith("...")
+    assert len(resposta) == 20
+
+def test_janela_resumo_e_limite_de_turnos():
+    """Guarda no máximo N turnos, renova a expiração e resume os que ficam fora da janela."""
+    redis = RedisListas()
+    sessoes = SessionStore(redis, ttl=60, max_turnos=5, janela=2, max_resumo=200)
+
+    async def cenario():
+        for i in range(7):
+            await sessoes.registrar("abc", f"pergunta {i}", f"resposta {i}", empresa_id=3)
+        return await sessoes.carregar("abc", empresa_id=3)
+
+    historico = asyncio.run(cenario())
+    chave = sessoes.chave("abc", 3)
+    assert len(redis.listas[chave]) == 5
+    assert redis.expiracoes[chave] == 60
+    assert historico.turnos == (("pergunta 5", "resposta 5"), ("pergunta 6", "resposta 6"))
+    assert historico.resumo == "O cliente já perguntou: pergunta 2; pergunta 3; pergunta 4."
+    assert sessoes.estatisticas["gravacoes"] == 7
+
+def test_sessoes_separadas_por_empresa():
+    """A mesma session_id em empresas diferentes não compartilha histórico."""
+    redis = RedisListas()
+    sessoes = SessionStore(redis, namespace=lambda empresa_id: f"chat:e{empresa_id}")
+
+    async def cenario():
+        await sessoes.registrar("abc", "oi", "olá", empresa_id=1)
+        return await sessoes.carregar("abc", empresa_id=2)
+
+    assert not asyncio.run(cenario())
+
+def test_redis_indisponivel_segue_sem_historico(monkeypatch):
+    """Sem Redis, a conversa continua sem histórico e o erro é contado."""
+    monkeypatch.setenv("REDIS_PORT", "1")
+    sessoes = SessionStore()
+
+    async def cenario():
+        await sessoes.registrar("abc", "oi", "olá")
+        return await sessoes.carregar("abc")
+
+    assert asyncio.run(cenario()) == HistoricoSessao()
+    assert sessoes.estatisticas["erros"] == 2
@@ -0,0 +1,82 @@
+# tests/unit/test_single_flight.py
+
+import asyncio
+import pytest
+from app.utils.single_flight import SingleFlight
+
+def test_chamadas_identicas_executam_uma_vez():
+    """Chamadas simultâneas com a mesma chave compartilham uma única execução."""
+    chamadas = []
+
+    async def produzir():
+        chamadas.append(1)
+        await asyncio.sleep(0.01)
+        return "resposta"
+
+    async def cenario():
+        single_flight = SingleFlight()
+        resultados = await asyncio.gather(*(single_flight.executar("chave", produzir) for _ in range(10)))
+        return single_flight, resultados
+
+    single_flight, resultados = asyncio.run(cenario())
+    assert resultados == ["resposta"] * 10
+    assert len(chamadas) == 1
+    assert single_flight.estatisticas["seguidores_locais"] == 9
+    assert len(single_flight) == 0
+
+def test_chaves_diferentes_executam_separadamente():
+    """Chaves diferentes não são agrupadas."""
+    async def cenario():
+        single_flight = SingleFlight()
+
+        async def produzir(valor):
+            await asyncio.sleep(0)
+            return valor
+
+        return await asyncio.gather(
+            single_flight.executar("a", lambda: produzir("a")),
+            single_flight.executar("b", lambda: produzir("b"))
+        )
+
+    assert asyncio.run(cenario()) == ["a", "b"]
+
+def test_erro_e_propagado_para_todos():
+    """Uma falha na execução é repassada a todos que a aguardavam e não fica registrada."""
+    async def produzir():
+        await asyncio.sleep(0.01)
+        raise ValueError("falha")
+
+    async def cenario():
+        single_flight = SingleFlight()
+        resultados = await asyncio.gather(
+            *(single_flight.executar("chave", produzir) for _ in range(3)),
+            return_exceptions=True
+        )
+        return single_flight, resultados
+
+    single_flight, resultados = asyncio.run(cenario())
+    assert all(isinstance(r, ValueError) for r in resultados)
+    assert len(single_flight) == 0
+
+def test_execucao_manual_libera_seguidores():
+    """Seguidores de uma execução registrada com iniciar recebem o resultado de concluir."""
+    async def cenario():
+        single_flight = SingleFlight()
+        _, lider = single_flight.iniciar("chave")
+        futuro, seguidor_lider = single_flight.iniciar("chave")
+        single_flight.concluir("chave", resultado="pronto")
+        return lider, seguidor_lider, await futuro
+
+    assert asyncio.run(cenario()) == (True, False, "pronto")
+
+def test_seguidor_de_execucao_manual_recebe_erro():
+    """Se a execução manual falhar, o erro chega ao seguidor."""
+    async def cenario():
+        single_flight = SingleFlight()
+        single_flight.iniciar("chave")
+        futuro, _ = single_flight.iniciar("chave")
+        single_flight.concluir("chave", erro=RuntimeError("interrompido"))
+        with pytest.raises(RuntimeError):
+            await futuro
+
+    asyncio.run(cenario())